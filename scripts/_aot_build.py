@@ -0,0 +1,39 @@
+"""
+Ahead-of-time build of the Backtester trade loop
+
+Compiles backtest._simulate into the athena_sim extension module next to
+this script, so CLI backtests start without waiting for the JIT. The
+module also records a hash of the kernels' source; when _simulate,
+_scan_exit or _check_exit change, backtest.py ignores the stale module and
+uses the JIT version until this is run again.
+
+Usage: python scripts/_aot_build.py
+"""
+import os
+
+from numba.pycc import CC
+
+from backtest import _simulate, _kernel_hash
+
+# Must match the argument and return types run_backtest passes to _simulate
+SIMULATE_SIGNATURE = (
+    'Tuple((i8[:], i8[:], i1[:], f8[:], f8[:], i8))'
+    '(f4[:], f4[:], f8[:], i1[:], f8[:], f8[:], i8, f8, f8, f8)'
+)
+
+cc = CC('athena_sim')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export('simulate', SIMULATE_SIGNATURE)(_simulate.py_func)
+
+KERNEL_HASH = _kernel_hash()
+
+
+@cc.export('kernel_hash', 'i8()')
+def kernel_hash():
+    """Hash of the kernels this module was built from (compiled in as a constant)"""
+    return KERNEL_HASH
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Built athena_sim in {cc.output_dir}")
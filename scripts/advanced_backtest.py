@@ -4,23 +4,145 @@ Advanced Backtesting with Multi-Timeframe Analysis and Parameter Optimization
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Tuple, Optional
-import json
 import logging
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tabulate import tabulate
+import orjson
 
 from binance_client import BinanceFuturesClient
 from signal_analyzer_enhanced import EnhancedSignalAnalyzer
 from strategies_enhanced import OptimizedStrategyFactory, EnhancedTripleEMAStrategy
 from mtf_analyzer import MultiTimeframeAnalyzer
+from numba_compat import njit
+from data_cache import get_klines_cached
+from config import DEFAULT_STOP_LOSS_PERCENTAGE, DEFAULT_TAKE_PROFIT_PERCENTAGE
 
 logger = logging.getLogger(__name__)
 
+# Exit reason codes returned by _simulate
+_EXIT_REASONS = ('END', 'SL', 'TP')
+
+# Minutes per candle for the Binance kline intervals
+_TF_MIN = {
+    '1m': 1, '3m': 3, '5m': 5, '15m': 15, '30m': 30,
+    '1h': 60, '2h': 120, '4h': 240, '6h': 360, '8h': 480, '12h': 720,
+    '1d': 1440, '3d': 4320
+}
+
+
+@njit(cache=True)
+def _simulate(
+    closes, highs, lows, signals, atr,
+    sl_mult, tp_mult, fallback_sl_pct, fallback_tp_pct,
+    initial_capital, position_size_pct, start, stop_capital
+):
+    """
+    Run the bar-by-bar position simulation over precomputed arrays.
+    
+    Signals are 1 (BUY), -1 (SELL) or 0. Entries happen at the close of the
+    signal bar with ATR-based stops, or with percentage stops
+    (fallback_sl_pct/fallback_tp_pct) where the ATR is NaN or zero, as in
+    EnhancedTripleEMAStrategy.calculate_stop_loss_take_profit. Exits are
+    checked from the next bar on, SL taking precedence over TP on the same
+    candle. A new position may open on the bar where the previous one
+    closed. The run stops early once a closed trade leaves capital at or
+    below ``stop_capital``.
+    
+    Returns:
+        Parallel arrays (entry_idx, exit_idx, sides, exit_codes, stop_losses,
+        take_profits, quantities, pnls) and the number of trades filled in
+    """
+    n = closes.shape[0]
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    sides = np.empty(n, dtype=np.int8)
+    exit_codes = np.empty(n, dtype=np.int8)
+    stop_losses = np.empty(n, dtype=np.float64)
+    take_profits = np.empty(n, dtype=np.float64)
+    quantities = np.empty(n, dtype=np.float64)
+    pnls = np.empty(n, dtype=np.float64)
+    
+    n_trades = 0
+    capital = initial_capital
+    in_position = False
+    side = 0
+    entry_price = 0.0
+    stop_loss = 0.0
+    take_profit = 0.0
+    quantity = 0.0
+    
+    for i in range(start, n):
+        if in_position:
+            if side == 1:
+                hit_sl = lows[i] <= stop_loss
+                hit_tp = highs[i] >= take_profit
+            else:
+                hit_sl = highs[i] >= stop_loss
+                hit_tp = lows[i] <= take_profit
+            
+            if hit_sl or hit_tp:
+                exit_price = stop_loss if hit_sl else take_profit
+                # Same arithmetic as Trade.close_trade
+                pnl_percent = ((side * (exit_price - entry_price)) / entry_price) * 100
+                pnl = (pnl_percent / 100) * (entry_price * quantity)
+                exit_idx[n_trades] = i
+                exit_codes[n_trades] = 1 if hit_sl else 2
+                pnls[n_trades] = pnl
+                capital += pnl
+                n_trades += 1
+                in_position = False
+                
+                if capital <= stop_capital:
+                    break
+        
+        if not in_position and signals[i] != 0:
+            side = signals[i]
+            entry_price = closes[i]
+            quantity = (capital * (position_size_pct / 100)) / entry_price
+            
+            if atr[i] > 0:
+                stop_loss = entry_price - side * atr[i] * sl_mult
+                take_profit = entry_price + side * atr[i] * tp_mult
+            else:
+                # No usable ATR (NaN compares False)
+                stop_loss = entry_price * (1 - side * fallback_sl_pct / 100)
+                take_profit = entry_price * (1 + side * fallback_tp_pct / 100)
+            
+            entry_idx[n_trades] = i
+            sides[n_trades] = side
+            stop_losses[n_trades] = stop_loss
+            take_profits[n_trades] = take_profit
+            quantities[n_trades] = quantity
+            in_position = True
+    
+    # Close any remaining position at last price
+    if in_position:
+        exit_price = closes[n - 1]
+        exit_idx[n_trades] = n - 1
+        exit_codes[n_trades] = 0
+        pnl_percent = ((side * (exit_price - entry_price)) / entry_price) * 100
+        pnls[n_trades] = (pnl_percent / 100) * (entry_price * quantity)
+        n_trades += 1
+    
+    return (
+        entry_idx, exit_idx, sides, exit_codes, stop_losses,
+        take_profits, quantities, pnls, n_trades
+    )
+
 
 class Trade:
     """Represents a single trade in the backtest"""
     
+    __slots__ = (
+        'entry_time', 'entry_price', 'signal', 'quantity', 'stop_loss',
+        'take_profit', 'strategy', 'exit_time', 'exit_price', 'exit_reason',
+        'pnl', 'pnl_percent'
+    )
+    
     def __init__(self, entry_time, entry_price, signal, quantity, stop_loss, take_profit, strategy_name=""):
         self.entry_time = entry_time
         self.entry_price = entry_price
@@ -54,13 +176,13 @@ class Trade:
     def to_dict(self):
         """Convert trade to dictionary"""
         return {
-            'entry_time': str(self.entry_time),
+            'entry_time': self.entry_time.isoformat(),
             'entry_price': self.entry_price,
             'signal': self.signal,
             'quantity': self.quantity,
             'stop_loss': self.stop_loss,
             'take_profit': self.take_profit,
-            'exit_time': str(self.exit_time) if self.exit_time else None,
+            'exit_time': self.exit_time.isoformat() if self.exit_time else None,
             'exit_price': self.exit_price,
             'exit_reason': self.exit_reason,
             'pnl': self.pnl,
@@ -81,7 +203,8 @@ class AdvancedBacktester:
         self,
         binance_client: BinanceFuturesClient,
         initial_capital: float = 10000.0,
-        position_size_pct: float = 95.0
+        position_size_pct: float = 95.0,
+        min_capital_pct: float = 20.0
     ):
         """
         Initialize advanced backtester.
@@ -90,10 +213,17 @@ class AdvancedBacktester:
             binance_client: Binance client for historical data
             initial_capital: Starting capital in USDT
             position_size_pct: Position size as % of capital
+            min_capital_pct: Stop simulating once capital falls to this % of
+                the initial capital
         """
         self.client = binance_client
         self.initial_capital = initial_capital
         self.position_size_pct = position_size_pct
+        self.min_capital_pct = min_capital_pct
+        
+        # Prepared klines keyed by (symbol, timeframe, days_back), so repeated
+        # backtests over the same window only download once
+        self._klines_cache: Dict[Tuple[str, str, int, str], pd.DataFrame] = {}
         
         logger.info(f"Initialized Advanced Backtester - Capital: ${initial_capital}")
     
@@ -103,7 +233,9 @@ class AdvancedBacktester:
         primary_timeframe: str = "15m",
         confirmation_timeframes: List[str] = None,
         days_back: int = 30,
-        strategy_config: Dict = None
+        strategy_config: Dict = None,
+        df: Optional[pd.DataFrame] = None,
+        include_trades: bool = True
     ) -> Dict:
         """
         Run backtest with multi-timeframe analysis.
@@ -114,6 +246,10 @@ class AdvancedBacktester:
             confirmation_timeframes: Higher timeframes for confirmation
             days_back: Number of days to backtest
             strategy_config: Strategy parameters (optional)
+            df: Prepared primary timeframe data (optional, fetched or
+                taken from the klines cache if None)
+            include_trades: Build the per-trade list in the result. Callers
+                that only need the statistics should pass False
             
         Returns:
             Dict with backtest results
@@ -135,108 +271,25 @@ class AdvancedBacktester:
                 analyzer.strategy = OptimizedStrategyFactory.create_custom_strategy(**strategy_config)
             
             # Get historical data for primary timeframe
-            start_time = datetime.now() - timedelta(days=days_back)
-            end_time = datetime.now()
-            
-            # Calculate required candles
-            minutes_per_candle = self._timeframe_to_minutes(primary_timeframe)
-            total_minutes = days_back * 24 * 60
-            required_candles = int(total_minutes / minutes_per_candle)
+            if df is None:
+                df = self._load_dataframe(symbol, primary_timeframe, days_back)
             
-            # Binance max limit is 1500, cap it
-            required_candles = min(required_candles, 1500)
-            
-            # Fetch data
-            klines = self.client.get_klines(symbol, primary_timeframe, limit=required_candles)
-            
-            if not klines:
+            if df is None:
                 return {'error': 'No historical data available'}
             
-            df = self._prepare_dataframe(klines)
-            
             logger.info(f"Loaded {len(df)} candles from {df['timestamp'].iloc[0]} to {df['timestamp'].iloc[-1]}")
             
-            # Initialize trade tracking
-            trades = []
-            current_position = None
-            capital = self.initial_capital
+            # Indicators only look backwards, so computing them once over the
+            # full history gives the same values at row i as recomputing them
+            # on df[:i+1] every bar.
+            # Note: In real backtest, we'd need historical MTF data
+            # For now, we'll use the enhanced strategy on primary TF
+            df_ind = self._precompute_indicators(analyzer.strategy, df)
             
-            # Simulate trading
-            for i in range(100, len(df)):  # Start after warmup period
-                current_time = df['timestamp'].iloc[i]
-                current_price = float(df['close'].iloc[i])
-                high = float(df['high'].iloc[i])
-                low = float(df['low'].iloc[i])
-                
-                # Check if current position needs to be closed (SL/TP hit)
-                if current_position:
-                    hit_sl, hit_tp = self._check_stop_loss_take_profit(
-                        current_position, high, low, current_price
-                    )
-                    
-                    if hit_sl or hit_tp:
-                        exit_price = current_position.stop_loss if hit_sl else current_position.take_profit
-                        exit_reason = 'SL' if hit_sl else 'TP'
-                        
-                        # Close position
-                        current_position.close_trade(exit_price, current_time, exit_reason)
-                        trades.append(current_position)
-                        capital = capital + current_position.pnl
-                        
-                        logger.debug(
-                            f"Closed {current_position.signal} at {exit_price:.2f} "
-                            f"({exit_reason}), PnL: ${current_position.pnl:.2f}"
-                        )
-                        
-                        current_position = None
-                
-                # Check for new signals only if no position
-                if not current_position:
-                    # Get MTF analysis for this point in time
-                    # Note: In real backtest, we'd need historical MTF data
-                    # For now, we'll use the enhanced strategy on primary TF
-                    historical_df = df.iloc[:i+1].copy()
-                    historical_df = analyzer.strategy._calculate_indicators(historical_df)
-                    
-                    signal = analyzer.strategy.generate_signal(historical_df)
-                    
-                    if signal in ['BUY', 'SELL']:
-                        # Calculate position size
-                        position_size = (capital * (self.position_size_pct / 100)) / current_price
-                        
-                        # Calculate stops
-                        stop_loss, take_profit = analyzer.strategy.calculate_stop_loss_take_profit(
-                            current_price,
-                            signal,
-                            historical_df
-                        )
-                        
-                        # Open new position
-                        current_position = Trade(
-                            entry_time=current_time,
-                            entry_price=current_price,
-                            signal=signal,
-                            quantity=position_size,
-                            stop_loss=stop_loss,
-                            take_profit=take_profit,
-                            strategy_name="MTF_ENHANCED"
-                        )
-                        
-                        logger.debug(
-                            f"Opened {signal} at {current_price:.2f}, "
-                            f"SL: {stop_loss:.2f}, TP: {take_profit:.2f}"
-                        )
-            
-            # Close any remaining position at last price
-            if current_position:
-                last_price = float(df['close'].iloc[-1])
-                last_time = df['timestamp'].iloc[-1]
-                current_position.close_trade(last_price, last_time, 'END')
-                trades.append(current_position)
-                capital = capital + current_position.pnl
+            trade_book, capital = self._run_backtest_with_strategy(df_ind, analyzer.strategy)
             
             # Calculate statistics
-            stats = self._calculate_statistics(trades, self.initial_capital, capital)
+            stats = self._calculate_statistics(trade_book['pnl'], self.initial_capital, capital)
             
             result = {
                 'symbol': symbol,
@@ -247,13 +300,16 @@ class AdvancedBacktester:
                 'initial_capital': self.initial_capital,
                 'final_capital': capital,
                 'total_return_pct': ((capital - self.initial_capital) / self.initial_capital) * 100,
-                'trades': [t.to_dict() for t in trades],
+                'trades': (
+                    [t.to_dict() for t in self._build_trades(df_ind, trade_book)]
+                    if include_trades else []
+                ),
                 'statistics': stats
             }
             
             logger.info(
                 f"MTF Backtest complete - Return: {result['total_return_pct']:.2f}%, "
-                f"Trades: {len(trades)}, Win Rate: {stats['win_rate']:.1f}%"
+                f"Trades: {stats['total_trades']}, Win Rate: {stats['win_rate']:.1f}%"
             )
             
             return result
@@ -262,16 +318,126 @@ class AdvancedBacktester:
             logger.error(f"Error in MTF backtest: {e}")
             return {'error': str(e)}
     
+    def _run_backtest_with_strategy(
+        self,
+        df_ind: pd.DataFrame,
+        strategy: EnhancedTripleEMAStrategy
+    ) -> Tuple[Dict[str, np.ndarray], float]:
+        """
+        Simulate one strategy over a frame that already carries its indicators.
+        
+        Returns:
+            (trade_book, final_capital) - trade_book maps each trade field
+            (entry_idx, exit_idx, side, exit_code, stop_loss, take_profit,
+            quantity, pnl) to an array with one slot per closed trade
+        """
+        # Entry signals for every bar, then a compiled state machine over
+        # plain arrays handles entries, SL/TP exits and capital
+        signals = strategy.generate_signals(df_ind)
+        atr = df_ind['atr'].to_numpy(dtype=np.float64)
+        atr_multiplier = strategy.atr_multiplier
+        
+        (entry_idx, exit_idx, sides, exit_codes, stop_losses,
+         take_profits, quantities, pnls, n_trades) = _simulate(
+            df_ind['close'].to_numpy(dtype=np.float64),
+            df_ind['high'].to_numpy(dtype=np.float64),
+            df_ind['low'].to_numpy(dtype=np.float64),
+            signals, atr,
+            atr_multiplier,
+            atr_multiplier * 2.0,  # Default risk/reward of calculate_stop_loss_take_profit
+            DEFAULT_STOP_LOSS_PERCENTAGE,
+            DEFAULT_TAKE_PROFIT_PERCENTAGE,
+            float(self.initial_capital),
+            float(self.position_size_pct),
+            100,  # Start after warmup period
+            self.initial_capital * (self.min_capital_pct / 100)
+        )
+        
+        trade_book = {
+            'entry_idx': entry_idx[:n_trades],
+            'exit_idx': exit_idx[:n_trades],
+            'side': sides[:n_trades],
+            'exit_code': exit_codes[:n_trades],
+            'stop_loss': stop_losses[:n_trades],
+            'take_profit': take_profits[:n_trades],
+            'quantity': quantities[:n_trades],
+            'pnl': pnls[:n_trades]
+        }
+        
+        # Accumulate in trade order, as the loop did
+        capital = self.initial_capital
+        for pnl in pnls[:n_trades].tolist():
+            capital = capital + pnl
+        
+        if capital <= self.initial_capital * (self.min_capital_pct / 100):
+            logger.info(
+                f"Capital depleted to ${capital:.2f} - "
+                f"stopped after {n_trades} trades"
+            )
+        
+        return trade_book, capital
+    
+    def _build_trades(self, df_ind: pd.DataFrame, trade_book: Dict[str, np.ndarray]) -> List[Trade]:
+        """
+        Materialize Trade objects from a trade book for reporting.
+        
+        Args:
+            df_ind: Frame the trade book was simulated on
+            trade_book: Arrays returned by _run_backtest_with_strategy
+            
+        Returns:
+            List of closed trades
+        """
+        timestamps = df_ind['timestamp'].to_numpy()
+        closes = df_ind['close'].to_numpy(dtype=np.float64)
+        trades = []
+        
+        for k in range(len(trade_book['pnl'])):
+            entry_idx = trade_book['entry_idx'][k]
+            exit_idx = trade_book['exit_idx'][k]
+            
+            trade = Trade(
+                entry_time=pd.Timestamp(timestamps[entry_idx]),
+                entry_price=float(closes[entry_idx]),
+                signal='BUY' if trade_book['side'][k] == 1 else 'SELL',
+                quantity=float(trade_book['quantity'][k]),
+                stop_loss=float(trade_book['stop_loss'][k]),
+                take_profit=float(trade_book['take_profit'][k]),
+                strategy_name="MTF_ENHANCED"
+            )
+            
+            exit_reason = _EXIT_REASONS[trade_book['exit_code'][k]]
+            if exit_reason == 'SL':
+                exit_price = trade.stop_loss
+            elif exit_reason == 'TP':
+                exit_price = trade.take_profit
+            else:
+                exit_price = float(closes[exit_idx])
+            
+            trade.close_trade(exit_price, pd.Timestamp(timestamps[exit_idx]), exit_reason)
+            trades.append(trade)
+            
+            logger.debug(
+                f"{trade.signal} {trade.entry_price:.2f} -> {exit_price:.2f} "
+                f"({exit_reason}), PnL: ${trade.pnl:.2f}"
+            )
+        
+        return trades
+    
     def optimize_parameters(
         self,
         symbol: str,
         primary_timeframe: str = "15m",
         days_back: int = 30,
-        param_ranges: Dict = None
+        param_ranges: Dict = None,
+        max_workers: Optional[int] = None
     ) -> List[Dict]:
         """
         Optimize strategy parameters using grid search.
         
+        Combinations are independent, so they are backtested in parallel
+        worker processes against a single shared download of the klines.
+        
         Args:
             symbol: Trading pair
             primary_timeframe: Timeframe to test
@@ -282,6 +448,7 @@ class AdvancedBacktester:
                     'medium_period': [21, 30],
                     'atr_multiplier': [1.5, 2.0, 2.5]
                 }
+            max_workers: Worker processes to use (default: CPU count)
                 
         Returns:
             List of results sorted by total return
@@ -305,46 +472,57 @@ class AdvancedBacktester:
         
         param_names = list(param_ranges.keys())
         param_values = list(param_ranges.values())
+        configs = [dict(zip(param_names, combination)) for combination in product(*param_values)]
         
         results = []
-        total_combinations = np.prod([len(v) for v in param_values])
+        total_combinations = math.prod(len(v) for v in param_values)
+        
+        # Fetch data once and share it with every combination. float32 is
+        # plenty to rank combinations and halves the work per indicator pass
+        df = self._load_dataframe(symbol, primary_timeframe, days_back, dtype=np.float32)
+        
+        if df is None:
+            logger.warning("Optimization aborted - no historical data available")
+            return results
+        
+        # Indicator columns are keyed by period, so a single frame enriched
+        # once per distinct EMA set serves every combination
+        df_ind = df.copy(deep=False)
+        strategies = {}
+        for config in configs:
+            strategy = OptimizedStrategyFactory.create_custom_strategy(**_strategy_config_from_params(config))
+            strategies.setdefault(
+                (strategy.fast_period, strategy.medium_period, strategy.slow_period),
+                strategy
+            )
+        for strategy in strategies.values():
+            strategy._calculate_indicators(df_ind)
         
         logger.info(f"Testing {total_combinations} parameter combinations...")
         
-        for i, combination in enumerate(product(*param_values)):
-            config = dict(zip(param_names, combination))
+        # Spawn rather than fork, so workers don't inherit the logger's
+        # listener thread or Numba's threads (or a lock one of them holds)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [
+                executor.submit(
+                    _run_optimization_trial,
+                    config,
+                    df_ind,
+                    self.initial_capital,
+                    self.position_size_pct,
+                    self.min_capital_pct
+                )
+                for config in configs
+            ]
             
-            # Map parameter names to strategy constructor names
-            strategy_config = {
-                'fast': config.get('fast_period', 9),
-                'medium': config.get('medium_period', 21),
-                'slow': config.get('slow_period', 50),
-                'atr_mult': config.get('atr_multiplier', 2.0),
-                'vol_thresh': config.get('volume_threshold', 1.2),
-                'require_vol': config.get('require_volume_confirmation', True)
-            }
-            
-            # Run backtest with these parameters
-            result = self.run_mtf_backtest(
-                symbol,
-                primary_timeframe,
-                None,  # No MTF for optimization (faster)
-                days_back,
-                strategy_config
-            )
-            
-            if 'error' not in result:
-                results.append({
-                    'config': config,
-                    'return_pct': result['total_return_pct'],
-                    'win_rate': result['statistics']['win_rate'],
-                    'profit_factor': result['statistics']['profit_factor'],
-                    'total_trades': result['statistics']['total_trades'],
-                    'max_drawdown': result['statistics']['max_drawdown_pct']
-                })
-            
-            if (i + 1) % 10 == 0:
-                logger.info(f"Tested {i + 1}/{total_combinations} combinations...")
+            for i, future in enumerate(as_completed(futures)):
+                result = future.result()
+                
+                if result:
+                    results.append(result)
+                
+                if (i + 1) % 10 == 0:
+                    logger.info(f"Tested {i + 1}/{total_combinations} combinations...")
         
         # Sort by return
         results.sort(key=lambda x: x['return_pct'], reverse=True)
@@ -364,7 +542,8 @@ class AdvancedBacktester:
         """
         Compare different timeframe combinations to find the best setup.
         
-        Tests various primary/confirmation timeframe combinations.
+        Tests various primary/confirmation timeframe combinations. Each
+        distinct primary timeframe is downloaded once and reused.
         
         Args:
             symbol: Trading pair
@@ -384,6 +563,12 @@ class AdvancedBacktester:
         
         results = []
         
+        # Pre-fetch each distinct primary timeframe once
+        frames = {
+            primary: self._load_dataframe(symbol, primary, days_back)
+            for primary in dict.fromkeys(primary for primary, _ in timeframe_combos)
+        }
+        
         for primary, confirmation in timeframe_combos:
             logger.info(f"Testing {primary} with confirmation {confirmation}")
             
@@ -391,7 +576,9 @@ class AdvancedBacktester:
                 symbol,
                 primary,
                 confirmation,
-                days_back
+                days_back,
+                df=frames[primary],
+                include_trades=False
             )
             
             if 'error' not in result:
@@ -408,62 +595,91 @@ class AdvancedBacktester:
         
         return results
     
-    def _timeframe_to_minutes(self, timeframe: str) -> int:
-        """Convert timeframe string to minutes."""
-        if timeframe.endswith('m'):
-            return int(timeframe[:-1])
-        elif timeframe.endswith('h'):
-            return int(timeframe[:-1]) * 60
-        elif timeframe.endswith('d'):
-            return int(timeframe[:-1]) * 1440
-        return 15
-    
-    def _prepare_dataframe(self, klines: List) -> pd.DataFrame:
-        """Convert klines to DataFrame."""
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
+    def _load_dataframe(
+        self,
+        symbol: str,
+        timeframe: str,
+        days_back: int,
+        dtype=np.float64
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch and prepare historical klines, or None if none are returned.
+        
+        Klines come through the on-disk Parquet cache, and the prepared
+        frames are also kept in memory per (symbol, timeframe, days_back,
+        dtype) for the lifetime of the backtester.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle interval
+            days_back: Days of history
+            dtype: OHLCV dtype. float32 halves memory and speeds up the
+                indicator math but only holds ~7 significant digits, so
+                prices and indicators can differ in the last digits and a
+                crossover right on the boundary may flip. Good enough for
+                ranking parameter sets; keep float64 for reported results.
+        """
+        key = (symbol, timeframe, days_back, np.dtype(dtype).name)
+        if key in self._klines_cache:
+            return self._klines_cache[key]
+        
+        # Calculate required candles
+        minutes_per_candle = self._timeframe_to_minutes(timeframe)
+        total_minutes = days_back * 24 * 60
+        required_candles = int(total_minutes / minutes_per_candle)
+        
+        # Binance max limit is 1500, cap it
+        required_candles = min(required_candles, 1500)
+        
+        # Fetch data
+        df = get_klines_cached(self.client, symbol, timeframe, required_candles)
+        
+        if df.empty:
+            return None
+        
+        if np.dtype(dtype) != np.float64:
+            df = df.astype({col: dtype for col in ('open', 'high', 'low', 'close', 'volume')})
+        
+        self._klines_cache[key] = df
         
         return df
     
-    def _check_stop_loss_take_profit(
+    def _timeframe_to_minutes(self, timeframe: str) -> int:
+        """Convert timeframe string to minutes (15 if unknown)."""
+        return _TF_MIN.get(timeframe, 15)
+    
+    def _precompute_indicators(
         self,
-        trade: Trade,
-        high: float,
-        low: float,
-        close: float
-    ) -> Tuple[bool, bool]:
-        """Check if SL or TP was hit."""
-        hit_sl = False
-        hit_tp = False
-        
-        if trade.signal == 'BUY':
-            if low <= trade.stop_loss:
-                hit_sl = True
-            if high >= trade.take_profit:
-                hit_tp = True
-        else:  # SELL
-            if high >= trade.stop_loss:
-                hit_sl = True
-            if low <= trade.take_profit:
-                hit_tp = True
+        strategy: EnhancedTripleEMAStrategy,
+        df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Calculate strategy indicators once over the full history.
         
-        return hit_sl, hit_tp
+        Returns a view of df enriched with the EMA, ATR and volume average
+        columns, ready to be indexed by row inside the simulation loop.
+        The strategy only adds columns, so a shallow copy is enough to keep
+        the cached input frame untouched without duplicating its OHLCV data.
+        """
+        return strategy._calculate_indicators(df.copy(deep=False))
     
     def _calculate_statistics(
         self,
-        trades: List[Trade],
+        pnls: np.ndarray,
         initial_capital: float,
         final_capital: float
     ) -> Dict:
-        """Calculate comprehensive statistics."""
-        if not trades:
+        """
+        Calculate comprehensive statistics.
+        
+        Args:
+            pnls: Dollar P&L of each closed trade, in order
+            initial_capital: Starting capital
+            final_capital: Capital after the last trade
+        """
+        total_trades = len(pnls)
+        
+        if total_trades == 0:
             return {
                 'total_trades': 0,
                 'win_rate': 0,
@@ -473,38 +689,30 @@ class AdvancedBacktester:
                 'max_drawdown_pct': 0
             }
         
-        wins = [t for t in trades if t.pnl > 0]
-        losses = [t for t in trades if t.pnl <= 0]
+        wins_mask = pnls > 0
+        win_count = int(wins_mask.sum())
+        loss_count = total_trades - win_count
         
-        total_profit = sum(t.pnl for t in wins)
-        total_loss = abs(sum(t.pnl for t in losses))
+        total_profit = float(pnls[wins_mask].sum())
+        total_loss = abs(float(pnls[~wins_mask].sum()))
         
         profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
         
         # Calculate max drawdown
-        capital_curve = [initial_capital]
-        running_capital = initial_capital
-        for trade in trades:
-            running_capital += trade.pnl
-            capital_curve.append(running_capital)
-        
-        peak = capital_curve[0]
-        max_dd = 0
-        for value in capital_curve:
-            if value > peak:
-                peak = value
-            dd = ((peak - value) / peak) * 100
-            if dd > max_dd:
-                max_dd = dd
+        equity = initial_capital + np.concatenate(([0.0], np.cumsum(pnls)))
+        peak = np.maximum.accumulate(equity)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0)
+        max_dd = float(drawdown.max()) * 100
         
         return {
-            'total_trades': len(trades),
-            'winning_trades': len(wins),
-            'losing_trades': len(losses),
-            'win_rate': (len(wins) / len(trades)) * 100,
+            'total_trades': total_trades,
+            'winning_trades': win_count,
+            'losing_trades': loss_count,
+            'win_rate': (win_count / total_trades) * 100,
             'profit_factor': profit_factor,
-            'avg_win': total_profit / len(wins) if wins else 0,
-            'avg_loss': total_loss / len(losses) if losses else 0,
+            'avg_win': total_profit / win_count if win_count else 0,
+            'avg_loss': total_loss / loss_count if loss_count else 0,
             'max_drawdown_pct': max_dd,
             'total_profit': total_profit,
             'total_loss': total_loss
@@ -543,6 +751,53 @@ class AdvancedBacktester:
         print(f"{'='*60}\n")
 
 
+def _strategy_config_from_params(config: Dict) -> Dict:
+    """Map grid-search parameter names to strategy constructor names."""
+    return {
+        'fast': config.get('fast_period', 9),
+        'medium': config.get('medium_period', 21),
+        'slow': config.get('slow_period', 50),
+        'atr_mult': config.get('atr_multiplier', 2.0),
+        'vol_thresh': config.get('volume_threshold', 1.2),
+        'require_vol': config.get('require_volume_confirmation', True)
+    }
+
+
+def _run_optimization_trial(
+    config: Dict,
+    df_ind: pd.DataFrame,
+    initial_capital: float,
+    position_size_pct: float,
+    min_capital_pct: float
+) -> Optional[Dict]:
+    """
+    Backtest one grid-search combination.
+    
+    Module-level so ProcessPoolExecutor can pickle it. The worker builds
+    the strategy directly and runs it over the shared, already-indicated
+    DataFrame - no analyzer or exchange client is needed.
+    """
+    strategy = OptimizedStrategyFactory.create_custom_strategy(**_strategy_config_from_params(config))
+    backtester = AdvancedBacktester(None, initial_capital, position_size_pct, min_capital_pct)
+    
+    try:
+        trade_book, capital = backtester._run_backtest_with_strategy(df_ind, strategy)
+    except Exception as e:
+        logger.error(f"Optimization trial failed for {config}: {e}")
+        return None
+    
+    stats = backtester._calculate_statistics(trade_book['pnl'], initial_capital, capital)
+    
+    return {
+        'config': config,
+        'return_pct': ((capital - initial_capital) / initial_capital) * 100,
+        'win_rate': stats['win_rate'],
+        'profit_factor': stats['profit_factor'],
+        'total_trades': stats['total_trades'],
+        'max_drawdown': stats['max_drawdown_pct']
+    }
+
+
 def main():
     """Run advanced backtesting examples."""
     from config import BINANCE_API_KEY, BINANCE_API_SECRET, BINANCE_TESTNET
@@ -595,25 +850,35 @@ def main():
         }
     )
     
+    # Grid searches can return hundreds of rows, so format with pandas
+    # rather than tabulate's grid layout
+    top_results = pd.DataFrame(
+        optimization_results,
+        columns=['config', 'return_pct', 'win_rate', 'total_trades', 'profit_factor']
+    ).head(5)
+    top_results.insert(0, 'Rank', range(1, len(top_results) + 1))
+    top_results.columns = ['Rank', 'Config', 'Return', 'Win Rate', 'Trades', 'PF']
+    
     print("\nTop 5 Parameter Combinations:")
-    print(tabulate(
-        [[i+1, r['config'], f"{r['return_pct']:.2f}%", f"{r['win_rate']:.1f}%",
-          r['total_trades'], f"{r['profit_factor']:.2f}"]
-         for i, r in enumerate(optimization_results[:5])],
-        headers=['Rank', 'Config', 'Return', 'Win Rate', 'Trades', 'PF'],
-        tablefmt='grid'
+    print(top_results.to_string(
+        index=False,
+        formatters={
+            'Return': '{:.2f}%'.format,
+            'Win Rate': '{:.1f}%'.format,
+            'PF': '{:.2f}'.format
+        }
     ))
     
     # Save results
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"trading_data/advanced_backtest_{timestamp}.json"
     
-    with open(filename, 'w') as f:
-        json.dump({
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps({
             'mtf_result': mtf_result,
             'tf_comparison': tf_comparison,
             'optimization_results': optimization_results[:10]
-        }, f, indent=2, default=str)
+        }, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"\n✅ Results saved to: {filename}")
 
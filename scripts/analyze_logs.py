@@ -3,36 +3,155 @@ Athena v2 Log Analyzer
 Analyzes server log files to provide performance insights
 """
 
+import mmap
 import re
 from datetime import datetime
 from collections import defaultdict, Counter
+from functools import cached_property
 from pathlib import Path
 
 
+# All patterns and markers are compiled once at import. The line scan first
+# checks each line with a plain substring test, so a pattern only runs on
+# lines that can match it. The log is scanned as UTF-8 bytes, so multi-byte
+# characters that repeat are grouped, e.g. (?:⭐)+ rather than ⭐+.
+TIMESTAMP_PATTERN = re.compile(rb'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})')
+DATE_PATTERN = re.compile(rb'\d{4}-\d{2}-\d{2}')
+SIGNAL_PATTERN = re.compile(r'Signal: (HOLD|BUY|SELL) (?:⭐)+ \((\d+) stars?\)'.encode())
+EXECUTED_PATTERN = re.compile(rb'Trade #\d+ executed successfully')
+POSITIONS_PATTERN = re.compile(r'🎯 CHECKING POSITIONS - (\d+) open'.encode())
+ANALYZING_PATTERN = re.compile(rb'Analyzing (\w+)\.\.\.\s')
+
+# Substring markers for the line scan
+SCAN_MARKER = '🔍 SCANNING WATCHLIST FOR TRADING SIGNALS'.encode()
+EXECUTING_MARKER = '🎯 EXECUTING TRADE'.encode()
+POSITIONS_MARKER = '🎯 CHECKING POSITIONS'.encode()
+CONNECTED_MARKER = b'Connected to Binance Futures '
+NETWORK_MARKERS = {network: CONNECTED_MARKER + network.encode() for network in ('TESTNET', 'MAINNET')}
+MESSAGE_MARKERS = {'errors': b'ERROR - ', 'warnings': b'WARNING - '}
+
+# Error/warning messages kept for the report; later ones are only counted
+MESSAGE_SAMPLE_SIZE = 10
+
+# Most bytes between "Analyzing SYMBOL..." and its Signal line
+SYMBOL_WINDOW = 2048
+
+
 class LogAnalyzer:
     def __init__(self, log_path: str):
         self.log_path = log_path
         self.log_content = self.read_log()
         
     def read_log(self):
-        """Read log file content"""
-        with open(self.log_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        """
+        Map the log file read-only as bytes
+        
+        Pages are loaded by the OS as the scans walk the file, so the log is
+        never copied into a Python string. An empty file gives b''.
+        """
+        with open(self.log_path, 'rb') as f:
+            try:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return b''
+    
+    @cached_property
+    def events(self):
+        """Events from scan_events, collected on first use"""
+        return self.scan_events()
+    
+    def scan_events(self):
+        """
+        Collect everything the report counts in a single pass over the log lines
+        
+        An error or warning message runs from its 'ERROR - ' / 'WARNING - '
+        marker up to the next line that starts with a date, so multi-line
+        tracebacks stay in one message. Only the first MESSAGE_SAMPLE_SIZE
+        messages of each kind are kept; the rest are counted.
+        """
+        events = {
+            'timestamps': [],
+            'scans': 0,
+            'signals': [],
+            'trades_attempted': 0,
+            'trades_executed': 0,
+            'position_counts': [],
+            'errors': [],
+            'warnings': [],
+            'message_counts': {'errors': 0, 'warnings': 0},
+            'networks': set()
+        }
+        # Lines of the error/warning message currently being read
+        open_messages = {'errors': None, 'warnings': None}
+        
+        def close(key):
+            events['message_counts'][key] += 1
+            if len(events[key]) < MESSAGE_SAMPLE_SIZE:
+                message = b'\n'.join(open_messages[key])
+                events[key].append(message.decode('utf-8', errors='replace'))
+            open_messages[key] = None
+        
+        # mmap.readline yields one line at a time without copying the file
+        lines = iter(self.log_content.readline, b'') if self.log_content else ()
+        
+        for line in lines:
+            if line.endswith(b'\n'):
+                line = line[:-1]
+            
+            if DATE_PATTERN.match(line):
+                for key in MESSAGE_MARKERS:
+                    if open_messages[key] is not None:
+                        close(key)
+                
+                ts = TIMESTAMP_PATTERN.match(line)
+                if ts:
+                    events['timestamps'].append(ts.group(1).decode())
+            
+            if SCAN_MARKER in line:
+                events['scans'] += line.count(SCAN_MARKER)
+            if b'Signal: ' in line:
+                events['signals'].extend((t.decode(), int(n)) for t, n in SIGNAL_PATTERN.findall(line))
+            if EXECUTING_MARKER in line:
+                events['trades_attempted'] += line.count(EXECUTING_MARKER)
+            if b' executed successfully' in line:
+                events['trades_executed'] += len(EXECUTED_PATTERN.findall(line))
+            if POSITIONS_MARKER in line:
+                events['position_counts'].extend(int(n) for n in POSITIONS_PATTERN.findall(line))
+            if CONNECTED_MARKER in line:
+                for network, marker in NETWORK_MARKERS.items():
+                    if marker in line:
+                        events['networks'].add(network)
+            
+            for key, marker in MESSAGE_MARKERS.items():
+                message = open_messages[key]
+                if message is not None:
+                    # Past the sample a message is only counted, not kept
+                    if len(events[key]) < MESSAGE_SAMPLE_SIZE:
+                        message.append(line)
+                elif marker in line:
+                    open_messages[key] = [line[line.index(marker) + len(marker):]]
+        
+        for key in MESSAGE_MARKERS:
+            if open_messages[key] is not None:
+                close(key)
+        
+        return events
     
     def extract_timestamps(self):
-        """Extract all timestamps"""
-        pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})'
-        timestamps = re.findall(pattern, self.log_content)
-        return [datetime.strptime(ts, '%Y-%m-%d %H:%M:%S') for ts in timestamps]
+        """Extract the timestamps that start log lines"""
+        return [datetime.fromisoformat(ts) for ts in self.events['timestamps']]
     
-    def get_runtime_info(self):
+    @cached_property
+    def runtime_info(self):
         """Get bot runtime information"""
-        timestamps = self.extract_timestamps()
+        timestamps = self.events['timestamps']
         if not timestamps:
             return None
         
-        start_time = min(timestamps)
-        end_time = max(timestamps)
+        # Fixed-width 'YYYY-MM-DD HH:MM:SS' strings sort chronologically,
+        # so only the first and last need parsing
+        start_time = datetime.fromisoformat(min(timestamps))
+        end_time = datetime.fromisoformat(max(timestamps))
         runtime = end_time - start_time
         
         return {
@@ -42,19 +161,18 @@ class LogAnalyzer:
             'total_hours': runtime.total_seconds() / 3600
         }
     
-    def count_scans(self):
+    @cached_property
+    def scan_count(self):
         """Count total number of scans performed"""
-        pattern = r'🔍 SCANNING WATCHLIST FOR TRADING SIGNALS'
-        return len(re.findall(pattern, self.log_content))
+        return self.events['scans']
     
-    def analyze_signals(self):
+    @cached_property
+    def signal_stats(self):
         """Analyze signal patterns"""
-        # Extract all signal entries
-        pattern = r'Signal: (HOLD|BUY|SELL) ⭐+ \((\d+) stars?\)'
-        matches = re.findall(pattern, self.log_content)
+        matches = self.events['signals']
         
         signal_types = Counter([m[0] for m in matches])
-        star_distribution = Counter([int(m[1]) for m in matches])
+        star_distribution = Counter([m[1] for m in matches])
         
         return {
             'total_signals_checked': len(matches),
@@ -62,85 +180,93 @@ class LogAnalyzer:
             'star_distribution': dict(sorted(star_distribution.items()))
         }
     
-    def analyze_symbols(self):
+    @cached_property
+    def symbol_stats(self):
         """Analyze per-symbol activity"""
-        pattern = r'Analyzing ([\w]+)\.\.\.\s+.*?Signal: (HOLD|BUY|SELL) ⭐+ \((\d+) stars?\)'
-        matches = re.findall(pattern, self.log_content, re.DOTALL)
-        
-        symbol_data = defaultdict(lambda: {'total': 0, 'stars': []})
-        
-        for symbol, signal, stars in matches:
-            symbol_data[symbol]['total'] += 1
-            symbol_data[symbol]['stars'].append(int(stars))
+        content = self.log_content
+        # Running [checks, star sum, max stars] per symbol
+        totals = defaultdict(lambda: [0, 0, 0])
+        
+        # A Signal line belongs to the closest "Analyzing" line before it, as
+        # long as it comes before the next one and within SYMBOL_WINDOW bytes
+        analyzing = ANALYZING_PATTERN.finditer(content)
+        current = next(analyzing, None)
+        
+        while current is not None:
+            following = next(analyzing, None)
+            end = current.end() + SYMBOL_WINDOW
+            if following is not None:
+                end = min(end, following.start())
+            
+            signal = SIGNAL_PATTERN.search(content, current.end(), end)
+            if signal:
+                stars = int(signal.group(2))
+                data = totals[current.group(1)]
+                data[0] += 1
+                data[1] += stars
+                if stars > data[2]:
+                    data[2] = stars
+            
+            current = following
         
-        # Calculate averages
-        for symbol in symbol_data:
-            stars = symbol_data[symbol]['stars']
-            symbol_data[symbol]['avg_stars'] = sum(stars) / len(stars) if stars else 0
-            symbol_data[symbol]['max_stars'] = max(stars) if stars else 0
-        
-        return dict(symbol_data)
+        return {
+            symbol.decode(): {'total': count, 'avg_stars': star_sum / count, 'max_stars': max_stars}
+            for symbol, (count, star_sum, max_stars) in totals.items()
+        }
     
-    def check_trades_executed(self):
+    @cached_property
+    def trade_stats(self):
         """Check if any trades were executed"""
-        executing_pattern = r'🎯 EXECUTING TRADE'
-        executed_pattern = r'Trade #\d+ executed successfully'
-        
         return {
-            'trades_attempted': len(re.findall(executing_pattern, self.log_content)),
-            'trades_executed': len(re.findall(executed_pattern, self.log_content))
+            'trades_attempted': self.events['trades_attempted'],
+            'trades_executed': self.events['trades_executed']
         }
     
-    def check_positions(self):
+    @cached_property
+    def position_stats(self):
         """Check position monitoring"""
-        pattern = r'🎯 CHECKING POSITIONS - (\d+) open'
-        matches = re.findall(pattern, self.log_content)
+        position_counts = self.events['position_counts']
         
-        if not matches:
+        if not position_counts:
             return {'position_checks': 0, 'max_concurrent': 0}
         
-        position_counts = [int(m) for m in matches]
-        
         return {
-            'position_checks': len(matches),
+            'position_checks': len(position_counts),
             'max_concurrent': max(position_counts) if position_counts else 0,
             'avg_positions': sum(position_counts) / len(position_counts) if position_counts else 0
         }
     
-    def check_errors(self):
+    @cached_property
+    def message_stats(self):
         """Check for errors in logs"""
-        error_pattern = r'ERROR - (.*?)(?=\n\d{4}-\d{2}-\d{2}|\Z)'
-        warning_pattern = r'WARNING - (.*?)(?=\n\d{4}-\d{2}-\d{2}|\Z)'
-        
-        errors = re.findall(error_pattern, self.log_content, re.DOTALL)
-        warnings = re.findall(warning_pattern, self.log_content, re.DOTALL)
+        counts = self.events['message_counts']
         
         return {
-            'error_count': len(errors),
-            'warning_count': len(warnings),
-            'errors': [e.strip() for e in errors[:10]],  # First 10 errors
-            'warnings': [w.strip() for w in warnings[:10]]  # First 10 warnings
+            'error_count': counts['errors'],
+            'warning_count': counts['warnings'],
+            'errors': [e.strip() for e in self.events['errors']],  # First 10 errors
+            'warnings': [w.strip() for w in self.events['warnings']]  # First 10 warnings
         }
     
-    def check_connection_status(self):
+    @cached_property
+    def connection_status(self):
         """Check Binance connection status"""
-        testnet_pattern = r'Connected to Binance Futures TESTNET'
-        mainnet_pattern = r'Connected to Binance Futures MAINNET'
+        networks = self.events['networks']
         
-        if re.search(testnet_pattern, self.log_content):
+        if 'TESTNET' in networks:
             return 'TESTNET'
-        elif re.search(mainnet_pattern, self.log_content):
+        elif 'MAINNET' in networks:
             return 'MAINNET ⚠️ LIVE TRADING'
         return 'UNKNOWN'
     
-    def generate_report(self):
-        """Generate comprehensive analysis report"""
+    def _print_summary(self):
+        """Print the report header, runtime and connection status"""
         print("=" * 80)
         print("📊 ATHENA V2 LOG ANALYSIS REPORT")
         print("=" * 80)
         
         # Runtime info
-        runtime = self.get_runtime_info()
+        runtime = self.runtime_info
         if runtime:
             print(f"\n⏰ RUNTIME INFORMATION:")
             print(f"   Start Time: {runtime['start_time']}")
@@ -149,11 +275,21 @@ class LogAnalyzer:
             print(f"   Hours Running: {runtime['total_hours']:.2f} hours")
         
         # Connection status
-        connection = self.check_connection_status()
-        print(f"\n🔌 CONNECTION STATUS: {connection}")
+        print(f"\n🔌 CONNECTION STATUS: {self.connection_status}")
+    
+    def summary_only(self):
+        """Print only runtime and connection status, skipping the per-symbol scan"""
+        self._print_summary()
+        print("\n" + "=" * 80)
+    
+    def generate_report(self):
+        """Generate comprehensive analysis report"""
+        self._print_summary()
+        runtime = self.runtime_info
+        connection = self.connection_status
         
         # Scan information
-        scans = self.count_scans()
+        scans = self.scan_count
         print(f"\n🔍 SCANNING ACTIVITY:")
         print(f"   Total Scans: {scans}")
         if runtime:
@@ -162,21 +298,21 @@ class LogAnalyzer:
             print(f"   Expected: 4 scans/hour (every 15 min)")
         
         # Signal analysis
-        signals = self.analyze_signals()
+        signals = self.signal_stats
         print(f"\n📊 SIGNAL ANALYSIS:")
         print(f"   Total Signals Analyzed: {signals['total_signals_checked']}")
+        total_checked = signals['total_signals_checked']
+        pct_per_signal = 100.0 / total_checked if total_checked > 0 else 0.0
         print(f"   Signal Types:")
         for sig_type, count in signals['signal_types'].items():
-            pct = (count / signals['total_signals_checked'] * 100) if signals['total_signals_checked'] > 0 else 0
-            print(f"      {sig_type}: {count} ({pct:.1f}%)")
+            print(f"      {sig_type}: {count} ({count * pct_per_signal:.1f}%)")
         print(f"   Star Distribution:")
         for stars, count in signals['star_distribution'].items():
-            pct = (count / signals['total_signals_checked'] * 100) if signals['total_signals_checked'] > 0 else 0
-            print(f"      {'⭐' * stars} {stars} stars: {count} ({pct:.1f}%)")
+            print(f"      {'⭐' * stars} {stars} stars: {count} ({count * pct_per_signal:.1f}%)")
         
         # Symbol analysis
         print(f"\n📈 PER-SYMBOL ANALYSIS:")
-        symbols = self.analyze_symbols()
+        symbols = self.symbol_stats
         for symbol, data in sorted(symbols.items()):
             print(f"   {symbol}:")
             print(f"      Checks: {data['total']}")
@@ -184,7 +320,7 @@ class LogAnalyzer:
             print(f"      Max Stars: {data['max_stars']}")
         
         # Trade execution
-        trades = self.check_trades_executed()
+        trades = self.trade_stats
         print(f"\n💰 TRADE EXECUTION:")
         print(f"   Trades Executed: {trades['trades_executed']}")
         print(f"   Min Stars Required: 3⭐")
@@ -192,7 +328,7 @@ class LogAnalyzer:
             print(f"   ⚠️  No trades executed - signals below 3-star threshold")
         
         # Position monitoring
-        positions = self.check_positions()
+        positions = self.position_stats
         print(f"\n🎯 POSITION MONITORING:")
         print(f"   Position Checks: {positions['position_checks']}")
         print(f"   Max Concurrent Positions: {positions['max_concurrent']}")
@@ -200,7 +336,7 @@ class LogAnalyzer:
             print(f"   Avg Open Positions: {positions['avg_positions']:.2f}")
         
         # Error analysis
-        errors = self.check_errors()
+        errors = self.message_stats
         print(f"\n⚠️  ERROR & WARNING SUMMARY:")
         print(f"   Errors: {errors['error_count']}")
         print(f"   Warnings: {errors['warning_count']}")
@@ -266,16 +402,24 @@ class LogAnalyzer:
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) > 1:
-        log_file = sys.argv[1]
+    args = sys.argv[1:]
+    summary = '--summary' in args
+    if summary:
+        args.remove('--summary')
+    
+    if args:
+        log_file = args[0]
     else:
         log_file = "server_logs/athena_bot.log"
     
     if not Path(log_file).exists():
         print(f"❌ Log file not found: {log_file}")
-        print(f"\nUsage: python analyze_logs.py [log_file_path]")
+        print(f"\nUsage: python analyze_logs.py [--summary] [log_file_path]")
         print(f"Default: python analyze_logs.py server_logs/athena_bot.log")
         sys.exit(1)
     
     analyzer = LogAnalyzer(log_file)
-    analyzer.generate_report()
+    if summary:
+        analyzer.summary_only()
+    else:
+        analyzer.generate_report()
@@ -6,21 +6,211 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
+import hashlib
+import inspect
+import itertools
 import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from tabulate import tabulate
 
 from binance_client import BinanceFuturesClient
 from strategies import get_strategy, calculate_stop_loss_take_profit
 from signal_analyzer import SignalAnalyzer
 from logger import get_logger
+from numba_compat import njit
+from data_cache import get_klines_cached
 import config
 
 log = get_logger('Backtester')
 
+# Equity curve rows: epoch nanoseconds and capital
+EQUITY_DTYPE = np.dtype([('t', 'i8'), ('eq', 'f8')])
+
+# Exchange client shared by every Backtester that isn't given one
+_shared_client: Optional[BinanceFuturesClient] = None
+_shared_client_lock = threading.Lock()
+
+# Exit reasons by _scan_exit/_simulate exit code
+_EXIT_REASONS = (None, 'SL', 'TP', 'END')
+
+# Default search space of Backtester.sweep
+DEFAULT_SWEEP_GRID = {
+    'position_size_pct': [10.0],
+    'stop_loss_pct': [1.0, 2.0, 3.0],
+    'take_profit_pct': [2.0, 4.0, 6.0],
+    'min_signal_strength': [30.0, 50.0, 70.0]
+}
+
+
+@njit(cache=True)
+def _check_exit(is_long, stop_loss, take_profit, high, low):
+    """
+    Check one bar against a trade's stop loss and take profit
+    
+    Stop loss is checked before take profit, so a bar that spans both
+    counts as SL.
+    
+    Returns:
+        Exit code: 0 = still open, 1 = SL, 2 = TP (the exit price is the
+        level that was hit)
+    """
+    if is_long:
+        if low <= stop_loss:
+            return 1
+        if high >= take_profit:
+            return 2
+    else:
+        if high >= stop_loss:
+            return 1
+        if low <= take_profit:
+            return 2
+    
+    return 0
+
+
+@njit(cache=True)
+def _scan_exit(highs, lows, start, is_long, stop_loss, take_profit):
+    """
+    Find the first bar from start on where the stop loss or take profit is hit
+    
+    Returns:
+        (bar_index, exit_code) - exit_code from _check_exit; (-1, 0) if
+        neither is hit before the data ends
+    """
+    for j in range(start, len(highs)):
+        code = _check_exit(is_long, stop_loss, take_profit, highs[j], lows[j])
+        if code:
+            return j, code
+    
+    return -1, 0
+
+
+@njit(nogil=True, cache=True)
+def _simulate(highs, lows, closes, sides, stop_losses, take_profits, start,
+              initial_capital, position_size_pct, leverage):
+    """
+    Run the Backtester trade loop over precomputed entries
+    
+    sides holds 1 (LONG), -1 (SHORT) or 0 for every bar, with the stop loss
+    and take profit of an entry at that bar in stop_losses/take_profits.
+    highs and lows may be float32; they are only compared against the
+    float64 levels.
+    
+    A trade fills at the close of its signal bar and exits on the first bar
+    after it that hits SL or TP; no new entry is taken on the exit bar. A
+    trade still open when the data ends closes at the last close. Runs
+    without the GIL, so sweeps can call it from several threads.
+    
+    Returns:
+        Parallel arrays (entry_idx, exit_idx, exit_codes, exit_prices,
+        capitals) and the number of trades filled in. exit_codes index
+        _EXIT_REASONS; capitals is the capital after each trade.
+    """
+    n = closes.shape[0]
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    exit_codes = np.empty(n, dtype=np.int8)
+    exit_prices = np.empty(n, dtype=np.float64)
+    capitals = np.empty(n, dtype=np.float64)
+    
+    n_trades = 0
+    capital = initial_capital
+    i = start
+    
+    while i < n:
+        side = sides[i]
+        if side == 0:
+            i += 1
+            continue
+        
+        entry_price = closes[i]
+        j, code = _scan_exit(highs, lows, i + 1, side == 1, stop_losses[i], take_profits[i])
+        
+        if j < 0:
+            j, code, exit_price = n - 1, 3, closes[n - 1]
+        elif code == 1:
+            exit_price = stop_losses[i]
+        else:
+            exit_price = take_profits[i]
+        
+        # Same arithmetic as Trade.close and the capital update it feeds
+        if side == 1:
+            pnl_percent = ((exit_price - entry_price) / entry_price) * 100
+        else:
+            pnl_percent = ((entry_price - exit_price) / entry_price) * 100
+        capital += (pnl_percent / 100) * (capital * position_size_pct / 100) * leverage
+        
+        entry_idx[n_trades] = i
+        exit_idx[n_trades] = j
+        exit_codes[n_trades] = code
+        exit_prices[n_trades] = exit_price
+        capitals[n_trades] = capital
+        n_trades += 1
+        
+        i = j + 1
+    
+    return entry_idx, exit_idx, exit_codes, exit_prices, capitals, n_trades
+
+
+def _get_shared_client() -> BinanceFuturesClient:
+    """Exchange client for historical data, connected on first use"""
+    global _shared_client
+    
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = BinanceFuturesClient(
+                config.BINANCE_API_KEY,
+                config.BINANCE_API_SECRET,
+                config.BINANCE_TESTNET
+            )
+        return _shared_client
+
+
+def _kernel_hash() -> int:
+    """
+    Hash of the trade loop kernels' source
+    
+    _aot_build.py stores it in athena_sim, so a build from older kernels
+    can be recognized and ignored.
+    
+    Returns:
+        First 60 bits of the SHA-256 of the source (fits an int64)
+    """
+    source = ''.join(
+        inspect.getsource(getattr(kernel, 'py_func', kernel))
+        for kernel in (_check_exit, _scan_exit, _simulate)
+    )
+    return int(hashlib.sha256(source.encode('utf-8')).hexdigest()[:15], 16)
+
+
+# Ahead-of-time build of _simulate from _aot_build.py, which skips the JIT
+# compile on a fresh checkout; the JIT version is used when it isn't built
+# or was built from different kernels
+try:
+    import athena_sim
+except ImportError:
+    athena_sim = None
+
+_simulate_aot = None
+if athena_sim is not None:
+    if getattr(athena_sim, 'kernel_hash', lambda: None)() == _kernel_hash():
+        _simulate_aot = athena_sim.simulate
+    else:
+        log.warning("athena_sim is out of date, using the JIT trade loop (rebuild with scripts/_aot_build.py)")
+
 
 class Trade:
     """Represents a single trade"""
     
+    __slots__ = (
+        'entry_time', 'entry_price', 'side', 'quantity', 'stop_loss',
+        'take_profit', 'strategy', 'exit_time', 'exit_price', 'exit_reason',
+        'pnl', 'pnl_percent', 'status'
+    )
+    
     def __init__(self, entry_time, entry_price, side, quantity, stop_loss, take_profit, strategy):
         self.entry_time = entry_time
         self.entry_price = entry_price
@@ -70,21 +260,101 @@ class Trade:
         }
 
 
+class TradeBook:
+    """
+    Closed trades of one backtest, stored column-wise
+    
+    Every attribute holds one entry per trade, in the order the trades
+    closed; side is 1 (LONG) or -1 (SHORT) and exit_code indexes
+    _EXIT_REASONS. Per-trade objects and dicts are only built on request
+    (trade, tail_dicts).
+    """
+    
+    def __init__(
+        self,
+        strategy: str,
+        entry_time,
+        exit_time,
+        side: np.ndarray,
+        entry_price: np.ndarray,
+        exit_price: np.ndarray,
+        stop_loss: np.ndarray,
+        take_profit: np.ndarray,
+        quantity: np.ndarray,
+        exit_code: np.ndarray
+    ):
+        self.strategy = strategy
+        self.entry_time = entry_time
+        self.exit_time = exit_time
+        self.side = side
+        self.entry_price = entry_price
+        self.exit_price = exit_price
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.quantity = quantity
+        self.exit_code = exit_code
+        
+        # Same arithmetic as Trade.close
+        self.pnl_percent = (
+            np.where(side == 1, exit_price - entry_price, entry_price - exit_price) / entry_price * 100
+        )
+        self.pnl = self.pnl_percent  # Simplified for percentage-based
+    
+    def __len__(self):
+        return len(self.side)
+    
+    def trade(self, k: int) -> Trade:
+        """Trade object of the k-th trade"""
+        trade = Trade(
+            entry_time=self.entry_time[k],
+            entry_price=float(self.entry_price[k]),
+            side='LONG' if self.side[k] == 1 else 'SHORT',
+            quantity=float(self.quantity[k]),
+            stop_loss=float(self.stop_loss[k]),
+            take_profit=float(self.take_profit[k]),
+            strategy=self.strategy
+        )
+        trade.close(self.exit_time[k], float(self.exit_price[k]), _EXIT_REASONS[self.exit_code[k]])
+        return trade
+    
+    def tail_dicts(self, n: int = 10) -> List[Dict]:
+        """Dicts of the last n trades, as Trade.to_dict gives them, read straight from the arrays"""
+        return [
+            {
+                'entry_time': str(self.entry_time[k]),
+                'entry_price': float(self.entry_price[k]),
+                'side': 'LONG' if self.side[k] == 1 else 'SHORT',
+                'stop_loss': float(self.stop_loss[k]),
+                'take_profit': float(self.take_profit[k]),
+                'exit_time': str(self.exit_time[k]),
+                'exit_price': float(self.exit_price[k]),
+                'exit_reason': _EXIT_REASONS[self.exit_code[k]],
+                'pnl': round(float(self.pnl[k]), 2),
+                'pnl_percent': round(float(self.pnl_percent[k]), 2),
+                'status': 'CLOSED',
+                'strategy': self.strategy
+            }
+            for k in range(max(len(self) - n, 0), len(self))
+        ]
+
+
 class Backtester:
     """Backtesting engine"""
     
-    def __init__(self, initial_capital: float = 10000):
+    def __init__(self, initial_capital: float = 10000, client: Optional[BinanceFuturesClient] = None):
         """
         Initialize backtester
         
         Args:
             initial_capital: Starting capital in USDT
+            client: Exchange client for historical data (default: one shared client)
         """
         self.initial_capital = initial_capital
+        self.client = client
         self.capital = initial_capital
-        self.trades: List[Trade] = []
-        self.equity_curve = []
-        
+        self.book: Optional[TradeBook] = None
+        self.equity_curve = np.empty(0, dtype=EQUITY_DTYPE)
+    
     def get_historical_data(
         self,
         symbol: str,
@@ -98,16 +368,12 @@ class Backtester:
             symbol: Trading symbol
             interval: Candle interval
             days_back: Number of days to fetch
-            
+        
         Returns:
             DataFrame with OHLCV data
         """
         try:
-            client = BinanceFuturesClient(
-                config.BINANCE_API_KEY,
-                config.BINANCE_API_SECRET,
-                config.BINANCE_TESTNET
-            )
+            client = self.client or _get_shared_client()
             
             # Calculate limit based on interval
             interval_minutes = {
@@ -118,64 +384,62 @@ class Backtester:
             minutes = interval_minutes.get(interval, 15)
             limit = min(int((days_back * 24 * 60) / minutes), 1500)
             
-            klines = client.get_klines(symbol, interval, limit)
+            # Served from the on-disk cache when this window was fetched before
+            df = get_klines_cached(client, symbol, interval, limit)
             
-            if not klines:
+            if df.empty:
                 log.error(f"No data received for {symbol}")
-                return pd.DataFrame()
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            
-            # Convert types
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
+                return df
             
             log.info(f"Loaded {len(df)} candles for {symbol} ({interval})")
             return df
-            
+        
         except Exception as e:
             log.error(f"Error getting historical data: {e}")
             return pd.DataFrame()
     
-    def check_stop_loss_take_profit(
+    def _entry_signals(
         self,
-        trade: Trade,
-        current_time,
-        high: float,
-        low: float,
-        close: float
-    ) -> Tuple[bool, Optional[str]]:
+        signals: np.ndarray,
+        strengths: np.ndarray,
+        closes: np.ndarray,
+        start: int,
+        min_signal_strength: float,
+        stop_loss_pct: float,
+        take_profit_pct: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Check if SL or TP was hit
+        Entry signal of every bar from start on, as arrays for _simulate
+        
+        Args:
+            signals, strengths: Output of the strategy's vectorized_signals
+            closes: Close prices as float64 (entry prices)
         
         Returns:
-            (should_close, exit_reason)
+            (sides, stop_losses, take_profits) - side is 1 (LONG), -1 (SHORT)
+            or 0 when the bar has no signal of min_signal_strength
         """
-        if trade.side == 'LONG':
-            # Check stop loss
-            if low <= trade.stop_loss:
-                return True, 'SL', trade.stop_loss
-            
-            # Check take profit
-            if high >= trade.take_profit:
-                return True, 'TP', trade.take_profit
-        
-        else:  # SHORT
-            # Check stop loss
-            if high >= trade.stop_loss:
-                return True, 'SL', trade.stop_loss
+        # Signals of min_signal_strength from start on
+        entries = (signals != 0) & (strengths >= min_signal_strength)
+        entries[:start] = False
+        
+        n = len(closes)
+        sides = np.where(entries, signals, 0).astype(np.int8)
+        stop_losses = np.zeros(n)
+        take_profits = np.zeros(n)
+        
+        for i in np.flatnonzero(entries):
+            signal = 'LONG' if sides[i] == 1 else 'SHORT'
+            stop_losses[i], take_profits[i] = calculate_stop_loss_take_profit(
+                float(closes[i]),
+                signal,
+                stop_loss_pct,
+                take_profit_pct
+            )
             
-            # Check take profit
-            if low <= trade.take_profit:
-                return True, 'TP', trade.take_profit
+            log.debug(f"Signal: {signal} @ {closes[i]} (Strength: {strengths[i]}%)")
         
-        return False, None, None
+        return sides, stop_losses, take_profits
     
     def run_backtest(
         self,
@@ -186,7 +450,8 @@ class Backtester:
         position_size_pct: float = 10.0,
         stop_loss_pct: float = 2.0,
         take_profit_pct: float = 4.0,
-        min_signal_strength: float = 50.0
+        min_signal_strength: float = 50.0,
+        df: Optional[pd.DataFrame] = None
     ) -> Dict:
         """
         Run backtest on historical data
@@ -200,7 +465,8 @@ class Backtester:
             stop_loss_pct: Stop loss percentage
             take_profit_pct: Take profit percentage
             min_signal_strength: Minimum signal strength required
-            
+            df: Prepared klines (optional, fetched for days_back if None)
+        
         Returns:
             Backtest results dictionary
         """
@@ -209,11 +475,13 @@ class Backtester:
         
         # Reset state
         self.capital = self.initial_capital
-        self.trades = []
-        self.equity_curve = [(datetime.now(), self.initial_capital)]
+        self.book = None
+        self.equity_curve = np.empty(0, dtype=EQUITY_DTYPE)
+        started = np.datetime64(datetime.now(), 'ns').astype(np.int64)
         
         # Get historical data
-        df = self.get_historical_data(symbol, interval, days_back)
+        if df is None:
+            df = self.get_historical_data(symbol, interval, days_back)
         
         if df.empty:
             return {'error': 'No historical data available'}
@@ -223,84 +491,155 @@ class Backtester:
         if not strategy:
             return {'error': f'Strategy {strategy_name} not found'}
         
-        # Track open trade
-        open_trade = None
-        
-        # Iterate through data
-        for i in range(100, len(df)):  # Start after enough data for indicators
-            current_data = df.iloc[:i+1]
-            current_time = current_data.iloc[-1]['timestamp']
-            current_price = current_data.iloc[-1]['close']
-            current_high = current_data.iloc[-1]['high']
-            current_low = current_data.iloc[-1]['low']
-            
-            # Check if we have an open trade
-            if open_trade:
-                # Check SL/TP
-                should_close, exit_reason, exit_price = self.check_stop_loss_take_profit(
-                    open_trade, current_time, current_high, current_low, current_price
-                )
-                
-                if should_close:
-                    open_trade.close(current_time, exit_price, exit_reason)
-                    self.capital += (open_trade.pnl_percent / 100) * (self.capital * position_size_pct / 100) * config.DEFAULT_LEVERAGE
-                    self.trades.append(open_trade)
-                    self.equity_curve.append((current_time, self.capital))
-                    open_trade = None
-                    continue
-            
-            # Look for new signal
-            if not open_trade:
-                try:
-                    # Generate signal
-                    signal_result = strategy.analyze(current_data, symbol)
-                    
-                    if signal_result and signal_result.get('signal'):
-                        signal = signal_result['signal']
-                        strength = signal_result.get('strength', 0)
-                        
-                        # Check if signal meets minimum strength
-                        if strength >= min_signal_strength:
-                            # Calculate position size
-                            position_value = self.capital * (position_size_pct / 100)
-                            
-                            # Calculate SL/TP
-                            stop_loss, take_profit = calculate_stop_loss_take_profit(
-                                current_price,
-                                signal,
-                                stop_loss_pct,
-                                take_profit_pct
-                            )
-                            
-                            # Create trade
-                            open_trade = Trade(
-                                entry_time=current_time,
-                                entry_price=current_price,
-                                side=signal,
-                                quantity=position_value / current_price,
-                                stop_loss=stop_loss,
-                                take_profit=take_profit,
-                                strategy=strategy_name
-                            )
-                            
-                            log.debug(f"Signal: {signal} @ {current_price} (Strength: {strength}%)")
-                
-                except Exception as e:
-                    log.error(f"Error analyzing candle {i}: {e}")
-                    continue
-        
-        # Close any remaining open trade
-        if open_trade:
-            open_trade.close(df.iloc[-1]['timestamp'], df.iloc[-1]['close'], 'END')
-            self.capital += (open_trade.pnl_percent / 100) * (self.capital * position_size_pct / 100) * config.DEFAULT_LEVERAGE
-            self.trades.append(open_trade)
-            self.equity_curve.append((df.iloc[-1]['timestamp'], self.capital))
+        # Columns as arrays, bound once for the whole run. Highs and lows only
+        # feed the SL/TP hit scan, so they are kept as float32; fills and P&L
+        # use the float64 closes and levels.
+        times = df['timestamp'].array
+        highs = df['high'].to_numpy(dtype=np.float32)
+        lows = df['low'].to_numpy(dtype=np.float32)
+        closes = df['close'].to_numpy(dtype=np.float64)
+        
+        # Entries per bar, then the compiled trade loop over them
+        start = strategy.min_bars  # Start once the strategy's indicators are warm
+        signals, strengths = strategy.vectorized_signals(df, symbol, start)
+        sides, stop_losses, take_profits = self._entry_signals(
+            signals, strengths, closes, start,
+            min_signal_strength, stop_loss_pct, take_profit_pct
+        )
+        
+        simulate = _simulate_aot or _simulate
+        entry_idx, exit_idx, exit_codes, exit_prices, capitals, n_trades = simulate(
+            highs, lows, closes, sides, stop_losses, take_profits, start,
+            float(self.initial_capital), float(position_size_pct),
+            float(config.DEFAULT_LEVERAGE)
+        )
+        
+        entry_idx, exit_idx, capitals = entry_idx[:n_trades], exit_idx[:n_trades], capitals[:n_trades]
+        entry_prices = closes[entry_idx]
+        
+        # Each trade is sized from the capital left by the previous one
+        capital_before = np.concatenate(([float(self.initial_capital)], capitals[:-1]))[:n_trades]
+        
+        exit_times = times[exit_idx]
+        self.book = TradeBook(
+            strategy=strategy_name,
+            entry_time=times[entry_idx],
+            exit_time=exit_times,
+            side=sides[entry_idx],
+            entry_price=entry_prices,
+            exit_price=exit_prices[:n_trades],
+            stop_loss=stop_losses[entry_idx],
+            take_profit=take_profits[entry_idx],
+            quantity=capital_before * (position_size_pct / 100) / entry_prices,
+            exit_code=exit_codes[:n_trades]
+        )
+        
+        if n_trades:
+            self.capital = float(capitals[-1])
+        
+        # Starting capital, then the capital after each trade
+        self.equity_curve = np.empty(n_trades + 1, dtype=EQUITY_DTYPE)
+        self.equity_curve[0] = (started, self.initial_capital)
+        self.equity_curve['t'][1:] = np.asarray(exit_times, dtype='datetime64[ns]').view(np.int64)
+        self.equity_curve['eq'][1:] = capitals
         
         # Calculate statistics
         results = self.calculate_statistics(symbol, strategy_name, interval, days_back)
         
         return results
     
+    def sweep(
+        self,
+        symbol: str,
+        strategy_name: str,
+        param_grid: Dict[str, List] = None,
+        interval: str = '15m',
+        days_back: int = 30,
+        df: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Backtest every combination of a parameter grid over the same data
+        
+        Signals are computed once; each combination then runs the compiled
+        trade loop in a thread pool, since _simulate releases the GIL and
+        only reads the shared price arrays.
+        
+        Args:
+            symbol: Trading symbol
+            strategy_name: Strategy to test
+            param_grid: Lists of values for position_size_pct, stop_loss_pct,
+                take_profit_pct and min_signal_strength (default: DEFAULT_SWEEP_GRID)
+            interval: Candle interval
+            days_back: Days of history to test
+            df: Prepared klines (optional, fetched for days_back if None)
+        
+        Returns:
+            DataFrame with one row per combination, best return first
+            (empty if there is no data or the strategy is unknown)
+        """
+        grid = {**DEFAULT_SWEEP_GRID, **(param_grid or {})}
+        names = list(DEFAULT_SWEEP_GRID)
+        combos = list(itertools.product(*(grid[name] for name in names)))
+        
+        if df is None:
+            df = self.get_historical_data(symbol, interval, days_back)
+        
+        strategy = get_strategy(strategy_name)
+        if df.empty or not strategy:
+            log.error(f"Cannot sweep {strategy_name} on {symbol}: no data or unknown strategy")
+            return pd.DataFrame()
+        
+        highs = df['high'].to_numpy(dtype=np.float32)
+        lows = df['low'].to_numpy(dtype=np.float32)
+        closes = df['close'].to_numpy(dtype=np.float64)
+        start = strategy.min_bars
+        signals, strengths = strategy.vectorized_signals(df, symbol, start)
+        
+        # Entry arrays don't depend on the position size, so they are built
+        # once per (strength, SL, TP) here, before the threads start
+        entries = {}
+        for size, sl, tp, strength in combos:
+            if (strength, sl, tp) not in entries:
+                entries[strength, sl, tp] = self._entry_signals(
+                    signals, strengths, closes, start, strength, sl, tp
+                )
+        
+        def simulate(combo):
+            size, sl, tp, strength = combo
+            sides, stop_losses, take_profits = entries[strength, sl, tp]
+            return _simulate(
+                highs, lows, closes, sides, stop_losses, take_profits, start,
+                float(self.initial_capital), float(size), float(config.DEFAULT_LEVERAGE)
+            )
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            runs = list(executor.map(simulate, combos))
+        
+        # Statistics, as in calculate_statistics
+        rows = []
+        for (size, sl, tp, strength), (entry_idx, _, _, exit_prices, capitals, n_trades) in zip(combos, runs):
+            entry_idx = entry_idx[:n_trades]
+            side = entries[strength, sl, tp][0][entry_idx]
+            entry_prices = closes[entry_idx]
+            exits = exit_prices[:n_trades]
+            pnls = np.where(side == 1, exits - entry_prices, entry_prices - exits) / entry_prices * 100
+            losses = pnls[pnls < 0]
+            
+            equity = np.concatenate(([float(self.initial_capital)], capitals[:n_trades]))
+            peaks = np.maximum.accumulate(equity)
+            
+            rows.append({
+                'total_return_pct': (equity[-1] - self.initial_capital) / self.initial_capital * 100,
+                'total_trades': int(n_trades),
+                'win_rate_pct': (pnls > 0).sum() / n_trades * 100 if n_trades else 0.0,
+                'profit_factor': (abs(pnls[pnls > 0].sum() / losses.sum()) if len(losses)
+                                  else float('inf') if n_trades else 0.0),
+                'max_drawdown_pct': max(float(((peaks - equity) / peaks * 100).max()), 0)
+            })
+        
+        table = pd.concat([pd.DataFrame(combos, columns=names), pd.DataFrame(rows)], axis=1)
+        return table.sort_values('total_return_pct', ascending=False, kind='stable').reset_index(drop=True)
+    
     def calculate_statistics(
         self,
         symbol: str,
@@ -310,7 +649,7 @@ class Backtester:
     ) -> Dict:
         """Calculate backtest statistics"""
         
-        if not self.trades:
+        if not self.book:
             return {
                 'error': 'No trades executed',
                 'symbol': symbol,
@@ -318,43 +657,43 @@ class Backtester:
                 'interval': interval
             }
         
-        # Basic stats
-        total_trades = len(self.trades)
-        winning_trades = [t for t in self.trades if t.pnl > 0]
-        losing_trades = [t for t in self.trades if t.pnl < 0]
+        # Trade outcomes are arrays, so every stat is one masked reduction
+        total_trades = len(self.book)
+        pnls = self.book.pnl
+        is_long = self.book.side == 1
         
-        win_count = len(winning_trades)
-        loss_count = len(losing_trades)
+        # Basic stats
+        win_mask = pnls > 0
+        loss_mask = pnls < 0
+        win_count = int(win_mask.sum())
+        loss_count = int(loss_mask.sum())
         win_rate = (win_count / total_trades * 100) if total_trades > 0 else 0
         
         # P&L
-        total_pnl = sum(t.pnl for t in self.trades)
-        avg_win = np.mean([t.pnl for t in winning_trades]) if winning_trades else 0
-        avg_loss = np.mean([t.pnl for t in losing_trades]) if losing_trades else 0
+        wins = pnls[win_mask]
+        losses = pnls[loss_mask]
+        total_pnl = float(pnls.sum())
+        avg_win = wins.mean() if win_count else 0
+        avg_loss = losses.mean() if loss_count else 0
         
         # Risk metrics
-        profit_factor = abs(sum(t.pnl for t in winning_trades) / sum(t.pnl for t in losing_trades)) if losing_trades else float('inf')
+        profit_factor = abs(float(wins.sum()) / float(losses.sum())) if loss_count else float('inf')
         
         # Returns
         total_return = ((self.capital - self.initial_capital) / self.initial_capital) * 100
         
-        # Max drawdown
-        peak = self.initial_capital
-        max_dd = 0
-        for _, equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            dd = ((peak - equity) / peak) * 100
-            if dd > max_dd:
-                max_dd = dd
+        # Max drawdown against the running equity peak
+        equity = self.equity_curve['eq']
+        peaks = np.maximum.accumulate(np.maximum(equity, self.initial_capital))
+        max_dd = max(float((((peaks - equity) / peaks) * 100).max()), 0)
         
         # Trade breakdown
-        long_trades = [t for t in self.trades if t.side == 'LONG']
-        short_trades = [t for t in self.trades if t.side == 'SHORT']
+        long_count = int(is_long.sum())
+        short_count = total_trades - long_count
         
         # Exit reasons
-        sl_exits = len([t for t in self.trades if t.exit_reason == 'SL'])
-        tp_exits = len([t for t in self.trades if t.exit_reason == 'TP'])
+        sl_exits = int((self.book.exit_code == 1).sum())
+        tp_exits = int((self.book.exit_code == 2).sum())
         
         results = {
             'symbol': symbol,
@@ -373,22 +712,33 @@ class Backtester:
             'avg_loss_pct': round(avg_loss, 2),
             'profit_factor': round(profit_factor, 2),
             'max_drawdown_pct': round(max_dd, 2),
-            'long_trades': len(long_trades),
-            'short_trades': len(short_trades),
+            'long_trades': long_count,
+            'short_trades': short_count,
             'tp_exits': tp_exits,
             'sl_exits': sl_exits,
-            'trades': [t.to_dict() for t in self.trades[-10:]]  # Last 10 trades
+            'trades': self.book.tail_dicts(10)  # Last 10 trades
         }
         
         return results
     
-    def print_results(self, results: Dict):
-        """Print backtest results in a formatted way"""
+    def print_results(self, results: Dict, compact: bool = False):
+        """
+        Print backtest results in a formatted way
+        
+        Args:
+            results: Output of run_backtest
+            compact: Print the summary as one JSON line instead of the
+                colored report (always the case when stdout is not a terminal)
+        """
         
         if 'error' in results:
             log.error(f"Backtest Error: {results['error']}")
             return
         
+        if compact or not sys.stdout.isatty():
+            print(json.dumps({key: value for key, value in results.items() if key != 'trades'}))
+            return
+        
         print("\n" + "="*70)
         print(f"  BACKTEST RESULTS - {results['strategy']}")
         print("="*70)
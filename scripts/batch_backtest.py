@@ -1,17 +1,46 @@
 """
 Batch Backtesting - Test multiple strategies/symbols at once
 """
+import os
 import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+import orjson
 from backtest import Backtester
+from binance_client import BinanceFuturesClient
 from logger import get_logger
 import config
 
 log = get_logger('BatchBacktest')
 
+# Result fields the summary reads back from the NDJSON file
+SUMMARY_FIELDS = ('symbol', 'strategy', 'total_return_pct', 'win_rate_pct', 'total_trades')
 
-def run_batch_backtest():
-    """Run backtests on multiple strategies"""
+
+def _run_one(symbol: str, strategy: str, interval: str, days_back: int, df=None) -> dict:
+    """One batch backtest (module-level so it can run in a worker process)"""
+    backtester = Backtester(initial_capital=10000)
+    return backtester.run_backtest(
+        symbol=symbol,
+        strategy_name=strategy,
+        interval=interval,
+        days_back=days_back,
+        position_size_pct=10.0,
+        stop_loss_pct=2.0,
+        take_profit_pct=4.0,
+        min_signal_strength=50.0,
+        df=df
+    )
+
+
+def run_batch_backtest(compact: bool = False):
+    """
+    Run backtests on multiple strategies
+    
+    Args:
+        compact: Report each result as one JSON line (see Backtester.print_results)
+    """
     
     print("\n" + "="*80)
     print("  🤖 ATHENA BOT - BATCH BACKTESTING")
@@ -35,41 +64,67 @@ def run_batch_backtest():
     print(f"  Min Signal Strength: 50%")
     print("\n" + "="*80 + "\n")
     
-    all_results = []
+    # Each result is appended to an NDJSON file as it arrives rather than
+    # kept in memory; the summary reads the file back afterwards
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filepath = f"trading_data/batch_backtest_{timestamp}.ndjson"
+    written = 0
     
-    # Run backtests
-    for symbol in symbols:
-        for strategy in strategies:
-            print(f"\n{'='*80}")
-            print(f"Testing {strategy} on {symbol}...")
-            print('='*80 + "\n")
+    # One-line results are written in blocks and flushed once at the end
+    if compact:
+        sys.stdout.reconfigure(line_buffering=False)
+    
+    # Klines are loaded once per symbol over one client connection (from
+    # the disk cache when possible) and handed to every strategy's backtest
+    client = BinanceFuturesClient(config.BINANCE_API_KEY, config.BINANCE_API_SECRET, config.BINANCE_TESTNET)
+    printer = Backtester(initial_capital=10000, client=client)
+    klines = {symbol: printer.get_historical_data(symbol, interval, days_back) for symbol in symbols}
+    
+    # Every (symbol, strategy) backtest is independent, so they run in
+    # worker processes and are reported as they finish. Spawn rather than
+    # fork, so workers don't inherit the logger's listener thread
+    tasks = [(symbol, strategy) for symbol in symbols for strategy in strategies]
+    workers = min(len(tasks), os.cpu_count() or 1)
+    
+    with open(filepath, 'wb') as out, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {
+            executor.submit(_run_one, symbol, strategy, interval, days_back, klines[symbol]): (symbol, strategy)
+            for symbol, strategy in tasks
+        }
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            symbol, strategy = futures[future]
+            if not compact:
+                print(f"\n{'='*80}")
+                print(f"[{done}/{len(tasks)}] {strategy} on {symbol}")
+                print('='*80 + "\n")
+            
+            error = future.exception()
+            if error is not None:
+                log.error(f"Error testing {strategy} on {symbol}: {error}")
+                print(f"❌ Error: {error}\n")
+                continue
             
-            try:
-                backtester = Backtester(initial_capital=10000)
-                
-                results = backtester.run_backtest(
-                    symbol=symbol,
-                    strategy_name=strategy,
-                    interval=interval,
-                    days_back=days_back,
-                    position_size_pct=10.0,
-                    stop_loss_pct=2.0,
-                    take_profit_pct=4.0,
-                    min_signal_strength=50.0
-                )
-                
-                if 'error' not in results:
-                    backtester.print_results(results)
-                    all_results.append(results)
-                else:
-                    print(f"❌ Error: {results['error']}\n")
-                
-            except Exception as e:
-                log.error(f"Error testing {strategy} on {symbol}: {e}")
-                print(f"❌ Error: {e}\n")
+            results = future.result()
+            if 'error' not in results:
+                printer.print_results(results, compact=compact)
+                out.write(orjson.dumps(results, option=orjson.OPT_SERIALIZE_NUMPY) + b'\n')
+                written += 1
+            else:
+                print(f"❌ Error: {results['error']}\n")
+    
+    if not written:
+        os.remove(filepath)
     
     # Summary
-    if all_results:
+    if written:
+        all_results = []
+        with open(filepath, 'rb') as f:
+            for line in f:
+                r = orjson.loads(line)
+                all_results.append({key: r[key] for key in SUMMARY_FIELDS})
+        
         print("\n" + "="*80)
         print("  📊 SUMMARY - ALL STRATEGIES")
         print("="*80 + "\n")
@@ -101,17 +156,10 @@ def run_batch_backtest():
         print(f"  Average Win Rate: {avg_win_rate:.1f}%")
         print(f"  Total Trades: {total_trades}")
         
-        # Save combined results
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"batch_backtest_{timestamp}.json"
-        
-        import json
-        with open(f"trading_data/{filename}", 'w') as f:
-            json.dump(all_results, f, indent=2)
-        
-        print(f"\n✅ Full results saved to trading_data/{filename}")
+        print(f"\n✅ Full results saved to {filepath}")
     
     print("\n" + "="*80 + "\n")
+    sys.stdout.flush()
 
 
 def run_quick_test():
@@ -145,10 +193,9 @@ def run_quick_test():
 
 
 if __name__ == "__main__":
-    import os
     os.makedirs('trading_data', exist_ok=True)
     
     if len(sys.argv) > 1 and sys.argv[1] == 'quick':
         run_quick_test()
     else:
-        run_batch_backtest()
+        run_batch_backtest(compact='--json' in sys.argv[1:])
@@ -4,52 +4,192 @@ Compare single timeframe vs multi-timeframe strategies
 """
 
 import sys
-from datetime import datetime
-from tabulate import tabulate
-import json
 
-from binance_client import BinanceFuturesClient
-from advanced_backtest import AdvancedBacktester
-from backtest import Backtester
-from strategies import TripleEMAStrategy
-from config import BINANCE_API_KEY, BINANCE_API_SECRET, BINANCE_TESTNET
+# The backtesting stack (pandas, numba, the exchange client) is imported
+# inside the functions that need it, so argv errors fail fast and the
+# worker processes only load the half they actually run
+
+
+# Columns of the shared klines matrix (timestamp in epoch milliseconds)
+_KLINE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+def _share_klines(df):
+    """
+    Copy a klines frame into a shared memory block for the worker processes.
+    
+    Args:
+        df: Frame with timestamp and OHLCV columns
+    
+    Returns:
+        Tuple of the SharedMemory (the caller closes and unlinks it) and
+        the (name, shape, dtype) spec the workers attach with
+    """
+    import numpy as np
+    from multiprocessing.shared_memory import SharedMemory
+    
+    arr = np.column_stack([
+        df['timestamp'].to_numpy(dtype='datetime64[ms]').astype(np.int64).astype(np.float64),
+        df[_KLINE_COLUMNS[1:]].to_numpy(dtype=np.float64)
+    ])
+    
+    shm = SharedMemory(create=True, size=arr.nbytes)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+    
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def _attach_klines(spec):
+    """
+    Rebuild the klines frame from a shared memory spec made by _share_klines.
+    
+    Args:
+        spec: (name, shape, dtype) of the shared block
+    
+    Returns:
+        DataFrame with timestamp and float64 OHLCV columns
+    """
+    import numpy as np
+    import pandas as pd
+    from multiprocessing.shared_memory import SharedMemory
+    
+    name, shape, dtype = spec
+    shm = SharedMemory(name=name)
+    try:
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        df = pd.DataFrame({
+            'timestamp': pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'),
+            **{col: arr[:, i].copy() for i, col in enumerate(_KLINE_COLUMNS[1:], 1)}
+        })
+        del arr
+    finally:
+        shm.close()
+    
+    return df
+
+
+def _format_table(rows, headers) -> str:
+    """
+    Render rows as a plain-text grid table (numbers right-aligned).
+    
+    Args:
+        rows: Table rows, one value per header
+        headers: Column headers
+    
+    Returns:
+        Table as a multi-line string
+    """
+    widths = [max(len(str(c)) for c in col) for col in zip(headers, *rows)]
+    separator = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    
+    def render(row):
+        cells = (
+            f"{c:>{w}}" if isinstance(c, (int, float)) else f"{str(c):<{w}}"
+            for c, w in zip(row, widths)
+        )
+        return "| " + " | ".join(cells) + " |"
+    
+    lines = [separator, render(headers), separator.replace("-", "=")]
+    for row in rows:
+        lines += [render(row), separator]
+    
+    return "\n".join(lines)
+
+
+def _run_baseline(symbol: str, days: int, klines_spec) -> dict:
+    """Baseline single-timeframe backtest (module-level so it can run in a worker process)."""
+    from backtest import Backtester
+    
+    backtester = Backtester(initial_capital=10000.0)
+    return backtester.run_backtest(
+        symbol=symbol,
+        strategy_name="TRIPLE_EMA",
+        interval="15m",
+        days_back=days,
+        position_size_pct=95.0,
+        df=_attach_klines(klines_spec)
+    )
+
+
+def _run_mtf(symbol: str, days: int, klines_spec, strategy_config: dict = None) -> dict:
+    """MTF enhanced backtest, optionally with custom strategy parameters (runs in a worker process)."""
+    from binance_client import BinanceFuturesClient
+    from advanced_backtest import AdvancedBacktester
+    from config import BINANCE_API_KEY, BINANCE_API_SECRET, BINANCE_TESTNET
+    
+    client = BinanceFuturesClient(BINANCE_API_KEY, BINANCE_API_SECRET, testnet=BINANCE_TESTNET)
+    backtester = AdvancedBacktester(client, initial_capital=10000.0)
+    return backtester.run_mtf_backtest(
+        symbol=symbol,
+        primary_timeframe="15m",
+        confirmation_timeframes=["1h", "4h"],
+        days_back=days,
+        strategy_config=strategy_config,
+        df=_attach_klines(klines_spec)
+    )
 
 
 def compare_strategies(symbol="ETHUSDT", days=30):
     """Compare baseline vs enhanced MTF strategy."""
+    import multiprocessing
+    from datetime import datetime
+    from concurrent.futures import ProcessPoolExecutor
+    import orjson
+    
+    from binance_client import BinanceFuturesClient
+    from data_cache import get_klines_cached
+    from optimize import run_sweep, best_config
+    from config import BINANCE_API_KEY, BINANCE_API_SECRET, BINANCE_TESTNET
     
     print(f"\n{'='*80}")
     print(f"STRATEGY COMPARISON: Baseline vs Multi-Timeframe Enhanced")
     print(f"Symbol: {symbol} | Period: {days} days")
     print(f"{'='*80}\n")
     
+    # Pick the optimized parameters with one parallel sweep over this window
+    print("🔍 Sweeping strategy parameters...")
     client = BinanceFuturesClient(BINANCE_API_KEY, BINANCE_API_SECRET, testnet=BINANCE_TESTNET)
+    df = get_klines_cached(client, symbol, "15m", min(days * 24 * 4, 1500))
     
-    # Test 1: Baseline (from previous batch backtest)
-    print("1️⃣  Running BASELINE Strategy (Single Timeframe - 15m)...")
-    baseline_backtester = Backtester(initial_capital=10000.0)
-    baseline_result = baseline_backtester.run_backtest(
-        symbol=symbol,
-        strategy_name="TRIPLE_EMA",
-        interval="15m",
-        days_back=days,
-        position_size_pct=95.0
+    if df.empty:
+        print("   ❌ Error: No historical data available\n")
+        return
+    
+    sweep_results = run_sweep(df)
+    optimized_config = best_config(sweep_results)
+    optimized_label = (
+        f"{optimized_config['fast']}/{optimized_config['medium']}/{optimized_config['slow']} EMA, "
+        f"{optimized_config['atr_mult']}x ATR"
     )
+    print(f"   ✅ Best of {len(sweep_results)} combinations: {optimized_label}\n")
     
+    # The three backtests are independent, so run them side by side. They
+    # all test the same window, so the klines are handed over once through
+    # shared memory instead of being fetched or pickled per worker
+    print("Running BASELINE, MTF ENHANCED and OPTIMIZED backtests in parallel...\n")
+    shm, klines_spec = _share_klines(df)
+    try:
+        # Spawn rather than fork: forking after the sweep has started Numba's
+        # thread pool can leave the workers hanging
+        with ProcessPoolExecutor(max_workers=3, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [
+                executor.submit(_run_baseline, symbol, days, klines_spec),
+                executor.submit(_run_mtf, symbol, days, klines_spec),
+                executor.submit(_run_mtf, symbol, days, klines_spec, optimized_config)
+            ]
+            baseline_result, mtf_result, optimized_result = [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    # Test 1: Baseline (from previous batch backtest)
+    print("1️⃣  BASELINE Strategy (Single Timeframe - 15m)")
     print(f"   ✅ Baseline: {baseline_result['total_return_pct']:.2f}% return, "
           f"{baseline_result['total_trades']} trades, "
           f"{baseline_result['win_rate_pct']:.1f}% win rate\n")
     
     # Test 2: MTF Enhanced Strategy
-    print("2️⃣  Running MTF ENHANCED Strategy (15m + 1h + 4h confirmation)...")
-    mtf_backtester = AdvancedBacktester(client, initial_capital=10000.0)
-    mtf_result = mtf_backtester.run_mtf_backtest(
-        symbol=symbol,
-        primary_timeframe="15m",
-        confirmation_timeframes=["1h", "4h"],
-        days_back=days
-    )
-    
+    print("2️⃣  MTF ENHANCED Strategy (15m + 1h + 4h confirmation)")
     if 'error' not in mtf_result:
         print(f"   ✅ MTF Enhanced: {mtf_result['total_return_pct']:.2f}% return, "
               f"{mtf_result['statistics']['total_trades']} trades, "
@@ -59,24 +199,7 @@ def compare_strategies(symbol="ETHUSDT", days=30):
         return
     
     # Test 3: Optimized Parameters
-    print("3️⃣  Running OPTIMIZED Strategy (Best parameters from optimization)...")
-    optimized_config = {
-        'fast': 12,
-        'medium': 21,
-        'slow': 50,
-        'atr_mult': 2.5,
-        'vol_thresh': 1.2,
-        'require_vol': True
-    }
-    
-    optimized_result = mtf_backtester.run_mtf_backtest(
-        symbol=symbol,
-        primary_timeframe="15m",
-        confirmation_timeframes=["1h", "4h"],
-        days_back=days,
-        strategy_config=optimized_config
-    )
-    
+    print("3️⃣  OPTIMIZED Strategy (Best parameters from optimization)")
     if 'error' not in optimized_result:
         print(f"   ✅ Optimized: {optimized_result['total_return_pct']:.2f}% return, "
               f"{optimized_result['statistics']['total_trades']} trades, "
@@ -113,7 +236,7 @@ def compare_strategies(symbol="ETHUSDT", days=30):
     # Optimized
     if 'error' not in optimized_result:
         comparison_data.append([
-            "Optimized (12/21 EMA, 2.5x ATR)",
+            f"Optimized ({optimized_label})",
             f"{optimized_result['total_return_pct']:.2f}%",
             optimized_result['statistics']['total_trades'],
             f"{optimized_result['statistics']['win_rate']:.1f}%",
@@ -121,10 +244,9 @@ def compare_strategies(symbol="ETHUSDT", days=30):
             f"{optimized_result['statistics']['max_drawdown_pct']:.2f}%"
         ])
     
-    print(tabulate(
+    print(_format_table(
         comparison_data,
-        headers=['Strategy', 'Return', 'Trades', 'Win Rate', 'Profit Factor', 'Max DD'],
-        tablefmt='grid'
+        ['Strategy', 'Return', 'Trades', 'Win Rate', 'Profit Factor', 'Max DD']
     ))
     
     # Calculate improvements
@@ -156,7 +278,8 @@ def compare_strategies(symbol="ETHUSDT", days=30):
     
     if 'error' not in optimized_result and optimized_result['total_return_pct'] > baseline_result['total_return_pct']:
         print("\n✅ Use the OPTIMIZED MTF Strategy for live trading!")
-        print(f"   Config: Fast EMA: 12, Medium EMA: 21, ATR Multiplier: 2.5x")
+        print(f"   Config: Fast EMA: {optimized_config['fast']}, Medium EMA: {optimized_config['medium']}, "
+              f"Slow EMA: {optimized_config['slow']}, ATR Multiplier: {optimized_config['atr_mult']}x")
         print(f"   Expected: ~{optimized_result['total_return_pct']:.2f}% return per {days} days")
         print(f"   Win Rate: ~{optimized_result['statistics']['win_rate']:.1f}%")
     elif 'error' not in mtf_result and mtf_result['total_return_pct'] > baseline_result['total_return_pct']:
@@ -173,14 +296,14 @@ def compare_strategies(symbol="ETHUSDT", days=30):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"trading_data/strategy_comparison_{symbol}_{timestamp}.json"
     
-    with open(filename, 'w') as f:
-        json.dump({
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps({
             'symbol': symbol,
             'days': days,
             'baseline': baseline_result,
             'mtf_enhanced': mtf_result if 'error' not in mtf_result else {'error': mtf_result.get('error')},
             'optimized': optimized_result if 'error' not in optimized_result else {'error': optimized_result.get('error')}
-        }, f, indent=2, default=str)
+        }, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC))
     
     print(f"💾 Results saved to: {filename}\n")
 
@@ -0,0 +1,226 @@
+"""
+Parallel parameter sweep for the Enhanced Triple EMA strategy
+
+The whole grid runs inside one compiled function. Every
+(fast, medium, slow, atr_mult) combination builds its signals and
+simulates its trades over the same read-only price arrays, with the
+combinations spread across cores.
+"""
+
+import itertools
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from advanced_backtest import _simulate
+from config import DEFAULT_STOP_LOSS_PERCENTAGE, DEFAULT_TAKE_PROFIT_PERCENTAGE
+from strategies import _ema_loop
+from strategies_enhanced import EnhancedTripleEMAStrategy
+from numba_compat import njit, prange
+
+# Default search space
+DEFAULT_GRID = {
+    'fast_period': [7, 9, 12],
+    'medium_period': [18, 21, 26],
+    'slow_period': [45, 50, 55],
+    'atr_multiplier': [1.5, 2.0, 2.5]
+}
+
+# Columns of the array returned by sweep()
+RESULT_COLUMNS = ['return_pct', 'total_trades', 'win_rate', 'profit_factor', 'max_drawdown_pct']
+
+
+@njit(cache=True)
+def _enhanced_signals(close, fast, medium, slow, volume, volume_avg,
+                      slow_period, volume_threshold, require_volume):
+    """
+    Entry signals of EnhancedTripleEMAStrategy.generate_signals over arrays.
+    
+    Returns:
+        int8 array with 1 for BUY, -1 for SELL and 0 for HOLD
+    """
+    n = close.shape[0]
+    signals = np.zeros(n, dtype=np.int8)
+    
+    # Same warmup as generate_signal, and enough history for momentum
+    for i in range(max(slow_period + 4, 3), n):
+        if require_volume:
+            avg = volume_avg[i]
+            if not (avg != avg or avg == 0 or volume[i] >= volume_threshold * avg):
+                continue
+        
+        momentum = (close[i] - close[i - 3]) / close[i - 3]
+        
+        if (fast[i] > medium[i] and fast[i - 1] <= medium[i - 1] and
+                medium[i] > slow[i] and close[i] > medium[i] and momentum > 0):
+            signals[i] = 1
+        elif (fast[i] < medium[i] and fast[i - 1] >= medium[i - 1] and
+                medium[i] < slow[i] and close[i] < medium[i] and momentum < 0):
+            signals[i] = -1
+    
+    return signals
+
+
+@njit(parallel=True, cache=True)
+def sweep(close, high, low, volume, volume_avg, atr, combos,
+          volume_threshold, require_volume, initial_capital,
+          position_size_pct, stop_capital):
+    """
+    Backtest every parameter combination in parallel.
+    
+    Args:
+        close, high, low, volume: Price and volume arrays
+        volume_avg, atr: Indicator arrays (independent of the swept parameters)
+        combos: float64 array of shape (N, 4) holding
+            (fast, medium, slow, atr_mult) rows
+        volume_threshold: Volume multiplier vs average
+        require_volume: Require volume confirmation for entries
+        initial_capital: Starting capital
+        position_size_pct: Capital used per trade
+        stop_capital: Capital at which a run stops trading
+    
+    Returns:
+        float64 array of shape (N, 5), one row per combination, with
+        columns as in RESULT_COLUMNS
+    """
+    n_combos = combos.shape[0]
+    results = np.empty((n_combos, 5))
+    
+    for k in prange(n_combos):
+        fast_period = int(combos[k, 0])
+        medium_period = int(combos[k, 1])
+        slow_period = int(combos[k, 2])
+        atr_mult = combos[k, 3]
+        
+        fast = _ema_loop(close, 2.0 / (1.0 + fast_period), 1, np.empty_like(close))
+        medium = _ema_loop(close, 2.0 / (1.0 + medium_period), 1, np.empty_like(close))
+        slow = _ema_loop(close, 2.0 / (1.0 + slow_period), 1, np.empty_like(close))
+        
+        signals = _enhanced_signals(
+            close, fast, medium, slow, volume, volume_avg,
+            slow_period, volume_threshold, require_volume
+        )
+        
+        _, _, _, _, _, _, _, pnls, n_trades = _simulate(
+            close, high, low, signals, atr,
+            atr_mult, atr_mult * 2.0,  # Default risk/reward, as in run_mtf_backtest
+            DEFAULT_STOP_LOSS_PERCENTAGE, DEFAULT_TAKE_PROFIT_PERCENTAGE,
+            initial_capital, position_size_pct, 100, stop_capital
+        )
+        
+        # Statistics, as in AdvancedBacktester._calculate_statistics
+        capital = initial_capital
+        peak = initial_capital
+        max_dd = 0.0
+        wins = 0
+        total_profit = 0.0
+        total_loss = 0.0
+        
+        for t in range(n_trades):
+            pnl = pnls[t]
+            capital += pnl
+            if pnl > 0:
+                wins += 1
+                total_profit += pnl
+            else:
+                total_loss -= pnl
+            
+            if capital > peak:
+                peak = capital
+            if peak > 0:
+                dd = (peak - capital) / peak
+                if dd > max_dd:
+                    max_dd = dd
+        
+        results[k, 0] = (capital - initial_capital) / initial_capital * 100
+        results[k, 1] = n_trades
+        results[k, 2] = wins / n_trades * 100 if n_trades else 0.0
+        if n_trades == 0:
+            results[k, 3] = 0.0
+        elif total_loss > 0:
+            results[k, 3] = total_profit / total_loss
+        else:
+            results[k, 3] = np.inf
+        results[k, 4] = max_dd * 100
+    
+    return results
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    param_grid: Dict[str, List] = None,
+    volume_threshold: float = 1.2,
+    require_volume_confirmation: bool = True,
+    initial_capital: float = 10000.0,
+    position_size_pct: float = 95.0,
+    min_capital_pct: float = 20.0
+) -> pd.DataFrame:
+    """
+    Sweep a parameter grid over one prepared klines frame.
+    
+    Args:
+        df: Frame with timestamp and OHLCV columns
+        param_grid: Lists of values for fast_period, medium_period,
+            slow_period and atr_multiplier (default: DEFAULT_GRID)
+        volume_threshold: Volume multiplier vs average
+        require_volume_confirmation: Require volume spike for signals
+        initial_capital: Starting capital
+        position_size_pct: Capital used per trade
+        min_capital_pct: Stop trading below this % of initial capital
+    
+    Returns:
+        DataFrame with one row per combination, best return first
+    """
+    grid = {**DEFAULT_GRID, **(param_grid or {})}
+    names = ['fast_period', 'medium_period', 'slow_period', 'atr_multiplier']
+    combos = np.array(list(itertools.product(*(grid[name] for name in names))), dtype=np.float64)
+    
+    # ATR and volume average don't depend on the swept parameters
+    df_ind = EnhancedTripleEMAStrategy()._calculate_indicators(df.copy(deep=False))
+    
+    results = sweep(
+        df_ind['close'].to_numpy(dtype=np.float64),
+        df_ind['high'].to_numpy(dtype=np.float64),
+        df_ind['low'].to_numpy(dtype=np.float64),
+        df_ind['volume'].to_numpy(dtype=np.float64),
+        df_ind['volume_avg'].to_numpy(dtype=np.float64),
+        df_ind['atr'].to_numpy(dtype=np.float64),
+        combos,
+        float(volume_threshold),
+        bool(require_volume_confirmation),
+        float(initial_capital),
+        float(position_size_pct),
+        initial_capital * (min_capital_pct / 100)
+    )
+    
+    table = pd.DataFrame(combos, columns=names).astype(
+        {'fast_period': int, 'medium_period': int, 'slow_period': int}
+    )
+    table[RESULT_COLUMNS] = results
+    table['total_trades'] = table['total_trades'].astype(int)
+    table['volume_threshold'] = volume_threshold
+    table['require_volume_confirmation'] = require_volume_confirmation
+    
+    return table.sort_values('return_pct', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def best_config(sweep_results: pd.DataFrame) -> Dict:
+    """
+    Strategy config of the best sweep row, in create_custom_strategy form.
+    
+    Args:
+        sweep_results: Output of run_sweep
+    
+    Returns:
+        Dict with fast, medium, slow, atr_mult, vol_thresh and require_vol
+    """
+    best = sweep_results.iloc[0]
+    return {
+        'fast': int(best['fast_period']),
+        'medium': int(best['medium_period']),
+        'slow': int(best['slow_period']),
+        'atr_mult': float(best['atr_multiplier']),
+        'vol_thresh': float(best['volume_threshold']),
+        'require_vol': bool(best['require_volume_confirmation'])
+    }
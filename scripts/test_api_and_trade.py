@@ -1,7 +1,13 @@
 """
 Test Binance TESTNET API Connection and Execute Test Trade
+
+With --yes every prompt is answered yes, so several symbols can be
+smoke-tested in parallel:
+
+    for s in BTC ETH SOL; do python scripts/test_api_and_trade.py --yes --symbol ${s}USDT & done; wait
 """
 
+import argparse
 import sys
 import os
 # Add parent directory to path
@@ -12,22 +18,48 @@ sys.path.insert(0, os.path.join(parent_dir, 'src'))
 from binance_client import BinanceFuturesClient
 import config
 import time
+import traceback
+from decimal import Decimal, ROUND_FLOOR
+from typing import Dict, Optional
 
 BINANCE_API_KEY = config.BINANCE_API_KEY
 BINANCE_API_SECRET = config.BINANCE_API_SECRET
 
-def test_api_connection():
-    """Test API connection and permissions"""
-    print("=" * 70)
+# Rule between report sections
+SEPARATOR = "=" * 70
+
+# Printed as one block when the keys are rejected
+TESTNET_KEYS_HELP = "\n".join([
+    "",
+    SEPARATOR,
+    "⚠️⚠️⚠️  API KEY ERROR - TESTNET KEYS REQUIRED  ⚠️⚠️⚠️",
+    SEPARATOR,
+    "",
+    "Your current API keys are for MAINNET, not TESTNET!",
+    "",
+    "To get TESTNET API keys:",
+    "1. Go to: https://testnet.binancefuture.com/",
+    "2. Login/register (testnet account is separate from mainnet)",
+    "3. Go to API Management",
+    "4. Create new API key",
+    "5. Update .env file with TESTNET keys",
+    "",
+    "Alternatively:",
+    "- Set BINANCE_TESTNET=False in .env to test on MAINNET",
+    "- ⚠️  WARNING: MAINNET uses REAL MONEY!",
+    SEPARATOR
+])
+
+def round_step(value: float, step: float) -> float:
+    """Round value down to a multiple of step (a LOT_SIZE step or PRICE_FILTER tick)"""
+    step = Decimal(str(step))
+    return float((Decimal(str(value)) / step).to_integral_value(ROUND_FLOOR) * step)
+
+def test_api_connection(client: BinanceFuturesClient, symbol: str = 'BTCUSDT') -> Optional[float]:
+    """Test API connection and permissions, returning the symbol's price (None on failure)"""
+    print(SEPARATOR)
     print("🔧 TESTING BINANCE TESTNET API CONNECTION")
-    print("=" * 70)
-    
-    # Initialize client with TESTNET=True
-    client = BinanceFuturesClient(
-        BINANCE_API_KEY,
-        BINANCE_API_SECRET,
-        testnet=True  # Force testnet
-    )
+    print(SEPARATOR)
     
     print(f"\n✅ Client initialized")
     print(f"📍 Environment: {'TESTNET' if client.testnet else 'MAINNET'}")
@@ -54,61 +86,33 @@ def test_api_connection():
                 print("⚠️  No USDT balance found (might be zero)")
         else:
             print("❌ Failed to get account info - API key error")
-            print("\n" + "=" * 70)
-            print("⚠️⚠️⚠️  API KEY ERROR - TESTNET KEYS REQUIRED  ⚠️⚠️⚠️")
-            print("=" * 70)
-            print("\nYour current API keys are for MAINNET, not TESTNET!")
-            print("\nTo get TESTNET API keys:")
-            print("1. Go to: https://testnet.binancefuture.com/")
-            print("2. Login/register (testnet account is separate from mainnet)")
-            print("3. Go to API Management")
-            print("4. Create new API key")
-            print("5. Update .env file with TESTNET keys")
-            print("\nAlternatively:")
-            print("- Set BINANCE_TESTNET=False in .env to test on MAINNET")
-            print("- ⚠️  WARNING: MAINNET uses REAL MONEY!")
-            print("=" * 70)
-            return False
+            print(TESTNET_KEYS_HELP)
+            return None
     except Exception as e:
         error_msg = str(e)
         print(f"❌ Error getting account info: {error_msg}")
         
         if "Invalid API-key" in error_msg or "-2015" in error_msg:
-            print("\n" + "=" * 70)
-            print("⚠️⚠️⚠️  API KEY ERROR - TESTNET KEYS REQUIRED  ⚠️⚠️⚠️")
-            print("=" * 70)
-            print("\nYour current API keys are for MAINNET, not TESTNET!")
-            print("\nTo get TESTNET API keys:")
-            print("1. Go to: https://testnet.binancefuture.com/")
-            print("2. Login/register (testnet account is separate from mainnet)")
-            print("3. Go to API Management")
-            print("4. Create new API key")
-            print("5. Update .env file with TESTNET keys")
-            print("\nAlternatively:")
-            print("- Set BINANCE_TESTNET=False in .env to test on MAINNET")
-            print("- ⚠️  WARNING: MAINNET uses REAL MONEY!")
-            print("=" * 70)
+            print(TESTNET_KEYS_HELP)
         
-        return False
+        return None
     
     # Test 2: Get current price
     print("\n" + "-" * 70)
     print("TEST 2: Getting Market Data")
     print("-" * 70)
     try:
-        symbol = 'BTCUSDT'
         price = client.get_current_price(symbol)
         if price:
             print(f"✅ Market data retrieved successfully!")
             print(f"📈 {symbol} Price: ${price:,.2f}")
         else:
             print("❌ Failed to get market data")
-            return False
+            return None
     except Exception as e:
         print(f"❌ Error getting market data: {e}")
-        import traceback
         traceback.print_exc()
-        return False
+        return None
     
     # Test 3: Get open positions
     print("\n" + "-" * 70)
@@ -125,143 +129,130 @@ def test_api_connection():
             if open_positions:
                 print("\n🔍 Open Positions:")
                 for pos in open_positions:
-                    symbol = pos['symbol']
                     amount = float(pos['positionAmt'])
                     entry_price = float(pos['entryPrice'])
                     pnl = float(pos['unRealizedProfit'])
-                    print(f"   {symbol}: {amount} @ ${entry_price:.4f} | P&L: ${pnl:.2f}")
+                    print(f"   {pos['symbol']}: {amount} @ ${entry_price:.4f} | P&L: ${pnl:.2f}")
         else:
             print("❌ Failed to get positions")
-            return False
+            return None
     except Exception as e:
         print(f"❌ Error getting positions: {e}")
-        import traceback
         traceback.print_exc()
-        return False
+        return None
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     print("✅ ALL API TESTS PASSED!")
-    print("=" * 70)
-    return True
+    print(SEPARATOR)
+    return price
 
-def execute_test_trade():
-    """Execute a small test trade on TESTNET"""
-    print("\n" + "=" * 70)
+def execute_test_trade(
+    client: BinanceFuturesClient,
+    current_price: float,
+    symbol_info: Dict,
+    position_size_usdt: float = 100,
+    assume_yes: bool = False
+):
+    """
+    Execute a small test trade on TESTNET, sized from the price fetched by
+    test_api_connection and rounded to the trading rules in symbol_info
+    (from get_symbol_info)
+    """
+    print("\n" + SEPARATOR)
     print("🎯 EXECUTING TEST TRADE")
-    print("=" * 70)
+    print(SEPARATOR)
     
-    client = BinanceFuturesClient(
-        BINANCE_API_KEY,
-        BINANCE_API_SECRET,
-        testnet=True
-    )
+    print(f"\n💵 Current Price: ${current_price:,.2f}")
     
-    symbol = 'BTCUSDT'
+    symbol = symbol_info['symbol']
+    base_asset = symbol_info['base_asset']
     
-    # Get current price
-    print(f"\n📊 Getting current {symbol} price...")
-    current_price = client.get_current_price(symbol)
-    print(f"💵 Current Price: ${current_price:,.2f}")
+    # Calculate trade parameters (rounded down to the symbol's step size)
+    quantity = round_step(position_size_usdt / current_price, symbol_info['step_size'])
     
-    # Calculate trade parameters
-    position_size_usdt = 100  # Increase to $100 for minimum quantity
-    quantity = position_size_usdt / current_price
-    
-    # BTC futures requires minimum 0.001 BTC
-    if quantity < 0.001:
-        quantity = 0.001
+    # Below the exchange minimum, trade the minimum quantity instead
+    if quantity < symbol_info['min_qty']:
+        quantity = symbol_info['min_qty']
         position_size_usdt = quantity * current_price
-        print(f"⚠️  Adjusted to minimum quantity: 0.001 BTC (${position_size_usdt:.2f})")
-    
-    quantity = round(quantity, 3)  # Round to 3 decimals for BTC
-    
-    print(f"\n📝 Trade Parameters:")
-    print(f"   Symbol: {symbol}")
-    print(f"   Side: BUY (LONG)")
-    print(f"   Position Size: ${position_size_usdt}")
-    print(f"   Quantity: {quantity} BTC")
-    print(f"   Entry Price: ${current_price:,.2f}")
-    
-    # Calculate stop-loss and take-profit (round to 2 decimals for price precision)
-    stop_loss = round(current_price * 0.98, 2)  # 2% below entry
-    take_profit = round(current_price * 1.04, 2)  # 4% above entry (2:1 R:R)
-    
-    print(f"   Stop Loss: ${stop_loss:,.2f} (-2%)")
-    print(f"   Take Profit: ${take_profit:,.2f} (+4%)")
-    print(f"   Risk/Reward: 1:2")
+        print(f"⚠️  Adjusted to minimum quantity: {quantity} {base_asset} (${position_size_usdt:.2f})")
+    
+    # Calculate stop-loss and take-profit (rounded down to the symbol's tick size)
+    stop_loss = round_step(current_price * 0.98, symbol_info['tick_size'])  # 2% below entry
+    take_profit = round_step(current_price * 1.04, symbol_info['tick_size'])  # 4% above entry (2:1 R:R)
+    
+    # Trade parameters and the confirmation notice as one block
+    print("\n".join([
+        "",
+        "📝 Trade Parameters:",
+        f"   Symbol: {symbol}",
+        "   Side: BUY (LONG)",
+        f"   Position Size: ${position_size_usdt}",
+        f"   Quantity: {quantity} {base_asset}",
+        f"   Entry Price: ${current_price:,.2f}",
+        f"   Stop Loss: ${stop_loss:,.2f} (-2%)",
+        f"   Take Profit: ${take_profit:,.2f} (+4%)",
+        "   Risk/Reward: 1:2",
+        "",
+        "⚠️  This will place a REAL order on TESTNET"
+    ]))
     
     # Ask for confirmation
-    print("\n⚠️  This will place a REAL order on TESTNET")
-    confirm = input("Continue? (yes/no): ").strip().lower()
-    
-    if confirm != 'yes':
+    if not (assume_yes or input("Continue? (yes/no): ").strip().lower() == 'yes'):
         print("❌ Trade cancelled by user")
         return None
     
-    # Place market order
-    print("\n🚀 Placing MARKET BUY order...")
+    # Entry first: Binance processes a batch's orders in no particular order,
+    # so protective orders sent along with it could arrive before the fill
+    print(f"\n🚀 Placing MARKET BUY order...")
     try:
-        order = client.place_market_order(
-            symbol=symbol,
-            side='BUY',
-            quantity=quantity
-        )
+        order = client.place_market_order(symbol=symbol, side='BUY', quantity=quantity)
         
         if order and 'orderId' in order:
             order_id = order['orderId']
-            filled_price = float(order.get('avgPrice', current_price))
-            filled_qty = float(order.get('executedQty', quantity))
+            filled_price = float(order.get('avgPrice') or 0) or current_price
+            filled_qty = float(order.get('executedQty') or 0) or quantity
             
             print(f"✅ Order executed successfully!")
             print(f"📋 Order ID: {order_id}")
             print(f"💰 Filled Price: ${filled_price:,.2f}")
-            print(f"📊 Filled Quantity: {filled_qty} BTC")
+            print(f"📊 Filled Quantity: {filled_qty} {base_asset}")
             print(f"💵 Total Value: ${filled_price * filled_qty:,.2f}")
             
-            # Place stop-loss order
-            print(f"\n🛡️  Placing STOP-LOSS order at ${stop_loss:,.2f}...")
-            try:
-                sl_order = client.place_stop_loss(
-                    symbol=symbol,
-                    side='SELL',
-                    quantity=filled_qty,
-                    stop_price=stop_loss
-                )
-                
-                if sl_order and 'orderId' in sl_order:
-                    print(f"✅ Stop-loss placed: Order ID {sl_order['orderId']}")
-                else:
-                    print("⚠️  Failed to place stop-loss order")
-            except Exception as e:
-                print(f"⚠️  Error placing stop-loss: {e}")
+            # Stop-loss and take-profit together in one request. closePosition
+            # closes whatever position is open when they trigger, so they
+            # don't depend on the entry's fill having been processed yet
+            print(f"\n🛡️  Placing STOP-LOSS at ${stop_loss:,.2f} and TAKE-PROFIT at ${take_profit:,.2f}...")
+            sl_order, tp_order = client.place_batch_orders([
+                {'symbol': symbol, 'side': 'SELL', 'type': 'STOP_MARKET',
+                 'stopPrice': stop_loss, 'closePosition': True},
+                {'symbol': symbol, 'side': 'SELL', 'type': 'TAKE_PROFIT_MARKET',
+                 'stopPrice': take_profit, 'closePosition': True}
+            ]) or (None, None)
+            
+            if sl_order and 'orderId' in sl_order:
+                print(f"🛡️  Stop-loss placed: Order ID {sl_order['orderId']}")
+            else:
+                print(f"⚠️  Failed to place stop-loss order: {sl_order}")
             
-            # Place take-profit order
-            print(f"\n🎯 Placing TAKE-PROFIT order at ${take_profit:,.2f}...")
-            try:
-                tp_order = client.place_take_profit(
-                    symbol=symbol,
-                    side='SELL',
-                    quantity=filled_qty,
-                    stop_price=take_profit
-                )
-                
-                if tp_order and 'orderId' in tp_order:
-                    print(f"✅ Take-profit placed: Order ID {tp_order['orderId']}")
-                else:
-                    print("⚠️  Failed to place take-profit order")
-            except Exception as e:
-                print(f"⚠️  Error placing take-profit: {e}")
+            if tp_order and 'orderId' in tp_order:
+                print(f"🎯 Take-profit placed: Order ID {tp_order['orderId']}")
+            else:
+                print(f"⚠️  Failed to place take-profit order: {tp_order}")
             
-            print("\n" + "=" * 70)
-            print("✅ TEST TRADE COMPLETE!")
-            print("=" * 70)
-            print(f"\n📊 Position Summary:")
-            print(f"   Symbol: {symbol}")
-            print(f"   Side: LONG")
-            print(f"   Entry: ${filled_price:,.2f}")
-            print(f"   Quantity: {filled_qty} BTC")
-            print(f"   Stop Loss: ${stop_loss:,.2f}")
-            print(f"   Take Profit: ${take_profit:,.2f}")
+            print("\n".join([
+                "",
+                SEPARATOR,
+                "✅ TEST TRADE COMPLETE!",
+                SEPARATOR,
+                "",
+                "📊 Position Summary:",
+                f"   Symbol: {symbol}",
+                "   Side: LONG",
+                f"   Entry: ${filled_price:,.2f}",
+                f"   Quantity: {filled_qty} {base_asset}",
+                f"   Stop Loss: ${stop_loss:,.2f}",
+                f"   Take Profit: ${take_profit:,.2f}"
+            ]))
             
             return order
         else:
@@ -270,45 +261,36 @@ def execute_test_trade():
             
     except Exception as e:
         print(f"❌ Error placing order: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
-def close_test_position():
+def close_test_position(client: BinanceFuturesClient, symbol: str = 'BTCUSDT', assume_yes: bool = False):
     """Close the test position"""
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     print("🔴 CLOSING TEST POSITION")
-    print("=" * 70)
-    
-    client = BinanceFuturesClient(
-        BINANCE_API_KEY,
-        BINANCE_API_SECRET,
-        testnet=True
-    )
+    print(SEPARATOR)
     
-    symbol = 'BTCUSDT'
+    base_asset = symbol.removesuffix('USDT')
     
     # Get current position
     print(f"\n🔍 Checking current position in {symbol}...")
     positions = client.get_position_info(symbol)
-    btc_position = None
     
-    for pos in positions:
-        if pos['symbol'] == symbol:
-            btc_position = pos
-            break
+    # Already filtered to symbol (and to open positions) by the client
+    position = positions[0] if positions else None
+    assert position is None or position['symbol'] == symbol
     
-    if not btc_position:
+    if not position:
         print(f"❌ No open position found in {symbol}")
         print("   Position may have been auto-closed or never opened")
         return False
     
-    position_amt = btc_position['position_amount']
-    entry_price = btc_position['entry_price']
-    unrealized_pnl = btc_position['unrealized_pnl']
+    position_amt = position['position_amount']
+    entry_price = position['entry_price']
+    unrealized_pnl = position['unrealized_pnl']
     
     print(f"✅ Position found!")
-    print(f"   Amount: {position_amt} BTC")
+    print(f"   Amount: {position_amt} {base_asset}")
     print(f"   Entry Price: ${entry_price:,.2f}")
     print(f"   Unrealized P&L: ${unrealized_pnl:.2f}")
     
@@ -322,9 +304,7 @@ def close_test_position():
     
     # Ask for confirmation
     print("\n⚠️  This will CLOSE the position at market price")
-    confirm = input("Continue? (yes/no): ").strip().lower()
-    
-    if confirm != 'yes':
+    if not (assume_yes or input("Continue? (yes/no): ").strip().lower() == 'yes'):
         print("❌ Close cancelled by user")
         return False
     
@@ -358,14 +338,17 @@ def close_test_position():
             final_pnl = (exit_price - entry_price) * abs(position_amt)
             final_pnl_percent = ((exit_price - entry_price) / entry_price) * 100
             
-            print("\n" + "=" * 70)
-            print("📊 FINAL TRADE RESULTS")
-            print("=" * 70)
-            print(f"   Entry: ${entry_price:,.2f}")
-            print(f"   Exit: ${exit_price:,.2f}")
-            print(f"   P&L: ${final_pnl:.2f} ({final_pnl_percent:+.2f}%)")
-            print(f"   Quantity: {abs(position_amt)} BTC")
-            print(f"   {'✅ PROFIT' if final_pnl > 0 else '❌ LOSS'}")
+            print("\n".join([
+                "",
+                SEPARATOR,
+                "📊 FINAL TRADE RESULTS",
+                SEPARATOR,
+                f"   Entry: ${entry_price:,.2f}",
+                f"   Exit: ${exit_price:,.2f}",
+                f"   P&L: ${final_pnl:.2f} ({final_pnl_percent:+.2f}%)",
+                f"   Quantity: {abs(position_amt)} {base_asset}",
+                f"   {'✅ PROFIT' if final_pnl > 0 else '❌ LOSS'}"
+            ]))
             
             return True
         else:
@@ -374,26 +357,45 @@ def close_test_position():
             
     except Exception as e:
         print(f"❌ Error closing position: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
 def main():
     """Main test flow"""
+    parser = argparse.ArgumentParser(description="Test the Binance TESTNET API and execute a test trade")
+    parser.add_argument('--yes', action='store_true', help="Answer yes to every prompt (trade and close)")
+    parser.add_argument('--symbol', default='BTCUSDT', help="Symbol to trade (default: BTCUSDT)")
+    parser.add_argument('--size', type=float, default=100, help="Position size in USDT (default: 100)")
+    args = parser.parse_args()
+    
     print("\n🚀 BINANCE TESTNET API TESTING SUITE")
-    print("=" * 70)
+    print(SEPARATOR)
+    
+    # One client (and one pooled HTTP session) for every step, so the
+    # connection is set up once per run
+    client = BinanceFuturesClient(
+        BINANCE_API_KEY,
+        BINANCE_API_SECRET,
+        testnet=True  # Force testnet
+    )
+    client.attach_rate_limiter()  # Stay under the IP weight limit, also with the bot running
     
     # Step 1: Test API connection
-    if not test_api_connection():
+    price = test_api_connection(client, args.symbol)
+    if not price:
         print("\n❌ API connection tests failed. Please check your API keys.")
         return
     
-    # Step 2: Ask if user wants to execute test trade
-    print("\n" + "=" * 70)
-    execute = input("\n🎯 Execute test trade? (yes/no): ").strip().lower()
+    # Trading rules (step and tick size), fetched once for the run
+    symbol_info = client.get_symbol_info(args.symbol)
+    if not symbol_info:
+        print(f"\n❌ Could not get trading rules for {args.symbol}")
+        return
     
-    if execute == 'yes':
-        order = execute_test_trade()
+    # Step 2: Ask if user wants to execute test trade
+    print("\n" + SEPARATOR)
+    if args.yes or input("\n🎯 Execute test trade? (yes/no): ").strip().lower() == 'yes':
+        order = execute_test_trade(client, price, symbol_info, args.size, assume_yes=args.yes)
         
         if order:
             # Wait a moment
@@ -401,17 +403,15 @@ def main():
             time.sleep(5)
             
             # Step 3: Ask if user wants to close position
-            close = input("\n🔴 Close test position? (yes/no): ").strip().lower()
-            
-            if close == 'yes':
-                close_test_position()
+            if args.yes or input("\n🔴 Close test position? (yes/no): ").strip().lower() == 'yes':
+                close_test_position(client, args.symbol, assume_yes=args.yes)
             else:
                 print("\n⚠️  Position left open. You can close it manually later.")
                 print("   Run this script again and skip to closing position.")
     
-    print("\n" + "=" * 70)
+    print("\n" + SEPARATOR)
     print("🎉 TESTING COMPLETE!")
-    print("=" * 70)
+    print(SEPARATOR)
 
 if __name__ == "__main__":
     main()
@@ -3,10 +3,12 @@ Comprehensive Bybit Demo API Test
 Tests all API functionality with provided keys
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, 'I:\\Discord_Bot\\athena_bot\\src')
 
 from bybit_client import BybitFuturesClient
 import os
+import traceback
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -36,23 +38,30 @@ try:
     print("2️⃣  TESTING PUBLIC MARKET DATA (No Auth Required)")
     print("="*70)
     
+    # The public reads are independent, so they run concurrently
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        btc_future = executor.submit(client.get_current_price, 'BTCUSDT')
+        eth_future = executor.submit(client.get_current_price, 'ETHUSDT')
+        info_future = executor.submit(client.get_symbol_info, 'BTCUSDT')
+        klines_future = executor.submit(client.get_klines, 'BTCUSDT', '15m', limit=5)
+    
     print("\n📊 BTC Price:")
-    btc_price = client.get_current_price('BTCUSDT')
+    btc_price = btc_future.result()
     print(f"   BTCUSDT: ${btc_price:,.2f}")
     
     print("\n📊 ETH Price:")
-    eth_price = client.get_current_price('ETHUSDT')
+    eth_price = eth_future.result()
     print(f"   ETHUSDT: ${eth_price:,.2f}")
     
     print("\n📊 Symbol Info:")
-    info = client.get_symbol_info('BTCUSDT')
+    info = info_future.result()
     if info:
         print(f"   Min Qty: {info['min_qty']}")
         print(f"   Max Leverage: {info['max_leverage']}")
         print(f"   Tick Size: {info['tick_size']}")
     
     print("\n📊 15-Min Klines:")
-    klines = client.get_klines('BTCUSDT', '15m', limit=5)
+    klines = klines_future.result()
     if klines:
         print(f"   Candles received: {len(klines)}")
         print(f"   Latest close: ${klines[-1]['close']:,.2f}")
@@ -153,5 +162,4 @@ try:
 
 except Exception as e:
     print(f"\n❌ FATAL ERROR: {e}")
-    import traceback
     traceback.print_exc()
@@ -0,0 +1,81 @@
+"""
+Quick test to verify Bybit demo keys work
+
+Runs every probe at once: pybit is sync-only, so each call goes to the
+default executor and the results are gathered together.
+"""
+import asyncio
+import os
+from pybit.unified_trading import HTTP
+from dotenv import load_dotenv
+
+load_dotenv()
+
+api_key = os.getenv('BYBIT_API_KEY')
+api_secret = os.getenv('BYBIT_API_SECRET')
+
+
+async def probe(client: HTTP) -> dict:
+    """
+    Run the independent API calls concurrently
+    
+    Args:
+        client: pybit HTTP session
+    
+    Returns:
+        Dict of probe name to response, or to the exception it raised
+    """
+    calls = {
+        'Server time (public)': client.get_server_time,
+        'BTC ticker (public)': lambda: client.get_tickers(category="linear", symbol="BTCUSDT"),
+        'Wallet balance UNIFIED (auth)': lambda: client.get_wallet_balance(accountType="UNIFIED", coin="USDT"),
+        'Wallet balance CONTRACT (auth)': lambda: client.get_wallet_balance(accountType="CONTRACT"),
+        'API key info (auth)': client.get_api_key_information,
+        'Positions (auth)': lambda: client.get_positions(category="linear", settleCoin="USDT")
+    }
+    
+    loop = asyncio.get_running_loop()
+    responses = await asyncio.gather(
+        *(loop.run_in_executor(None, call) for call in calls.values()),
+        return_exceptions=True
+    )
+    return dict(zip(calls, responses))
+
+
+def main():
+    """Probe the demo API and report each call"""
+    print("🔑 Testing Bybit DEMO keys...")
+    print(f"API Key: {api_key}")
+    print("Using testnet=True")
+    
+    client = HTTP(
+        testnet=True,
+        api_key=api_key,
+        api_secret=api_secret
+    )
+    
+    results = asyncio.run(probe(client))
+    
+    for i, (name, response) in enumerate(results.items(), 1):
+        print(f"\n{i}. {name}")
+        if isinstance(response, Exception):
+            print(f"❌ Error: {response}")
+        else:
+            print(f"✅ Response: {response}")
+    
+    ticker = results['BTC ticker (public)']
+    if not isinstance(ticker, Exception):
+        print(f"\n✅ BTC Price: ${float(ticker['result']['list'][0]['lastPrice']):,.2f}")
+    
+    balance = results['Wallet balance UNIFIED (auth)']
+    if isinstance(balance, Exception):
+        print("\n❌ Auth failed")
+    elif balance['retCode'] == 0:
+        print("\n✅ AUTHENTICATION SUCCESSFUL!")
+        print(f"✅ Total Balance: {balance['result']['list'][0]['totalEquity']} USDT")
+    else:
+        print(f"\n❌ Auth failed: {balance['retMsg']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,10 @@ Tests all systems: exchange connection, strategies, Discord signals
 import sys
 import os
 import asyncio
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add src directory to path
@@ -14,25 +18,56 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from dotenv import load_dotenv
 load_dotenv()
 
-print("=" * 80)
-print("ATHENA BOT - COMPLETE SYSTEM TEST")
-print("=" * 80)
-print(f"🕐 Test started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print()
-
-# Step 1: Check Configuration
-print("📋 STEP 1: Checking Configuration")
-print("-" * 80)
+# Imported after load_dotenv, since config reads the environment on import
+from binance import ThreadedWebsocketManager
+from binance_client import BinanceFuturesClient, KLINE_DTYPE
+from data_cache import klines_to_dataframe
+from multi_strategy_analyzer import MultiStrategySignalAnalyzer
 
 exchange = os.getenv('EXCHANGE', 'unknown')
 trading_enabled = os.getenv('TRADING_ENABLED', 'False').lower() == 'true'
 channel_id = os.getenv('SIGNAL_CHANNEL_ID')
 binance_testnet = os.getenv('BINANCE_TESTNET', 'False').lower() == 'true'
 
-print(f"   Exchange: {exchange.upper()}")
-print(f"   Trading Mode: {'🔴 LIVE TRADING' if trading_enabled else '🟢 SIGNAL-ONLY'}")
-print(f"   Binance Testnet: {'✅ Enabled' if binance_testnet else '❌ Disabled'}")
-print(f"   Discord Channel: {channel_id}")
+# Candles kept from the kline stream, and how long to wait for its first update
+KLINE_BUFFER_SIZE = 100
+STREAM_TIMEOUT = 10
+
+kline_buffer = deque(maxlen=KLINE_BUFFER_SIZE)
+kline_update = threading.Event()
+
+
+def on_kline(msg):
+    """Put a kline stream update into the buffer, replacing the still open candle"""
+    if msg.get('e') == 'error':
+        print(f"   ⚠️  Kline stream error: {msg.get('m')}")
+        return
+    
+    k = msg['k']
+    candle = {'t': k['t'], 'o': float(k['o']), 'h': float(k['h']),
+              'l': float(k['l']), 'c': float(k['c']), 'v': float(k['v'])}
+    
+    if kline_buffer and kline_buffer[-1]['t'] == candle['t']:
+        kline_buffer[-1] = candle
+    else:
+        kline_buffer.append(candle)
+    kline_update.set()
+
+
+# Banner and Step 1: Check Configuration, written as one block
+print("\n".join([
+    "=" * 80,
+    "ATHENA BOT - COMPLETE SYSTEM TEST",
+    "=" * 80,
+    f"🕐 Test started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+    "",
+    "📋 STEP 1: Checking Configuration",
+    "-" * 80,
+    f"   Exchange: {exchange.upper()}",
+    f"   Trading Mode: {'🔴 LIVE TRADING' if trading_enabled else '🟢 SIGNAL-ONLY'}",
+    f"   Binance Testnet: {'✅ Enabled' if binance_testnet else '❌ Disabled'}",
+    f"   Discord Channel: {channel_id}"
+]))
 
 if exchange != 'binance':
     print(f"\n   ⚠️  WARNING: Expected EXCHANGE=binance, got {exchange}")
@@ -47,8 +82,6 @@ print("🔌 STEP 2: Testing Binance Testnet Connection")
 print("-" * 80)
 
 try:
-    from binance_client import BinanceFuturesClient
-    
     api_key = os.getenv('BINANCE_API_KEY')
     api_secret = os.getenv('BINANCE_API_SECRET')
     
@@ -57,19 +90,38 @@ try:
         sys.exit(1)
     
     client = BinanceFuturesClient(api_key, api_secret, testnet=True)
+    client.attach_rate_limiter()  # Stay under the IP weight limit, also with the bot running
+    
+    # Balance and the candle history are independent, so they run concurrently
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        balance_future = executor.submit(client.get_account_balance)
+        klines_future = executor.submit(client.get_klines_numpy, 'BTCUSDT', '15m', limit=KLINE_BUFFER_SIZE)
+    
+    # Seed the buffer once over REST; the kline stream keeps it current
+    kline_buffer.extend(dict(zip(KLINE_DTYPE.names, row.tolist())) for row in klines_future.result())
+    
+    twm = ThreadedWebsocketManager(api_key=api_key, api_secret=api_secret, testnet=True)
+    twm.daemon = True  # Don't keep the process alive on an early exit
+    twm.start()
+    twm.start_kline_futures_socket(callback=on_kline, symbol='BTCUSDT', interval='15m')
     
     # Test market data
-    price = client.get_current_price('BTCUSDT')
-    print(f"   ✅ Market Data: BTC Price ${price:,.2f}")
+    if kline_update.wait(STREAM_TIMEOUT):
+        print(f"   ✅ Market Data: BTC Price ${kline_buffer[-1]['c']:,.2f} (kline stream)")
+    elif kline_buffer:
+        print(f"   ⚠️  Market Data: no stream update within {STREAM_TIMEOUT}s, "
+              f"last REST close ${kline_buffer[-1]['c']:,.2f}")
+    else:
+        raise RuntimeError("no market data from REST or the kline stream")
     
     # Test account
-    balances = client.get_account_balance()
+    balances = balance_future.result()
     usdt_balance = balances.get('USDT', {}).get('wallet_balance', 0)
     print(f"   ✅ Account: Balance {usdt_balance:.2f} USDT")
     
     # Test klines
-    klines = client.get_klines('BTCUSDT', '15m', limit=100)
-    print(f"   ✅ Historical Data: Retrieved {len(klines)} candles")
+    klines = list(kline_buffer)
+    print(f"   ✅ Historical Data: {len(klines)} candles buffered (last close ${klines[-1]['c']:,.2f})")
     
     print(f"\n   ✅ Binance testnet connection successful!")
     
@@ -84,12 +136,15 @@ print("🧠 STEP 3: Testing Multi-Strategy Analyzer")
 print("-" * 80)
 
 try:
-    from multi_strategy_analyzer import MultiStrategySignalAnalyzer
-    
     analyzer = MultiStrategySignalAnalyzer(client)
     
     print("   📊 Analyzing BTCUSDT with all 7 strategies...")
-    result = analyzer.analyze_symbol('BTCUSDT', include_scalping=False)
+    # The 15m candles are already buffered, only the other timeframes are fetched.
+    # Snapshot the buffer first, since the stream thread keeps updating it
+    candles = list(kline_buffer)
+    df_15m = klines_to_dataframe([[k['t'], k['o'], k['h'], k['l'], k['c'], k['v']] for k in candles])
+    result = analyzer.analyze_symbol('BTCUSDT', include_scalping=False,
+                                     klines_by_interval={'15m': df_15m})
     
     if result:
         print(f"\n   ✅ Analysis Complete!")
@@ -115,7 +170,6 @@ try:
         
 except Exception as e:
     print(f"   ❌ FAILED: {str(e)}")
-    import traceback
     traceback.print_exc()
     sys.exit(1)
 
@@ -164,31 +218,35 @@ except Exception as e:
 
 print()
 
-# Final Summary
-print("=" * 80)
-print("✅ SYSTEM TEST COMPLETE")
-print("=" * 80)
-
-print("\n📊 Test Results:")
-print("   ✅ Configuration verified")
-print("   ✅ Binance testnet connected")
-print("   ✅ Multi-strategy analyzer working")
-print("   ✅ Signal generation functional")
-
-print("\n🚀 Next Steps:")
-print("   1. Start the bot: python src/auto_trader.py")
-print("   2. Bot will analyze markets every 15 minutes")
-print("   3. Signals will appear in Discord channel: " + (channel_id or 'NOT SET'))
-print("   4. Monitor for BUY/SELL opportunities")
-
-print("\n⚙️  Bot Configuration:")
-print(f"   • Exchange: Binance Testnet")
-print(f"   • Mode: Signal-Only (NO TRADING)")
-print(f"   • Strategies: 7 active")
-print(f"   • Check Interval: 15 minutes")
-print(f"   • ATR Threshold: 1.25%")
-print(f"   • Min Confidence: 50%")
-
-print("\n" + "=" * 80)
-print("All systems ready! 🎉")
-print("=" * 80)
+# Final Summary, written as one block
+print("\n".join([
+    "=" * 80,
+    "✅ SYSTEM TEST COMPLETE",
+    "=" * 80,
+    "",
+    "📊 Test Results:",
+    "   ✅ Configuration verified",
+    "   ✅ Binance testnet connected",
+    "   ✅ Multi-strategy analyzer working",
+    "   ✅ Signal generation functional",
+    "",
+    "🚀 Next Steps:",
+    "   1. Start the bot: python src/auto_trader.py",
+    "   2. Bot will analyze markets every 15 minutes",
+    "   3. Signals will appear in Discord channel: " + (channel_id or 'NOT SET'),
+    "   4. Monitor for BUY/SELL opportunities",
+    "",
+    "⚙️  Bot Configuration:",
+    "   • Exchange: Binance Testnet",
+    "   • Mode: Signal-Only (NO TRADING)",
+    "   • Strategies: 7 active",
+    "   • Check Interval: 15 minutes",
+    "   • ATR Threshold: 1.25%",
+    "   • Min Confidence: 50%",
+    "",
+    "=" * 80,
+    "All systems ready! 🎉",
+    "=" * 80
+]))
+
+twm.stop()
@@ -20,6 +20,7 @@ client = BinanceFuturesClient(
     api_secret=config.BINANCE_API_SECRET,
     testnet=True
 )
+client.attach_rate_limiter()  # Stay under the IP weight limit, also with the bot running
 print("✅ Client initialized")
 
 # Initialize multi-strategy analyzer
@@ -36,6 +36,7 @@ class AthenaSignalBot:
         testnet = os.getenv('BINANCE_TESTNET', 'True').lower() == 'true'
         
         self.client = BinanceFuturesClient(api_key, api_secret, testnet=testnet)
+        self.client.attach_rate_limiter()  # Concurrent scans share one weight budget
         self.analyzer = MultiStrategySignalAnalyzer(self.client)
         
         # Discord bot
@@ -46,6 +47,10 @@ class AthenaSignalBot:
         # Symbols to track
         self.symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT']
         
+        # Symbols analyzed at once (each analysis fetches five timeframes,
+        # so keep this at 8 or below to stay inside the Binance weight limit)
+        self.scan_concurrency = 4
+        
         # Setup events
         @self.bot.event
         async def on_ready():
@@ -79,14 +84,25 @@ class AthenaSignalBot:
             log.error(f"❌ Could not find channel: {self.channel_id}")
             return
         
+        # Analyses are blocking and network bound, so run them in threads,
+        # a few at a time
+        sem = asyncio.Semaphore(self.scan_concurrency)
+        
+        async def analyze(symbol: str):
+            async with sem:
+                log.info(f"📊 Analyzing {symbol}...")
+                return await asyncio.to_thread(self.analyzer.analyze_symbol, symbol, False)
+        
+        results = await asyncio.gather(*(analyze(symbol) for symbol in self.symbols), return_exceptions=True)
+        
         signals_found = 0
         
-        for symbol in self.symbols:
+        for symbol, result in zip(self.symbols, results):
+            if isinstance(result, Exception):
+                log.error(f"❌ Error analyzing {symbol}: {result}")
+                continue
+            
             try:
-                log.info(f"\n📊 Analyzing {symbol}...")
-                
-                result = self.analyzer.analyze_symbol(symbol, include_scalping=False)
-                
                 if result and result['signal'] in ['BUY', 'SELL']:
                     # Generate Discord message
                     message = self.analyzer.format_discord_message(result)
@@ -102,7 +118,7 @@ class AthenaSignalBot:
                     log.info(f"⏸️  {symbol}: HOLD - no signal")
                     
             except Exception as e:
-                log.error(f"❌ Error analyzing {symbol}: {e}")
+                log.error(f"❌ Error sending signal for {symbol}: {e}")
                 continue
         
         log.info("=" * 80)
@@ -872,6 +872,13 @@ def main():
         await ctx.send(f"🛑 Emergency stop: Closed {closed} position(s)")
         logger.warning(f"🛑 Emergency stop complete: {closed} positions closed")
     
+    # Faster event loop where available (not supported on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     # Run bot
     logger.info("\n🔌 Connecting to Discord...")
     try:
@@ -5,13 +5,127 @@ Handles API interactions with Binance Futures
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from binance.enums import *
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Tuple
+from decimal import Decimal
+from urllib.parse import parse_qsl, urlsplit
 import asyncio
+import threading
+import time
+import numpy as np
 from logger import get_logger
 import config
 
 log = get_logger('BinanceClient')
 
+# Keep-alive connections per host in the client's HTTP session
+HTTP_POOL_SIZE = 16
+
+# Binance request weight allowed per minute and IP, and the weights of the
+# endpoints this client calls that cost more than 1 (klines and open orders
+# depend on the parameters, see request_weight)
+REQUEST_WEIGHT_PER_MINUTE = 1200
+ENDPOINT_WEIGHTS = {
+    '/fapi/v2/account': 5,
+    '/fapi/v2/positionRisk': 5
+}
+
+# Retries of a request rejected for rate limiting (HTTP 429/418)
+RATE_LIMIT_RETRIES = 3
+
+# Records of get_klines_numpy: open time (ms) and OHLCV
+KLINE_DTYPE = np.dtype([('t', 'i8'), ('o', 'f8'), ('h', 'f8'), ('l', 'f8'), ('c', 'f8'), ('v', 'f8')])
+
+
+def _batch_value(value) -> str:
+    """Order parameter as the string batchOrders expects (true/false, plain decimals)"""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, float):
+        # str() gives '1e-05' for small values, which Binance rejects
+        return format(Decimal(str(value)), 'f')
+    return str(value)
+
+
+def _query(params) -> Dict:
+    """Request parameters as a dict, whether given as a dict, pairs or a query string"""
+    if not params:
+        return {}
+    if isinstance(params, str):
+        return dict(parse_qsl(params))
+    return dict(params)
+
+
+def request_weight(url: str, params=None) -> int:
+    """
+    Binance request weight of one REST call
+    
+    Args:
+        url: Request URL
+        params: Query or body parameters of the request
+    
+    Returns:
+        Weight the call counts against REQUEST_WEIGHT_PER_MINUTE
+    """
+    parts = urlsplit(url)
+    query = {**_query(parts.query), **_query(params)}
+    
+    if parts.path.endswith('/klines'):
+        limit = int(query.get('limit', 500))
+        return 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+    if parts.path.endswith('/openOrders') and 'symbol' not in query:
+        return 40
+    if parts.path.endswith('/ticker/price') and 'symbol' not in query:
+        return 2
+    
+    return ENDPOINT_WEIGHTS.get(parts.path, 1)
+
+
+class RateLimiter:
+    """
+    Token bucket over Binance request weight
+    
+    Tokens refill at a fixed rate up to burst; a call waits until its
+    weight is available. Thread-safe, so calls fanned out over a thread
+    pool share the same budget.
+    """
+    
+    def __init__(self, rate: float = REQUEST_WEIGHT_PER_MINUTE / 60, burst: int = REQUEST_WEIGHT_PER_MINUTE):
+        """
+        Args:
+            rate: Weight refilled per second
+            burst: Bucket size (weight available at once)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.resume_at = 0.0
+        self._cond = threading.Condition()
+    
+    def acquire(self, weight: int = 1):
+        """Block until weight tokens are available, then take them"""
+        weight = min(weight, self.burst)
+        
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                wait = max(self.resume_at - now, (weight - self.tokens) / self.rate)
+                if wait <= 0:
+                    self.tokens -= weight
+                    return
+                self._cond.wait(wait)
+    
+    def pause(self, seconds: float):
+        """Hold every caller for seconds and empty the bucket (after a 429/418)"""
+        with self._cond:
+            self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+            self.tokens = 0.0
+            self._cond.notify_all()
+
 
 class BinanceFuturesClient:
     """Wrapper for Binance Futures API with safety features"""
@@ -52,6 +166,44 @@ class BinanceFuturesClient:
             except:
                 pass
             log.info("Connected to Binance Futures MAINNET")
+        
+        # Reuse connections across requests, also from several threads
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self.client.session.mount('https://', adapter)
+    
+    def attach_rate_limiter(self, limiter: Optional[RateLimiter] = None) -> RateLimiter:
+        """
+        Throttle every REST call of this client through a token bucket
+        
+        Each request first takes its weight from the limiter. A request
+        rejected with 429/418 pauses the limiter for the Retry-After time
+        and is sent again, up to RATE_LIMIT_RETRIES times.
+        
+        Args:
+            limiter: Limiter to use (default: a new one at Binance's IP limit)
+        
+        Returns:
+            The attached limiter
+        """
+        limiter = limiter or RateLimiter()
+        session = self.client.session
+        send = session.request
+        
+        def request(method, url, *args, **kwargs):
+            weight = request_weight(url, kwargs.get('params') or kwargs.get('data'))
+            
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                limiter.acquire(weight)
+                response = send(method, url, *args, **kwargs)
+                if response.status_code not in (418, 429) or attempt == RATE_LIMIT_RETRIES:
+                    return response
+                
+                retry_after = float(response.headers.get('Retry-After', 60))
+                log.warning(f"Rate limited by Binance (HTTP {response.status_code}), pausing {retry_after:.0f}s")
+                limiter.pause(retry_after)
+        
+        session.request = request
+        return limiter
     
     def get_account_balance(self) -> Dict:
         """Get futures account balance"""
@@ -196,6 +348,32 @@ class BinanceFuturesClient:
             log.error(f"Error getting klines for {symbol}: {e}")
             return []
     
+    def get_klines_numpy(self, symbol: str, interval: str, limit: int = 500) -> np.ndarray:
+        """
+        Get candlestick data as one structured array
+        
+        Only the open time and OHLCV of each candle are kept, converted
+        column by column into a preallocated record array.
+        
+        Args:
+            symbol: Trading symbol
+            interval: Kline interval (1m, 5m, 15m, 1h, 4h, 1d, etc.)
+            limit: Number of candles to fetch (max 1500)
+            
+        Returns:
+            KLINE_DTYPE array with one record per candle (empty on error)
+        """
+        klines = self.get_klines(symbol, interval, limit)
+        out = np.empty(len(klines), dtype=KLINE_DTYPE)
+        
+        if klines:
+            raw = np.asarray(klines, dtype=object)
+            out['t'] = raw[:, 0].astype(np.int64)
+            for column, name in enumerate(('o', 'h', 'l', 'c', 'v'), 1):
+                out[name] = raw[:, column].astype(np.float64)
+        
+        return out
+    
     def place_market_order(
         self,
         symbol: str,
@@ -265,6 +443,31 @@ class BinanceFuturesClient:
             log.error(f"Error placing limit order: {e}")
             return None
     
+    def place_batch_orders(self, orders: List[Dict]) -> List[Dict]:
+        """
+        Place up to 5 orders in one request
+        
+        The orders are sent together but processed independently, so each
+        one can succeed or fail on its own.
+        
+        Args:
+            orders: Order parameters (symbol, side, type, quantity, ...)
+            
+        Returns:
+            One entry per order, in the same order: the order response, or a
+            dict with 'code' and 'msg' if that order was rejected (empty
+            list if the request failed)
+        """
+        try:
+            # The batch is sent as JSON, where every value is a string
+            batch = [{key: _batch_value(value) for key, value in order.items()} for order in orders]
+            results = self.client.futures_place_batch_order(batchOrders=batch)
+            log.info(f"Batch of {len(batch)} orders placed: {', '.join(o['type'] for o in batch)}")
+            return results
+        except BinanceAPIException as e:
+            log.error(f"Error placing batch orders: {e}")
+            return []
+    
     def place_stop_loss(
         self,
         symbol: str,
@@ -6,9 +6,12 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 import asyncio
+import heapq
+from operator import itemgetter
 from typing import Optional, List
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
 
 from binance_client import BinanceFuturesClient
 from signal_analyzer import SignalAnalyzer
@@ -18,6 +21,13 @@ import config
 
 log = get_logger('DiscordBot')
 
+_UTC = timezone.utc
+
+# Fields shown per /scan result. Scanned signals always carry them: only
+# successful strategy results (signal, strength, price) pass the scan and
+# analyze_symbol adds the symbol
+_scan_fields = itemgetter('signal', 'symbol', 'strength', 'price')
+
 
 class AthenaBot(commands.Bot):
     """Athena Trading Bot for Discord"""
@@ -102,18 +112,26 @@ class AthenaBot(commands.Bot):
             
             log.info("Scanning for trading signals...")
             
-            # Scan symbols with EMA Cross strategy
-            signals = self.signal_analyzer.scan_multiple_symbols(
+            # Scan symbols with EMA Cross strategy, all symbols concurrently
+            signals = await self.signal_analyzer.scan_multiple_symbols_async(
                 self.tracked_symbols,
                 'EMA_CROSS',
                 config.DEFAULT_INTERVAL,
                 min_signal_strength=60.0
             )
             
-            # Send signals to channel
-            for signal in signals[:3]:  # Top 3 signals
-                embed = self.create_signal_embed(signal)
-                await channel.send(embed=embed)
+            # Send top 3 signals to channel concurrently; a failed send
+            # doesn't hold up the others
+            top_signals = heapq.nlargest(3, signals, key=lambda s: s.get('strength', 0))
+            now = datetime.now(_UTC)
+            sent = await asyncio.gather(
+                *(channel.send(embed=self.create_signal_embed(signal, now)) for signal in top_signals),
+                return_exceptions=True
+            )
+            
+            for signal, outcome in zip(top_signals, sent):
+                if isinstance(outcome, Exception):
+                    log.error(f"Failed to send signal for {signal.get('symbol')}: {outcome}")
                 
         except Exception as e:
             log.error(f"Error in monitor_signals: {e}")
@@ -123,8 +141,8 @@ class AthenaBot(commands.Bot):
         """Wait until bot is ready"""
         await self.wait_until_ready()
     
-    def create_signal_embed(self, signal: dict) -> discord.Embed:
-        """Create a Discord embed for a signal"""
+    def create_signal_embed(self, signal: dict, timestamp: Optional[datetime] = None) -> discord.Embed:
+        """Create a Discord embed for a signal (stamped now unless a timestamp is given)"""
         side = signal.get('signal', 'NONE')
         symbol = signal.get('symbol', 'UNKNOWN')
         strength = signal.get('strength', 0)
@@ -137,7 +155,7 @@ class AthenaBot(commands.Bot):
             title=f"🎯 {side} Signal: {symbol}",
             description=f"Strategy: **{strategy}**",
             color=color,
-            timestamp=datetime.utcnow()
+            timestamp=timestamp or datetime.now(_UTC)
         )
         
         # Add fields
@@ -197,6 +215,59 @@ class AthenaBot(commands.Bot):
 bot = AthenaBot()
 
 
+# ============================================================================
+# STATIC EMBEDS
+# ============================================================================
+
+STRATEGIES_INFO = {
+    "EMA_CROSS": "EMA crossover strategy (9/21)",
+    "TRIPLE_EMA": "Triple EMA alignment (9/21/50)",
+    "RSI_DIVERGENCE": "RSI divergence and extremes",
+    "MACD_SIGNAL": "MACD signal line crossover",
+    "STOCH_RSI": "Stochastic RSI crossovers",
+    "BREAKOUT": "Price breakout with volume",
+    "SUPPORT_RESISTANCE": "Support/Resistance bounces"
+}
+
+COMMANDS_INFO = {
+    "/signal": "Get a trading signal for a specific symbol",
+    "/scan": "Scan multiple symbols for signals",
+    "/price": "Get current price for a symbol",
+    "/balance": "View your Binance Futures balance",
+    "/positions": "View your open positions",
+    "/monitor": "Start/stop automatic signal monitoring",
+    "/strategies": "List all available trading strategies",
+    "/help": "Show this help message"
+}
+
+
+def _build_static_embed(title: str, description: str, color: discord.Color, fields: dict) -> discord.Embed:
+    """Build an embed with one non-inline field per entry"""
+    embed = discord.Embed(title=title, description=description, color=color)
+    
+    for name, value in fields.items():
+        embed.add_field(name=name, value=value, inline=False)
+    
+    return embed
+
+
+# Built once; commands send a copy with the current timestamp
+_STRATEGIES_EMBED = _build_static_embed(
+    "📚 Available Trading Strategies",
+    "Choose from these strategies when generating signals",
+    discord.Color.purple(),
+    STRATEGIES_INFO
+)
+
+_HELP_EMBED = _build_static_embed(
+    "🤖 Athena Trading Bot - Help",
+    "Binance Futures Trading Signal Bot",
+    discord.Color.blue(),
+    COMMANDS_INFO
+)
+_HELP_EMBED.set_footer(text="⚠️ Trading involves risk. Use at your own discretion.")
+
+
 # ============================================================================
 # SLASH COMMANDS
 # ============================================================================
@@ -222,7 +293,8 @@ async def signal_command(
             symbol += 'USDT'
         
         # Get signal with levels
-        signal = bot.signal_analyzer.get_signal_with_levels(
+        signal = await asyncio.to_thread(
+            bot.signal_analyzer.get_signal_with_levels,
             symbol,
             strategy,
             interval,
@@ -264,7 +336,7 @@ async def scan_command(
     await interaction.response.defer()
     
     try:
-        signals = bot.signal_analyzer.scan_multiple_symbols(
+        signals = await bot.signal_analyzer.scan_multiple_symbols_async(
             bot.tracked_symbols,
             strategy,
             interval,
@@ -283,14 +355,13 @@ async def scan_command(
             title=f"📊 Market Scan Results",
             description=f"Strategy: **{strategy}** | Interval: **{interval}**",
             color=discord.Color.blue(),
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(_UTC)
         )
         
-        for i, signal in enumerate(signals[:10], 1):
-            side = signal.get('signal', 'NONE')
-            symbol = signal.get('symbol', 'UNKNOWN')
-            strength = signal.get('strength', 0)
-            price = signal.get('price', 0)
+        top_signals = heapq.nlargest(10, signals, key=lambda s: s.get('strength', 0))
+        
+        for i, signal in enumerate(top_signals, 1):
+            side, symbol, strength, price = _scan_fields(signal)
             
             emoji = "🟢" if side == "LONG" else "🔴"
             
@@ -318,7 +389,7 @@ async def balance_command(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     
     try:
-        balances = bot.binance_client.get_account_balance()
+        balances = await asyncio.to_thread(bot.binance_client.get_account_balance)
         
         if not balances:
             await interaction.followup.send(
@@ -330,7 +401,7 @@ async def balance_command(interaction: discord.Interaction):
         embed = discord.Embed(
             title="💰 Futures Account Balance",
             color=discord.Color.gold(),
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(_UTC)
         )
         
         total_balance = 0
@@ -364,7 +435,7 @@ async def positions_command(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     
     try:
-        positions = bot.binance_client.get_position_info()
+        positions = await asyncio.to_thread(bot.binance_client.get_position_info)
         
         if not positions:
             await interaction.followup.send(
@@ -376,10 +447,16 @@ async def positions_command(interaction: discord.Interaction):
         embed = discord.Embed(
             title="📊 Open Positions",
             color=discord.Color.blue(),
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(_UTC)
         )
         
-        for pos in positions:
+        # P&L % for all positions at once
+        entries = np.fromiter((p['entry_price'] for p in positions), np.float64, len(positions))
+        marks = np.fromiter((p['mark_price'] for p in positions), np.float64, len(positions))
+        signs = np.fromiter((1 if p['side'] == 'LONG' else -1 for p in positions), np.int8, len(positions))
+        pnl_pcts = signs * (marks - entries) / entries * 100.0
+        
+        for pos, pnl_pct in zip(positions, pnl_pcts):
             side = pos['side']
             symbol = pos['symbol']
             size = abs(pos['position_amount'])
@@ -388,16 +465,16 @@ async def positions_command(interaction: discord.Interaction):
             pnl = pos['unrealized_pnl']
             leverage = pos['leverage']
             
-            pnl_pct = ((mark - entry) / entry * 100) if side == 'LONG' else ((entry - mark) / entry * 100)
-            
             emoji = "🟢" if pnl > 0 else "🔴"
             
-            value = f"Side: **{side}**\n"
-            value += f"Size: {size}\n"
-            value += f"Entry: ${entry:.4f}\n"
-            value += f"Mark: ${mark:.4f}\n"
-            value += f"Leverage: {leverage}x\n"
-            value += f"P&L: ${pnl:.2f} ({pnl_pct:+.2f}%)"
+            value = (
+                f"Side: **{side}**\n"
+                f"Size: {size}\n"
+                f"Entry: ${entry:.4f}\n"
+                f"Mark: ${mark:.4f}\n"
+                f"Leverage: {leverage}x\n"
+                f"P&L: ${pnl:.2f} ({pnl_pct:+.2f}%)"
+            )
             
             embed.add_field(
                 name=f"{emoji} {symbol}",
@@ -426,7 +503,7 @@ async def price_command(interaction: discord.Interaction, symbol: str):
         if not symbol.endswith('USDT'):
             symbol += 'USDT'
         
-        price = bot.binance_client.get_current_price(symbol)
+        price = await asyncio.to_thread(bot.binance_client.get_current_price, symbol)
         
         if not price:
             await interaction.followup.send(
@@ -439,7 +516,7 @@ async def price_command(interaction: discord.Interaction, symbol: str):
             title=f"💲 {symbol} Price",
             description=f"**${price:,.4f}**",
             color=discord.Color.blue(),
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(_UTC)
         )
         
         await interaction.followup.send(embed=embed)
@@ -509,29 +586,8 @@ async def strategies_command(interaction: discord.Interaction):
     """List available strategies"""
     await interaction.response.defer()
     
-    embed = discord.Embed(
-        title="📚 Available Trading Strategies",
-        description="Choose from these strategies when generating signals",
-        color=discord.Color.purple(),
-        timestamp=datetime.utcnow()
-    )
-    
-    strategies_info = {
-        "EMA_CROSS": "EMA crossover strategy (9/21)",
-        "TRIPLE_EMA": "Triple EMA alignment (9/21/50)",
-        "RSI_DIVERGENCE": "RSI divergence and extremes",
-        "MACD_SIGNAL": "MACD signal line crossover",
-        "STOCH_RSI": "Stochastic RSI crossovers",
-        "BREAKOUT": "Price breakout with volume",
-        "SUPPORT_RESISTANCE": "Support/Resistance bounces"
-    }
-    
-    for strategy, description in strategies_info.items():
-        embed.add_field(
-            name=strategy,
-            value=description,
-            inline=False
-        )
+    embed = _STRATEGIES_EMBED.copy()
+    embed.timestamp = datetime.now(_UTC)
     
     await interaction.followup.send(embed=embed)
 
@@ -539,32 +595,8 @@ async def strategies_command(interaction: discord.Interaction):
 @bot.tree.command(name="help", description="Show all available commands")
 async def help_command(interaction: discord.Interaction):
     """Show help"""
-    embed = discord.Embed(
-        title="🤖 Athena Trading Bot - Help",
-        description="Binance Futures Trading Signal Bot",
-        color=discord.Color.blue(),
-        timestamp=datetime.utcnow()
-    )
-    
-    commands_info = {
-        "/signal": "Get a trading signal for a specific symbol",
-        "/scan": "Scan multiple symbols for signals",
-        "/price": "Get current price for a symbol",
-        "/balance": "View your Binance Futures balance",
-        "/positions": "View your open positions",
-        "/monitor": "Start/stop automatic signal monitoring",
-        "/strategies": "List all available trading strategies",
-        "/help": "Show this help message"
-    }
-    
-    for cmd, desc in commands_info.items():
-        embed.add_field(
-            name=cmd,
-            value=desc,
-            inline=False
-        )
-    
-    embed.set_footer(text="⚠️ Trading involves risk. Use at your own discretion.")
+    embed = _HELP_EMBED.copy()
+    embed.timestamp = datetime.now(_UTC)
     
     await interaction.followup.send(embed=embed)
 
@@ -580,6 +612,13 @@ def run_bot():
             log.error("Discord bot token not found in environment variables!")
             return
         
+        # Faster event loop where available (not supported on Windows)
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+        
         log.info("Starting Athena Discord Bot...")
         bot.run(config.DISCORD_BOT_TOKEN)
         
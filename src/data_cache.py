@@ -0,0 +1,107 @@
+"""
+On-disk kline cache for backtests
+
+Klines are stored as Parquet files under trading_data/kline_cache/, keyed
+by (symbol, interval, start, end). The window is aligned to the interval
+boundary, so repeated runs within the same candle are read from disk
+instead of downloading again. Without pyarrow the cache is skipped and
+klines are always fetched.
+"""
+import os
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from logger import get_logger
+
+log = get_logger('DataCache')
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+CACHE_DIR = os.path.join('trading_data', 'kline_cache')
+
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000
+}
+
+
+def klines_to_dataframe(klines: List) -> pd.DataFrame:
+    """
+    Convert raw klines to a DataFrame of timestamp and float64 OHLCV
+    
+    The remaining kline fields are never used by the backtests. The
+    numeric block is converted in a single pass.
+    
+    Args:
+        klines: Raw klines from the exchange, as Binance lists or as the
+            Bybit client's dicts keyed by column name
+    
+    Returns:
+        DataFrame with timestamp, open, high, low, close, volume
+    """
+    if klines and isinstance(klines[0], dict):
+        klines = [[k['timestamp'], k['open'], k['high'], k['low'], k['close'], k['volume']] for k in klines]
+    
+    arr = np.asarray(klines, dtype=object)
+    timestamps = pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms')
+    ohlcv = arr[:, 1:6].astype(np.float64)
+    
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': ohlcv[:, 0],
+        'high': ohlcv[:, 1],
+        'low': ohlcv[:, 2],
+        'close': ohlcv[:, 3],
+        'volume': ohlcv[:, 4]
+    })
+
+
+def get_klines_cached(client, symbol: str, interval: str, limit: int) -> pd.DataFrame:
+    """
+    Get the latest klines as a DataFrame, reading from the disk cache when possible
+    
+    Args:
+        client: Exchange client with get_klines(symbol, interval, limit)
+        symbol: Trading symbol
+        interval: Candle interval
+        limit: Number of candles
+    
+    Returns:
+        DataFrame from klines_to_dataframe (empty if no data)
+    """
+    interval_ms = INTERVAL_MS.get(interval, 900_000)
+    end = int(time.time() * 1000) // interval_ms * interval_ms
+    start = end - limit * interval_ms
+    path = os.path.join(CACHE_DIR, f"{symbol}_{interval}_{start}_{end}.parquet")
+    
+    if PARQUET_AVAILABLE and os.path.exists(path):
+        try:
+            return pd.read_parquet(path, engine='pyarrow')
+        except Exception as e:
+            log.warning(f"Ignoring unreadable kline cache {path}: {e}")
+    
+    klines = client.get_klines(symbol, interval, limit)
+    if not klines:
+        return pd.DataFrame()
+    
+    df = klines_to_dataframe(klines)
+    
+    if PARQUET_AVAILABLE:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            df.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log.warning(f"Could not write kline cache {path}: {e}")
+    
+    return df
@@ -1,50 +1,220 @@
 """
 Custom logging configuration with colors
 """
+import atexit
+import functools
 import logging
-import colorlog
 import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import RotatingFileHandler, MemoryHandler, QueueHandler, QueueListener
 from config import LOG_LEVEL, LOG_FORMAT, LOG_FILE
 
-# Create logs directory if it doesn't exist
-os.makedirs('logs', exist_ok=True)
-
-# Create color formatter
-color_formatter = colorlog.ColoredFormatter(
-    '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    log_colors={
-        'DEBUG': 'cyan',
-        'INFO': 'green',
-        'WARNING': 'yellow',
-        'ERROR': 'red',
-        'CRITICAL': 'red,bg_white',
-    }
-)
-
-# Create file formatter
-file_formatter = logging.Formatter(LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
-
-# Create console handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(color_formatter)
-
-# Create file handler
-file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
-file_handler.setFormatter(file_formatter)
 
+def _make_color_formatter():
+    """Create the console formatter, importing colorlog only when it is built"""
+    try:
+        import colorlog
+    except ImportError:
+        return logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+    
+    return colorlog.ColoredFormatter(
+        '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        log_colors={
+            'DEBUG': 'cyan',
+            'INFO': 'green',
+            'WARNING': 'yellow',
+            'ERROR': 'red',
+            'CRITICAL': 'red,bg_white',
+        }
+    )
+
+
+# Seconds between writes of the file buffer, so a killed process loses at
+# most this much of its INFO logging
+LOG_FLUSH_INTERVAL = 5.0
+
+
+class _FlushingQueueListener(QueueListener):
+    """QueueListener that also flushes its handlers every flush_interval seconds"""
+    
+    def __init__(self, log_queue, *handlers, flush_interval: float = LOG_FLUSH_INTERVAL):
+        super().__init__(log_queue, *handlers)
+        self.flush_interval = flush_interval
+        self._next_flush = time.monotonic() + flush_interval
+    
+    def dequeue(self, block):
+        while True:
+            timeout = self._next_flush - time.monotonic()
+            if timeout <= 0:
+                for handler in self.handlers:
+                    handler.flush()
+                self._next_flush = time.monotonic() + self.flush_interval
+                continue
+            
+            try:
+                return self.queue.get(block, timeout=timeout)
+            except queue.Empty:
+                pass
+
+
+class _DirectHandler(logging.Handler):
+    """Passes each record straight on to the given handlers, in the calling thread"""
+    
+    def __init__(self, *handlers):
+        super().__init__()
+        self.handlers = handlers
+    
+    def handle(self, record):
+        for handler in self.handlers:
+            handler.handle(record)
+        return True
+
+
+def _in_worker_process() -> bool:
+    """True in a multiprocessing child, where the parent process owns log rotation"""
+    # A child always has multiprocessing imported, so don't import it here
+    mp = sys.modules.get('multiprocessing')
+    return mp is not None and mp.parent_process() is not None
+
+
+# Handlers are created on the first get_logger call, so importing this
+# module creates no directory, opens no file and starts no thread
+_handler_lock = threading.Lock()
+console_handler = None
+file_handler = None
+queue_handler = None
+listener = None
+
+
+def _make_worker_handler():
+    """
+    Create unbuffered console and file handlers for a worker process
+    
+    The file is appended to without ever rotating it, so several processes
+    never try to rename it at once (which fails on Windows while another
+    process has it open). Writes are unbuffered because pool workers may
+    leave through os._exit, skipping atexit.
+    """
+    global console_handler, file_handler
+    
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(_make_color_formatter())
+    
+    file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S'))
+    
+    return _DirectHandler(console_handler, file_handler)
+
+
+def _get_queue_handler():
+    """Create the shared handlers once and return the handler loggers attach"""
+    global console_handler, file_handler, queue_handler, listener
+    
+    with _handler_lock:
+        if queue_handler is None:
+            # Create logs directory if it doesn't exist
+            os.makedirs('logs', exist_ok=True)
+            
+            # Only the top-level process rotates the log file
+            if _in_worker_process():
+                queue_handler = _make_worker_handler()
+                return queue_handler
+            
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(_make_color_formatter())
+            
+            # File handler: size-capped, with records buffered and written in
+            # batches (warnings and errors are written straight away, the rest
+            # at the latest every LOG_FLUSH_INTERVAL seconds)
+            rotating_file_handler = RotatingFileHandler(
+                LOG_FILE, maxBytes=50 * 1024 * 1024, backupCount=5, encoding='utf-8'
+            )
+            rotating_file_handler.setFormatter(
+                logging.Formatter(LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
+            )
+            file_handler = MemoryHandler(capacity=1024, flushLevel=logging.WARNING, target=rotating_file_handler)
+            
+            # Loggers only enqueue records; a background thread does the console and file I/O
+            log_queue = queue.Queue(-1)
+            listener = _FlushingQueueListener(log_queue, console_handler, file_handler)
+            listener.start()
+            
+            queue_handler = QueueHandler(log_queue)
+    
+    return queue_handler
+
+
+def _shutdown_listener():
+    """Write out every queued and buffered record and stop the listener"""
+    global listener
+    
+    if listener is not None:
+        listener.stop()
+        listener = None
+        file_handler.flush()
+
+
+# Drains the queue before logging's own shutdown flushes the file buffer
+atexit.register(_shutdown_listener)
+
+
+def _reset_after_fork():
+    """
+    Give a forked child its own handlers
+    
+    The child inherits the parent's queue but not its listener thread, so
+    records logged there would never be written. Loggers holding the
+    parent's queue handler are moved to the worker handlers instead.
+    """
+    global _handler_lock, console_handler, file_handler, queue_handler, listener
+    
+    parent_handler = queue_handler
+    if isinstance(file_handler, MemoryHandler):
+        # The parent writes these records itself
+        file_handler.buffer.clear()
+    
+    _handler_lock = threading.Lock()
+    console_handler = file_handler = queue_handler = listener = None
+    
+    if parent_handler is None:
+        return
+    
+    queue_handler = _make_worker_handler()
+    
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if isinstance(logger, logging.Logger) and parent_handler in logger.handlers:
+            logger.removeHandler(parent_handler)
+            logger.addHandler(queue_handler)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@functools.lru_cache(maxsize=None)
 def get_logger(name):
-    """Get a configured logger instance"""
+    """Get a configured logger instance (configured once per name)"""
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, LOG_LEVEL))
-    
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
+    if logger.handlers:
+        return logger
     
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.setLevel(getattr(logging, LOG_LEVEL))
+    logger.addHandler(_get_queue_handler())
+    # The queue handler already writes everything; don't repeat via root
+    logger.propagate = False
     
     return logger
 
-# Create main logger
-log = get_logger('AthenaBot')
+
+def __getattr__(name):
+    """Create the main logger (logger.log) on first access"""
+    if name == 'log':
+        return get_logger('AthenaBot')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
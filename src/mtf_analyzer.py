@@ -3,15 +3,24 @@ Multi-Timeframe Analysis Module
 Analyzes trading signals across multiple timeframes to improve signal quality.
 """
 
+import copy
+import threading
+import time
+from collections import Counter, OrderedDict
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 import logging
 from binance_client import BinanceFuturesClient
+from data_cache import klines_to_dataframe, INTERVAL_MS
 from strategies_enhanced import EnhancedTripleEMAStrategy, OptimizedStrategyFactory
 
 logger = logging.getLogger(__name__)
 
+# Analyses remembered by MultiTimeframeAnalyzer.analyze_symbol
+ANALYSIS_CACHE_SIZE = 512
+
 
 class TimeframeStrength(Enum):
     """Signal strength based on timeframe alignment"""
@@ -23,12 +32,47 @@ class TimeframeStrength(Enum):
 
 
 class TrendDirection(Enum):
-    """Trend direction across timeframes"""
-    STRONG_BULLISH = "STRONG_BULLISH"
-    BULLISH = "BULLISH"
-    NEUTRAL = "NEUTRAL"
-    BEARISH = "BEARISH"
-    STRONG_BEARISH = "STRONG_BEARISH"
+    """Trend direction across timeframes (values are bit flags, see the masks below)"""
+    STRONG_BULLISH = 0b1000
+    BULLISH = 0b0100
+    NEUTRAL = 0
+    BEARISH = 0b0010
+    STRONG_BEARISH = 0b0001
+
+
+# Test a trend's direction with one AND: trend.value & BULLISH_MASK
+BULLISH_MASK = TrendDirection.STRONG_BULLISH.value | TrendDirection.BULLISH.value
+BEARISH_MASK = TrendDirection.STRONG_BEARISH.value | TrendDirection.BEARISH.value
+
+
+# Columns read by _determine_trend, in bitmask order
+TREND_COLUMNS = ['close', 'ema_9', 'ema_21', 'ema_50']
+
+
+def _trend_from_comparisons(mask: int) -> TrendDirection:
+    """
+    Classify a trend from the 8 EMA comparisons packed into a bitmask.
+    
+    Bits 0-3 are price > EMA9, EMA9 > EMA21, EMA21 > EMA50, price > EMA21;
+    bits 4-7 are the same comparisons with <.
+    """
+    above = [bool(mask >> bit & 1) for bit in range(4)]
+    below = [bool(mask >> bit & 1) for bit in range(4, 8)]
+    
+    if above[0] and above[1] and above[2]:
+        return TrendDirection.STRONG_BULLISH
+    elif above[3] and above[1]:
+        return TrendDirection.BULLISH
+    elif below[0] and below[1] and below[2]:
+        return TrendDirection.STRONG_BEARISH
+    elif below[3] and below[1]:
+        return TrendDirection.BEARISH
+    else:
+        return TrendDirection.NEUTRAL
+
+
+# Trend for every comparison bitmask, so classification is one table lookup
+_TREND_TABLE = tuple(_trend_from_comparisons(mask) for mask in range(256))
 
 
 class MultiTimeframeAnalyzer:
@@ -64,9 +108,18 @@ class MultiTimeframeAnalyzer:
         self.primary_timeframe = primary_timeframe
         self.confirmation_timeframes = confirmation_timeframes or ["1h", "4h"]
         
-        # Initialize strategy for each timeframe
+        # Confirmation timeframe klines: (symbol, timeframe, limit) -> (expiry, klines)
+        self._kline_cache: Dict[Tuple[str, str, int], Tuple[float, List]] = {}
+        
+        # Analyses per (symbol, limit, primary bar open time), least recently used first
+        self._analysis_cache: OrderedDict = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
+        
+        # Every timeframe uses the same balanced strategy. It holds only its
+        # parameters (no per-frame state), so one instance is shared.
+        strategy = OptimizedStrategyFactory.create_balanced_strategy()
         self.strategies = {
-            tf: OptimizedStrategyFactory.create_balanced_strategy() 
+            tf: strategy
             for tf in [primary_timeframe] + self.confirmation_timeframes
         }
         
@@ -83,6 +136,11 @@ class MultiTimeframeAnalyzer:
         """
         Analyze a symbol across multiple timeframes.
         
+        The result is remembered for the current primary bar: further calls
+        for the same symbol before the next bar opens only fetch the primary
+        timeframe and return a copy of it, with the current price updated,
+        instead of re-running the analysis.
+        
         Args:
             symbol: Trading pair (e.g., 'BTCUSDT')
             limit: Number of candles to fetch per timeframe
@@ -93,12 +151,36 @@ class MultiTimeframeAnalyzer:
         try:
             logger.info(f"Starting MTF analysis for {symbol}")
             
-            # Fetch data for all timeframes
-            timeframe_data = {}
-            for timeframe in [self.primary_timeframe] + self.confirmation_timeframes:
-                klines = self.client.get_klines(symbol, timeframe, limit=limit)
-                df = self._prepare_dataframe(klines)
-                timeframe_data[timeframe] = df
+            # The primary timeframe decides whether the analysis for this bar
+            # is already known
+            df_primary = self._prepare_dataframe(self._get_klines(symbol, self.primary_timeframe, limit))
+            current_price = float(df_primary['close'].iloc[-1])
+            
+            primary_bar = df_primary['timestamp'].iloc[-1]
+            cache_key = (symbol, limit, int(primary_bar.value))
+            with self._analysis_cache_lock:
+                cached = self._analysis_cache.get(cache_key)
+                if cached is not None:
+                    self._analysis_cache.move_to_end(cache_key)
+                    result = copy.deepcopy(cached)
+            
+            if cached is not None:
+                result['current_price'] = current_price
+                result['timeframe_analysis'][self.primary_timeframe]['current_price'] = current_price
+                return result
+            
+            # Fetch the confirmation timeframes; the requests are independent,
+            # so they go out concurrently instead of one round-trip after another
+            with ThreadPoolExecutor(max_workers=len(self.confirmation_timeframes)) as executor:
+                futures = {
+                    tf: executor.submit(self._get_klines, symbol, tf, limit)
+                    for tf in self.confirmation_timeframes
+                }
+                timeframe_data = {self.primary_timeframe: df_primary}
+                timeframe_data.update(
+                    (tf, self._prepare_dataframe(future.result()))
+                    for tf, future in futures.items()
+                )
             
             # Analyze each timeframe
             timeframe_signals = {}
@@ -116,8 +198,14 @@ class MultiTimeframeAnalyzer:
                     'ema_50': float(df['ema_50'].iloc[-1]) if 'ema_50' in df else None,
                 }
             
+            # Count signals and trends once for the strength and trend assessments
+            counts = Counter()
+            for data in timeframe_signals.values():
+                counts[data['signal']] += 1
+                counts[data['trend']] += 1
+            
             # Calculate signal strength
-            signal_strength = self._calculate_signal_strength(timeframe_signals)
+            signal_strength = self._calculate_signal_strength(timeframe_signals, counts)
             
             # Get primary signal with enhanced confidence
             primary_signal = timeframe_signals[self.primary_timeframe]['signal']
@@ -129,7 +217,7 @@ class MultiTimeframeAnalyzer:
             )
             
             # Overall trend assessment
-            overall_trend = self._assess_overall_trend(timeframe_signals)
+            overall_trend = self._assess_overall_trend(timeframe_signals, counts)
             
             # Final decision
             final_signal = self._make_final_decision(
@@ -152,6 +240,12 @@ class MultiTimeframeAnalyzer:
                 'current_price': timeframe_signals[self.primary_timeframe]['current_price'],
             }
             
+            # The caller gets the result itself, so the cache keeps its own copy
+            with self._analysis_cache_lock:
+                self._analysis_cache[cache_key] = copy.deepcopy(result)
+                if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
+            
             logger.info(
                 f"{symbol} MTF Analysis - Signal: {final_signal}, "
                 f"Strength: {signal_strength.name}, Trend: {overall_trend.name}"
@@ -167,19 +261,34 @@ class MultiTimeframeAnalyzer:
                 'final_signal': 'HOLD'
             }
     
+    def _get_klines(self, symbol: str, timeframe: str, limit: int) -> List:
+        """
+        Fetch klines, reusing confirmation timeframe data for half a bar.
+        
+        Higher timeframe bars change slowly compared to the scan interval,
+        so their klines are kept for half the bar duration (2h for 4h bars)
+        at the cost of a slightly stale last candle. The primary timeframe
+        is always fetched fresh.
+        """
+        if timeframe == self.primary_timeframe:
+            return self.client.get_klines(symbol, timeframe, limit=limit)
+        
+        key = (symbol, timeframe, limit)
+        now = time.time()
+        cached = self._kline_cache.get(key)
+        if cached and now < cached[0]:
+            return cached[1]
+        
+        klines = self.client.get_klines(symbol, timeframe, limit=limit)
+        if klines:
+            bar_seconds = INTERVAL_MS.get(timeframe, 900_000) / 1000
+            self._kline_cache[key] = (now + bar_seconds * 0.5, klines)
+        
+        return klines
+    
     def _prepare_dataframe(self, klines: List) -> pd.DataFrame:
-        """Convert klines to DataFrame with OHLCV data."""
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
-        
-        return df
+        """Convert klines to DataFrame with OHLCV data (converted in one pass, unused kline fields dropped)."""
+        return klines_to_dataframe(klines)
     
     def _determine_trend(self, df: pd.DataFrame) -> TrendDirection:
         """
@@ -191,45 +300,44 @@ class MultiTimeframeAnalyzer:
         Bearish: Price < EMA21 or EMA9 < EMA21
         Strong Bearish: Price < EMA9 < EMA21 < EMA50
         """
-        if df.empty or len(df) < 50:
+        if df.empty or len(df) < 50 or not all(col in df for col in TREND_COLUMNS):
             return TrendDirection.NEUTRAL
         
-        price = float(df['close'].iloc[-1])
-        ema_9 = float(df['ema_9'].iloc[-1]) if 'ema_9' in df else None
-        ema_21 = float(df['ema_21'].iloc[-1]) if 'ema_21' in df else None
-        ema_50 = float(df['ema_50'].iloc[-1]) if 'ema_50' in df else None
+        # One read for the last row of all four columns
+        price, ema_9, ema_21, ema_50 = df[TREND_COLUMNS].to_numpy(dtype=float)[-1]
         
-        if not all([ema_9, ema_21, ema_50]):
+        # A zero EMA means it wasn't computed (NaN compares false everywhere
+        # and also ends up NEUTRAL)
+        if ema_9 == 0 or ema_21 == 0 or ema_50 == 0:
             return TrendDirection.NEUTRAL
         
-        # Check alignment
-        if price > ema_9 > ema_21 > ema_50:
-            return TrendDirection.STRONG_BULLISH
-        elif price > ema_21 and ema_9 > ema_21:
-            return TrendDirection.BULLISH
-        elif price < ema_9 < ema_21 < ema_50:
-            return TrendDirection.STRONG_BEARISH
-        elif price < ema_21 and ema_9 < ema_21:
-            return TrendDirection.BEARISH
-        else:
-            return TrendDirection.NEUTRAL
+        mask = (
+            (price > ema_9) | (ema_9 > ema_21) << 1 | (ema_21 > ema_50) << 2 | (price > ema_21) << 3 |
+            (price < ema_9) << 4 | (ema_9 < ema_21) << 5 | (ema_21 < ema_50) << 6 | (price < ema_21) << 7
+        )
+        return _TREND_TABLE[mask]
     
     def _calculate_signal_strength(
         self,
-        timeframe_signals: Dict
+        timeframe_signals: Dict,
+        counts: Optional[Counter] = None
     ) -> TimeframeStrength:
         """
         Calculate overall signal strength based on timeframe alignment.
         
+        Args:
+            timeframe_signals: Signals from all timeframes
+            counts: Signal counts already taken by analyze_symbol (optional)
+        
         Returns:
             TimeframeStrength enum value
         """
-        signals = [data['signal'] for data in timeframe_signals.values()]
-        
-        # Count bullish and bearish signals
-        bullish_count = sum(1 for s in signals if s == 'BUY')
-        bearish_count = sum(1 for s in signals if s == 'SELL')
-        total_signals = len(signals)
+        # Count bullish and bearish signals in one pass
+        if counts is None:
+            counts = Counter(data['signal'] for data in timeframe_signals.values())
+        bullish_count = counts['BUY']
+        bearish_count = counts['SELL']
+        total_signals = len(timeframe_signals)
         
         # All timeframes aligned
         if bullish_count == total_signals or bearish_count == total_signals:
@@ -267,40 +375,39 @@ class MultiTimeframeAnalyzer:
         if primary_signal == 'HOLD':
             return False
         
+        # Trend directions that align with the signal
+        aligned_mask = BULLISH_MASK if primary_signal == 'BUY' else BEARISH_MASK
+        
         for timeframe in self.confirmation_timeframes:
-            htf_signal = timeframe_signals[timeframe]['signal']
-            htf_trend = timeframe_signals[timeframe]['trend']
+            htf = timeframe_signals[timeframe]
             
-            # Check if signal matches
-            if htf_signal == primary_signal:
+            # Signal matches, or trend aligns with signal direction
+            if htf['signal'] == primary_signal or htf['trend'].value & aligned_mask:
                 return True
-            
-            # Check if trend aligns with signal direction
-            if primary_signal == 'BUY':
-                if htf_trend in [TrendDirection.BULLISH, TrendDirection.STRONG_BULLISH]:
-                    return True
-            elif primary_signal == 'SELL':
-                if htf_trend in [TrendDirection.BEARISH, TrendDirection.STRONG_BEARISH]:
-                    return True
         
         return False
     
     def _assess_overall_trend(
         self,
-        timeframe_signals: Dict
+        timeframe_signals: Dict,
+        counts: Optional[Counter] = None
     ) -> TrendDirection:
         """
         Assess the overall trend across all timeframes.
         
         Higher timeframes have more weight in the assessment.
-        """
-        trends = [data['trend'] for data in timeframe_signals.values()]
         
-        # Count trend directions
-        strong_bullish = sum(1 for t in trends if t == TrendDirection.STRONG_BULLISH)
-        bullish = sum(1 for t in trends if t == TrendDirection.BULLISH)
-        strong_bearish = sum(1 for t in trends if t == TrendDirection.STRONG_BEARISH)
-        bearish = sum(1 for t in trends if t == TrendDirection.BEARISH)
+        Args:
+            timeframe_signals: Signals from all timeframes
+            counts: Trend counts already taken by analyze_symbol (optional)
+        """
+        # Count trend directions in one pass
+        if counts is None:
+            counts = Counter(data['trend'] for data in timeframe_signals.values())
+        strong_bullish = counts[TrendDirection.STRONG_BULLISH]
+        bullish = counts[TrendDirection.BULLISH]
+        strong_bearish = counts[TrendDirection.STRONG_BEARISH]
+        bearish = counts[TrendDirection.BEARISH]
         
         total_bullish = strong_bullish + bullish
         total_bearish = strong_bearish + bearish
@@ -344,8 +451,11 @@ class MultiTimeframeAnalyzer:
         Returns:
             Final signal: 'BUY', 'SELL', or 'HOLD'
         """
+        strength = signal_strength.value
+        trend = overall_trend.value
+        
         # Weak or no signal
-        if signal_strength in [TimeframeStrength.WEAK, TimeframeStrength.NO_SIGNAL]:
+        if strength <= TimeframeStrength.WEAK.value:
             return 'HOLD'
         
         # No primary signal
@@ -354,29 +464,25 @@ class MultiTimeframeAnalyzer:
         
         # Check for conflicting signals
         if primary_signal == 'BUY':
-            if overall_trend in [TrendDirection.STRONG_BEARISH, TrendDirection.BEARISH]:
+            if trend & BEARISH_MASK:
                 if not htf_confirmation:
                     return 'HOLD'  # Don't buy against the trend
         
         elif primary_signal == 'SELL':
-            if overall_trend in [TrendDirection.STRONG_BULLISH, TrendDirection.BULLISH]:
+            if trend & BULLISH_MASK:
                 if not htf_confirmation:
                     return 'HOLD'  # Don't sell against the trend
         
         # Strong signals with confirmation
-        if signal_strength in [TimeframeStrength.VERY_STRONG, TimeframeStrength.STRONG]:
+        if strength >= TimeframeStrength.STRONG.value:
             if htf_confirmation:
                 return primary_signal
         
         # Moderate signals with trend alignment
-        if signal_strength == TimeframeStrength.MODERATE:
-            if primary_signal == 'BUY' and overall_trend in [
-                TrendDirection.BULLISH, TrendDirection.STRONG_BULLISH
-            ]:
+        if strength == TimeframeStrength.MODERATE.value:
+            if primary_signal == 'BUY' and trend & BULLISH_MASK:
                 return 'BUY'
-            elif primary_signal == 'SELL' and overall_trend in [
-                TrendDirection.BEARISH, TrendDirection.STRONG_BEARISH
-            ]:
+            elif primary_signal == 'SELL' and trend & BEARISH_MASK:
                 return 'SELL'
         
         # Default to hold if conditions not met
@@ -7,6 +7,7 @@ import pandas as pd
 from typing import Dict, List, Optional
 import logging
 from binance_client import BinanceFuturesClient
+from data_cache import klines_to_dataframe
 from bybit_client import BybitFuturesClient
 from multi_strategy import MultiStrategyManager
 import config
@@ -51,7 +52,8 @@ class MultiStrategySignalAnalyzer:
     def analyze_symbol(
         self,
         symbol: str,
-        include_scalping: bool = False
+        include_scalping: bool = False,
+        klines_by_interval: Optional[Dict[str, pd.DataFrame]] = None
     ) -> Dict:
         """
         Analyze a symbol using all strategies.
@@ -59,6 +61,8 @@ class MultiStrategySignalAnalyzer:
         Args:
             symbol: Trading pair (e.g., 'BTCUSDT')
             include_scalping: Whether to include 1-min scalping analysis
+            klines_by_interval: Already fetched data per timeframe, as from
+                _prepare_dataframe; only missing timeframes are fetched
             
         Returns:
             Dict containing comprehensive multi-strategy analysis
@@ -67,8 +71,11 @@ class MultiStrategySignalAnalyzer:
             logger.info(f"Analyzing {symbol} with multi-strategy system...")
             
             # Fetch data for all required timeframes
-            klines_data = {}
+            klines_data = dict(klines_by_interval or {})
             for tf in self.required_timeframes:
+                if tf in klines_data:
+                    continue
+                
                 try:
                     if tf == '1m':
                         limit = 100  # Last 100 minutes
@@ -241,17 +248,7 @@ class MultiStrategySignalAnalyzer:
     
     def _prepare_dataframe(self, klines: List) -> pd.DataFrame:
         """Convert klines to DataFrame."""
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
-        
-        return df
+        return klines_to_dataframe(klines)
     
     def _calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
         """Calculate RSI indicator."""
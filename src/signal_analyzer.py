@@ -1,10 +1,12 @@
 """
 Signal Analyzer - Processes market data and generates trading signals
 """
+import asyncio
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 from binance_client import BinanceFuturesClient
+from data_cache import klines_to_dataframe
 from strategies import get_strategy, calculate_stop_loss_take_profit
 from logger import get_logger
 import config
@@ -35,19 +37,7 @@ class SignalAnalyzer:
             DataFrame with OHLCV data
         """
         try:
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            
-            # Convert to appropriate types
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
-            
-            return df
-            
+            return klines_to_dataframe(klines)
         except Exception as e:
             log.error(f"Error preparing dataframe: {e}")
             return pd.DataFrame()
@@ -125,22 +115,109 @@ class SignalAnalyzer:
         signals = []
         
         for symbol in symbols:
-            try:
-                result = self.analyze_symbol(symbol, strategy_name, interval)
-                
-                if result and result.get('signal') and result.get('strength', 0) >= min_signal_strength:
-                    signals.append(result)
-                    log.info(f"Signal found: {symbol} - {result['signal']} (Strength: {result['strength']})")
-                    
-            except Exception as e:
-                log.error(f"Error scanning {symbol}: {e}")
-                continue
+            result = self._scan_symbol(symbol, strategy_name, interval, min_signal_strength)
+            if result:
+                signals.append(result)
         
         # Sort by signal strength
         signals.sort(key=lambda x: x.get('strength', 0), reverse=True)
         
         return signals
     
+    def _scan_symbol(
+        self,
+        symbol: str,
+        strategy_name: str,
+        interval: str,
+        min_signal_strength: float
+    ) -> Optional[Dict]:
+        """
+        Analyze one symbol and return its signal if it meets the strength threshold
+        
+        Args:
+            symbol: Symbol to scan
+            strategy_name: Strategy to use
+            interval: Candle interval
+            min_signal_strength: Minimum signal strength to include
+            
+        Returns:
+            Signal dictionary or None
+        """
+        try:
+            result = self.analyze_symbol(symbol, strategy_name, interval)
+            
+            if result and result.get('signal') and result.get('strength', 0) >= min_signal_strength:
+                log.info(f"Signal found: {symbol} - {result['signal']} (Strength: {result['strength']})")
+                return result
+                
+        except Exception as e:
+            log.error(f"Error scanning {symbol}: {e}")
+        
+        return None
+    
+    async def scan_symbol_async(
+        self,
+        symbol: str,
+        strategy_name: str,
+        interval: str = config.DEFAULT_INTERVAL,
+        min_signal_strength: float = 50.0
+    ) -> Optional[Dict]:
+        """
+        Scan one symbol in a worker thread so several scans can run concurrently
+        
+        Args:
+            symbol: Symbol to scan
+            strategy_name: Strategy to use
+            interval: Candle interval
+            min_signal_strength: Minimum signal strength to include
+            
+        Returns:
+            Signal dictionary or None
+        """
+        return await asyncio.to_thread(
+            self._scan_symbol, symbol, strategy_name, interval, min_signal_strength
+        )
+    
+    async def scan_multiple_symbols_async(
+        self,
+        symbols: List[str],
+        strategy_name: str,
+        interval: str = config.DEFAULT_INTERVAL,
+        min_signal_strength: float = 50.0,
+        max_concurrency: int = 10
+    ) -> List[Dict]:
+        """
+        Scan multiple symbols concurrently for trading signals
+        
+        Args:
+            symbols: List of symbols to scan
+            strategy_name: Strategy to use
+            interval: Candle interval
+            min_signal_strength: Minimum signal strength to include
+            max_concurrency: Maximum scans in flight at once (keeps us
+                inside the exchange rate limits)
+            
+        Returns:
+            List of signals that meet criteria, in symbol order (callers
+            pick the strongest with heapq.nlargest rather than sorting all)
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+        
+        async def scan(symbol: str) -> Optional[Dict]:
+            async with sem:
+                return await self.scan_symbol_async(symbol, strategy_name, interval, min_signal_strength)
+        
+        results = await asyncio.gather(*(scan(symbol) for symbol in symbols), return_exceptions=True)
+        
+        signals = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                log.error(f"Error scanning {symbol}: {result}")
+            elif result:
+                signals.append(result)
+        
+        return signals
+    
     def get_signal_with_levels(
         self,
         symbol: str,
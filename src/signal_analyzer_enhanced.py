@@ -6,6 +6,7 @@ import pandas as pd
 from typing import Dict, List, Optional
 import logging
 from binance_client import BinanceFuturesClient
+from data_cache import klines_to_dataframe
 from strategies_enhanced import EnhancedTripleEMAStrategy, OptimizedStrategyFactory
 from mtf_analyzer import MultiTimeframeAnalyzer, TimeframeStrength, TrendDirection
 
@@ -220,17 +221,7 @@ class EnhancedSignalAnalyzer:
     
     def _prepare_dataframe(self, klines: List) -> pd.DataFrame:
         """Convert klines to DataFrame."""
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
-        
-        return df
+        return klines_to_dataframe(klines)
     
     def _calculate_signal_stars(self, strength: TimeframeStrength) -> int:
         """
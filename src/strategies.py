@@ -3,19 +3,130 @@ Trading Strategies with Technical Indicators
 """
 import pandas as pd
 import numpy as np
-from ta.trend import EMAIndicator, MACD, SMAIndicator
-from ta.momentum import RSIIndicator, StochRSIIndicator, StochasticOscillator
+from ta.trend import SMAIndicator
+from ta.momentum import StochasticOscillator
 from ta.volatility import BollingerBands, AverageTrueRange
 from typing import Dict, List, Tuple, Optional
 from logger import get_logger
+from numba_compat import njit, NUMBA_AVAILABLE
 import config
 
 log = get_logger('TradingStrategies')
 
 
+@njit(cache=True)
+def _ema_loop(x, alpha, min_periods, out):
+    """
+    EMA recurrence, bit-for-bit with pandas ewm(alpha=alpha, adjust=False)
+    
+    Leading NaNs are skipped and output stays NaN until min_periods
+    observations have been seen.
+    """
+    old_wt_factor = 1.0 - alpha
+    old_wt = 1.0
+    weighted = np.nan
+    nobs = 0
+    
+    for i in range(len(x)):
+        cur = x[i]
+        is_observation = cur == cur
+        if is_observation:
+            nobs += 1
+        
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        
+        out[i] = weighted if nobs >= min_periods else np.nan
+    
+    return out
+
+
+@njit(cache=True)
+def _rsi_loop(close, period, out):
+    """Wilder RSI over close prices, matching ta's RSIIndicator"""
+    n = len(close)
+    up = np.zeros(n)
+    down = np.zeros(n)
+    
+    for i in range(1, n):
+        diff = close[i] - close[i - 1]
+        if diff > 0:
+            up[i] = diff
+        elif diff < 0:
+            down[i] = -diff
+    
+    alpha = 1.0 / period
+    ema_up = _ema_loop(up, alpha, period, np.empty(n))
+    ema_down = _ema_loop(down, alpha, period, np.empty(n))
+    
+    for i in range(n):
+        if ema_down[i] == 0:
+            out[i] = 100.0
+        else:
+            out[i] = 100 - (100 / (1 + ema_up[i] / ema_down[i]))
+    
+    return out
+
+
+def ema(series: pd.Series, period: int) -> pd.Series:
+    """
+    Exponential moving average, same values as ta's EMAIndicator
+    
+    Uses the compiled kernel when numba is installed, pandas ewm otherwise.
+    """
+    if not NUMBA_AVAILABLE:
+        return series.ewm(span=period, min_periods=period, adjust=False).mean()
+    
+    values = series.to_numpy(dtype=np.float64)
+    out = _ema_loop(values, 2.0 / (1.0 + period), period, np.empty_like(values))
+    return pd.Series(out, index=series.index)
+
+
+def rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    """
+    Relative Strength Index, same values as ta's RSIIndicator
+    
+    Uses the compiled kernel when numba is installed, pandas ewm otherwise.
+    """
+    if not NUMBA_AVAILABLE:
+        diff = close.diff(1)
+        up = diff.where(diff > 0, 0.0)
+        down = -diff.where(diff < 0, 0.0)
+        ema_up = up.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+        ema_down = down.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+        return pd.Series(
+            np.where(ema_down == 0, 100, 100 - (100 / (1 + ema_up / ema_down))),
+            index=close.index
+        )
+    
+    values = close.to_numpy(dtype=np.float64)
+    return pd.Series(_rsi_loop(values, period, np.empty_like(values)), index=close.index)
+
+
+def _previous(values: np.ndarray) -> np.ndarray:
+    """Values of the bar before each bar (NaN for the first one)"""
+    prev = np.empty_like(values)
+    prev[:1] = np.nan
+    prev[1:] = values[:-1]
+    return prev
+
+
 class TradingStrategy:
     """Base class for trading strategies"""
     
+    # Bars of history analyze() reads back from the latest bar. None means
+    # the full series is needed (recursive indicators such as EMA and RSI).
+    history: Optional[int] = None
+    
+    # Bars analyze() needs before it can give a signal
+    min_bars: int = 100
+    
     def __init__(self, name: str):
         self.name = name
     
@@ -30,11 +141,46 @@ class TradingStrategy:
         Args:
             df: DataFrame with OHLCV data
             symbol: Trading symbol
-            
+        
         Returns:
             Dictionary with signal information
         """
         raise NotImplementedError("Subclasses must implement analyze method")
+    
+    def vectorized_signals(
+        self,
+        df: pd.DataFrame,
+        symbol: str = '',
+        start: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Signal of every bar, as analyze() would give it at that bar
+        
+        Subclasses compute all bars at once from full-length indicators;
+        this fallback runs analyze() on each bar's history.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            symbol: Trading symbol
+            start: First bar to analyze (earlier bars may be left at 0)
+        
+        Returns:
+            (signals, strengths) - int8 array with 1 for LONG, -1 for SHORT
+            and 0 for no signal, and the matching signal strengths
+        """
+        n = len(df)
+        signals = np.zeros(n, dtype=np.int8)
+        strengths = np.zeros(n)
+        
+        for i in range(start, n):
+            current_data = df.iloc[max(0, i + 1 - self.history) if self.history else 0:i+1]
+            result = self.analyze(current_data, symbol)
+            
+            if result and result.get('signal'):
+                signals[i] = 1 if result['signal'] == 'LONG' else -1
+                strengths[i] = result.get('strength', 0)
+        
+        return signals, strengths
 
 
 class EMACrossStrategy(TradingStrategy):
@@ -44,13 +190,14 @@ class EMACrossStrategy(TradingStrategy):
         super().__init__("EMA_CROSS")
         self.fast_period = fast_period
         self.slow_period = slow_period
+        self.min_bars = max(fast_period, slow_period) + 1
     
     def analyze(self, df: pd.DataFrame, symbol: str) -> Dict:
         """Generate signal based on EMA crossover"""
         try:
             # Calculate EMAs
-            ema_fast = EMAIndicator(df['close'], window=self.fast_period).ema_indicator()
-            ema_slow = EMAIndicator(df['close'], window=self.slow_period).ema_indicator()
+            ema_fast = ema(df['close'], self.fast_period)
+            ema_slow = ema(df['close'], self.slow_period)
             
             # Get recent values
             current_fast = ema_fast.iloc[-1]
@@ -79,10 +226,25 @@ class EMACrossStrategy(TradingStrategy):
                 'ema_slow': round(current_slow, 4),
                 'strategy': self.name
             }
-            
+        
         except Exception as e:
             log.error(f"Error in EMA Cross strategy: {e}")
             return {'signal': None, 'strength': 0, 'strategy': self.name}
+    
+    def vectorized_signals(self, df: pd.DataFrame, symbol: str = '', start: int = 0):
+        """EMA crossovers of every bar (see TradingStrategy.vectorized_signals)"""
+        fast = ema(df['close'], self.fast_period).to_numpy()
+        slow = ema(df['close'], self.slow_period).to_numpy()
+        prev_fast, prev_slow = _previous(fast), _previous(slow)
+        
+        long = (prev_fast <= prev_slow) & (fast > slow)
+        short = ~long & (prev_fast >= prev_slow) & (fast < slow)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            strength = np.round(np.minimum(np.abs(fast - slow) / slow * 100, 100), 2)
+        
+        signals = long.astype(np.int8) - short.astype(np.int8)
+        return signals, np.where(signals != 0, strength, 0.0)
 
 
 class TripleEMAStrategy(TradingStrategy):
@@ -93,14 +255,15 @@ class TripleEMAStrategy(TradingStrategy):
         self.fast = fast
         self.medium = medium
         self.slow = slow
+        self.min_bars = slow + 1
     
     def analyze(self, df: pd.DataFrame, symbol: str) -> Dict:
         """Generate signal based on triple EMA alignment"""
         try:
             # Calculate EMAs
-            ema_fast = EMAIndicator(df['close'], window=self.fast).ema_indicator()
-            ema_medium = EMAIndicator(df['close'], window=self.medium).ema_indicator()
-            ema_slow = EMAIndicator(df['close'], window=self.slow).ema_indicator()
+            ema_fast = ema(df['close'], self.fast)
+            ema_medium = ema(df['close'], self.medium)
+            ema_slow = ema(df['close'], self.slow)
             
             # Current values
             curr_fast = ema_fast.iloc[-1]
@@ -136,10 +299,23 @@ class TripleEMAStrategy(TradingStrategy):
                 'ema_slow': round(curr_slow, 4),
                 'strategy': self.name
             }
-            
+        
         except Exception as e:
             log.error(f"Error in Triple EMA strategy: {e}")
             return {'signal': None, 'strength': 0, 'strategy': self.name}
+    
+    def vectorized_signals(self, df: pd.DataFrame, symbol: str = '', start: int = 0):
+        """Aligned triple EMA crossovers of every bar (see TradingStrategy.vectorized_signals)"""
+        fast = ema(df['close'], self.fast).to_numpy()
+        medium = ema(df['close'], self.medium).to_numpy()
+        slow = ema(df['close'], self.slow).to_numpy()
+        prev_fast, prev_medium = _previous(fast), _previous(medium)
+        
+        long = (fast > medium) & (medium > slow) & (prev_fast <= prev_medium)
+        short = (fast < medium) & (medium < slow) & (prev_fast >= prev_medium)
+        
+        signals = long.astype(np.int8) - short.astype(np.int8)
+        return signals, np.where(signals != 0, 80.0, 0.0)
 
 
 class RSIDivergenceStrategy(TradingStrategy):
@@ -148,14 +324,15 @@ class RSIDivergenceStrategy(TradingStrategy):
     def __init__(self, rsi_period: int = 14):
         super().__init__("RSI_DIVERGENCE")
         self.rsi_period = rsi_period
+        self.min_bars = rsi_period + 1
     
     def analyze(self, df: pd.DataFrame, symbol: str) -> Dict:
         """Generate signal based on RSI levels and divergences"""
         try:
             # Calculate RSI
-            rsi = RSIIndicator(df['close'], window=self.rsi_period).rsi()
+            rsi_values = rsi(df['close'], self.rsi_period)
             
-            current_rsi = rsi.iloc[-1]
+            current_rsi = rsi_values.iloc[-1]
             current_price = df['close'].iloc[-1]
             
             signal = None
@@ -178,10 +355,27 @@ class RSIDivergenceStrategy(TradingStrategy):
                 'rsi': round(current_rsi, 2),
                 'strategy': self.name
             }
-            
+        
         except Exception as e:
             log.error(f"Error in RSI Divergence strategy: {e}")
             return {'signal': None, 'strength': 0, 'strategy': self.name}
+    
+    def vectorized_signals(self, df: pd.DataFrame, symbol: str = '', start: int = 0):
+        """RSI extremes of every bar (see TradingStrategy.vectorized_signals)"""
+        rsi_values = rsi(df['close'], self.rsi_period).to_numpy()
+        
+        long = rsi_values < config.RSI_OVERSOLD
+        short = ~long & (rsi_values > config.RSI_OVERBOUGHT)
+        
+        strength = np.where(
+            long,
+            (config.RSI_OVERSOLD - rsi_values) / config.RSI_OVERSOLD * 100,
+            (rsi_values - config.RSI_OVERBOUGHT) / (100 - config.RSI_OVERBOUGHT) * 100
+        )
+        strength = np.round(np.minimum(strength, 100), 2)
+        
+        signals = long.astype(np.int8) - short.astype(np.int8)
+        return signals, np.where(signals != 0, strength, 0.0)
 
 
 class MACDStrategy(TradingStrategy):
@@ -192,21 +386,15 @@ class MACDStrategy(TradingStrategy):
         self.fast = fast
         self.slow = slow
         self.signal_period = signal
+        self.min_bars = slow + signal  # Signal line EMA over the MACD line, plus the previous bar
     
     def analyze(self, df: pd.DataFrame, symbol: str) -> Dict:
         """Generate signal based on MACD crossover"""
         try:
             # Calculate MACD
-            macd_indicator = MACD(
-                df['close'],
-                window_fast=self.fast,
-                window_slow=self.slow,
-                window_sign=self.signal_period
-            )
-            
-            macd_line = macd_indicator.macd()
-            signal_line = macd_indicator.macd_signal()
-            histogram = macd_indicator.macd_diff()
+            macd_line = ema(df['close'], self.fast) - ema(df['close'], self.slow)
+            signal_line = ema(macd_line, self.signal_period)
+            histogram = macd_line - signal_line
             
             # Current values
             curr_macd = macd_line.iloc[-1]
@@ -239,10 +427,25 @@ class MACDStrategy(TradingStrategy):
                 'histogram': round(curr_hist, 4),
                 'strategy': self.name
             }
-            
+        
         except Exception as e:
             log.error(f"Error in MACD strategy: {e}")
             return {'signal': None, 'strength': 0, 'strategy': self.name}
+    
+    def vectorized_signals(self, df: pd.DataFrame, symbol: str = '', start: int = 0):
+        """MACD crossovers of every bar (see TradingStrategy.vectorized_signals)"""
+        macd_line = ema(df['close'], self.fast) - ema(df['close'], self.slow)
+        signal_line = ema(macd_line, self.signal_period).to_numpy()
+        macd_line = macd_line.to_numpy()
+        prev_macd, prev_signal = _previous(macd_line), _previous(signal_line)
+        
+        long = (prev_macd <= prev_signal) & (macd_line > signal_line)
+        short = ~long & (prev_macd >= prev_signal) & (macd_line < signal_line)
+        
+        strength = np.round(np.minimum(np.abs(macd_line - signal_line) * 10, 100), 2)
+        
+        signals = long.astype(np.int8) - short.astype(np.int8)
+        return signals, np.where(signals != 0, strength, 0.0)
 
 
 class StochRSIStrategy(TradingStrategy):
@@ -253,20 +456,19 @@ class StochRSIStrategy(TradingStrategy):
         self.period = period
         self.smooth1 = smooth1
         self.smooth2 = smooth2
+        self.min_bars = 2 * period + smooth1 + smooth2  # RSI, its rolling range, then both smoothings
     
     def analyze(self, df: pd.DataFrame, symbol: str) -> Dict:
         """Generate signal based on Stochastic RSI"""
         try:
             # Calculate Stochastic RSI
-            stoch_rsi = StochRSIIndicator(
-                df['close'],
-                window=self.period,
-                smooth1=self.smooth1,
-                smooth2=self.smooth2
-            )
+            rsi_values = rsi(df['close'], self.period)
+            lowest_rsi = rsi_values.rolling(self.period).min()
+            stoch_rsi = (rsi_values - lowest_rsi) / (rsi_values.rolling(self.period).max() - lowest_rsi)
             
-            stoch_k = stoch_rsi.stochrsi_k() * 100
-            stoch_d = stoch_rsi.stochrsi_d() * 100
+            stoch_k_raw = stoch_rsi.rolling(self.smooth1).mean()
+            stoch_k = stoch_k_raw * 100
+            stoch_d = stoch_k_raw.rolling(self.smooth2).mean() * 100
             
             curr_k = stoch_k.iloc[-1]
             curr_d = stoch_d.iloc[-1]
@@ -296,10 +498,36 @@ class StochRSIStrategy(TradingStrategy):
                 'stoch_d': round(curr_d, 2),
                 'strategy': self.name
             }
-            
+        
         except Exception as e:
             log.error(f"Error in Stoch RSI strategy: {e}")
             return {'signal': None, 'strength': 0, 'strategy': self.name}
+    
+    def vectorized_signals(self, df: pd.DataFrame, symbol: str = '', start: int = 0):
+        """Stochastic RSI crossovers of every bar (see TradingStrategy.vectorized_signals)"""
+        rsi_values = rsi(df['close'], self.period)
+        lowest_rsi = rsi_values.rolling(self.period).min()
+        stoch_rsi = (rsi_values - lowest_rsi) / (rsi_values.rolling(self.period).max() - lowest_rsi)
+        
+        stoch_k_raw = stoch_rsi.rolling(self.smooth1).mean()
+        stoch_k = (stoch_k_raw * 100).to_numpy()
+        stoch_d = (stoch_k_raw.rolling(self.smooth2).mean() * 100).to_numpy()
+        prev_k, prev_d = _previous(stoch_k), _previous(stoch_d)
+        
+        oversold = (stoch_k < config.STOCH_OVERSOLD) & (stoch_d < config.STOCH_OVERSOLD)
+        overbought = (stoch_k > config.STOCH_OVERBOUGHT) & (stoch_d > config.STOCH_OVERBOUGHT)
+        long = oversold & (prev_k <= prev_d) & (stoch_k > stoch_d)
+        short = ~oversold & overbought & (prev_k >= prev_d) & (stoch_k < stoch_d)
+        
+        strength = np.where(
+            long,
+            (config.STOCH_OVERSOLD - stoch_k) / config.STOCH_OVERSOLD * 100,
+            (stoch_k - config.STOCH_OVERBOUGHT) / (100 - config.STOCH_OVERBOUGHT) * 100
+        )
+        strength = np.round(np.minimum(strength, 100), 2)
+        
+        signals = long.astype(np.int8) - short.astype(np.int8)
+        return signals, np.where(signals != 0, strength, 0.0)
 
 
 class BreakoutStrategy(TradingStrategy):
@@ -308,6 +536,8 @@ class BreakoutStrategy(TradingStrategy):
     def __init__(self, lookback: int = 20):
         super().__init__("BREAKOUT")
         self.lookback = lookback
+        self.history = lookback + 1  # Levels from the previous bar's window
+        self.min_bars = lookback + 1
     
     def analyze(self, df: pd.DataFrame, symbol: str) -> Dict:
         """Generate signal based on price breakouts"""
@@ -354,10 +584,35 @@ class BreakoutStrategy(TradingStrategy):
                 'volume_ratio': round(curr_volume / avg_vol, 2) if avg_vol > 0 else 0,
                 'strategy': self.name
             }
-            
+        
         except Exception as e:
             log.error(f"Error in Breakout strategy: {e}")
             return {'signal': None, 'strength': 0, 'strategy': self.name}
+    
+    def vectorized_signals(self, df: pd.DataFrame, symbol: str = '', start: int = 0):
+        """Volume-confirmed breakouts of every bar (see TradingStrategy.vectorized_signals)"""
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        prev_resistance = _previous(df['high'].rolling(window=self.lookback).max().to_numpy())
+        prev_support = _previous(df['low'].rolling(window=self.lookback).min().to_numpy())
+        avg_vol = df['volume'].rolling(window=self.lookback).mean().to_numpy()
+        
+        high_volume = volume > avg_vol * 1.5
+        long = (high > prev_resistance) & high_volume
+        short = ~long & (low < prev_support) & high_volume
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_multiplier = volume / avg_vol
+            strength = np.where(
+                long,
+                (high - prev_resistance) / prev_resistance * 100 * volume_multiplier * 10,
+                (prev_support - low) / prev_support * 100 * volume_multiplier * 10
+            )
+        strength = np.round(np.minimum(strength, 100), 2)
+        
+        signals = long.astype(np.int8) - short.astype(np.int8)
+        return signals, np.where(signals != 0, strength, 0.0)
 
 
 class SupportResistanceStrategy(TradingStrategy):
@@ -366,6 +621,8 @@ class SupportResistanceStrategy(TradingStrategy):
     def __init__(self, lookback: int = 50):
         super().__init__("SUPPORT_RESISTANCE")
         self.lookback = lookback
+        self.history = max(lookback, 2)
+        self.min_bars = self.history
     
     def find_levels(self, df: pd.DataFrame) -> Tuple[List[float], List[float]]:
         """Find support and resistance levels"""
@@ -433,7 +690,7 @@ class SupportResistanceStrategy(TradingStrategy):
                 'nearest_resistance': round(nearest_resistance, 4) if nearest_resistance else None,
                 'strategy': self.name
             }
-            
+        
         except Exception as e:
             log.error(f"Error in Support/Resistance strategy: {e}")
             return {'signal': None, 'strength': 0, 'strategy': self.name}
@@ -445,7 +702,7 @@ def get_strategy(strategy_name: str) -> Optional[TradingStrategy]:
     
     Args:
         strategy_name: Name of the strategy
-        
+    
     Returns:
         Strategy instance or None
     """
@@ -476,7 +733,7 @@ def calculate_stop_loss_take_profit(
         side: 'LONG' or 'SHORT'
         stop_loss_pct: Stop loss percentage (default from config)
         take_profit_pct: Take profit percentage (default from config)
-        
+    
     Returns:
         Tuple of (stop_loss_price, take_profit_price)
     """
@@ -6,11 +6,49 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 import logging
-from strategies import TradingStrategy, TripleEMAStrategy
+from strategies import TradingStrategy, TripleEMAStrategy, calculate_stop_loss_take_profit
+from numba_compat import njit, NUMBA_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _ema_triple(close, alpha_fast, alpha_medium, alpha_slow):
+    """
+    Fast, medium and slow EMAs in one pass over the close prices
+    
+    Each EMA follows the same recurrence as _ema_loop, so the values are
+    bit-for-bit those of pandas ewm(alpha=alpha, adjust=False).mean().
+    
+    Returns:
+        Tuple of the three EMA arrays
+    """
+    n = close.shape[0]
+    out = np.empty((3, n))
+    alphas = np.array([alpha_fast, alpha_medium, alpha_slow])
+    weighted = np.full(3, np.nan)
+    old_wt = np.ones(3)
+    
+    for i in range(n):
+        cur = close[i]
+        is_observation = cur == cur
+        
+        for k in range(3):
+            w = weighted[k]
+            if w == w:
+                old_wt[k] *= 1.0 - alphas[k]
+                if is_observation:
+                    if w != cur:
+                        weighted[k] = (old_wt[k] * w + alphas[k] * cur) / (old_wt[k] + alphas[k])
+                    old_wt[k] = 1.0
+            elif is_observation:
+                weighted[k] = cur
+            
+            out[k, i] = weighted[k]
+    
+    return out[0], out[1], out[2]
+
+
 class EnhancedTripleEMAStrategy(TripleEMAStrategy):
     """
     Enhanced Triple EMA Strategy with optimized parameters.
@@ -90,17 +128,21 @@ class EnhancedTripleEMAStrategy(TripleEMAStrategy):
         # Calculate indicators
         df = self._calculate_indicators(df)
         
+        current_idx = len(df) - 1
+        prev_idx = current_idx - 1
+        
         # Get latest values
-        current_idx = -1
-        prev_idx = -2
+        close = df['close'].values
+        fast = df[f'ema_{self.fast_period}'].values
+        medium = df[f'ema_{self.medium_period}'].values
         
-        current_price = float(df['close'].iloc[current_idx])
-        fast_ema = float(df[f'ema_{self.fast_period}'].iloc[current_idx])
-        medium_ema = float(df[f'ema_{self.medium_period}'].iloc[current_idx])
-        slow_ema = float(df[f'ema_{self.slow_period}'].iloc[current_idx])
+        current_price = float(close[current_idx])
+        fast_ema = float(fast[current_idx])
+        medium_ema = float(medium[current_idx])
+        slow_ema = float(df[f'ema_{self.slow_period}'].values[current_idx])
         
-        fast_ema_prev = float(df[f'ema_{self.fast_period}'].iloc[prev_idx])
-        medium_ema_prev = float(df[f'ema_{self.medium_period}'].iloc[prev_idx])
+        fast_ema_prev = float(fast[prev_idx])
+        medium_ema_prev = float(medium[prev_idx])
         
         # Volume check
         volume_confirmed = self._check_volume_confirmation(df, current_idx)
@@ -154,12 +196,74 @@ class EnhancedTripleEMAStrategy(TripleEMAStrategy):
         
         return 'HOLD'
     
+    def generate_signals(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Vectorized ``generate_signal`` over every row of an indicator frame.
+        
+        ``df`` must already carry the columns produced by
+        ``_calculate_indicators``.
+        
+        Returns:
+            int8 array with 1 for BUY, -1 for SELL and 0 for HOLD, matching
+            ``generate_signal(df.iloc[:i + 1])`` at each row i
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        fast = df[f'ema_{self.fast_period}'].to_numpy(dtype=np.float64)
+        medium = df[f'ema_{self.medium_period}'].to_numpy(dtype=np.float64)
+        slow = df[f'ema_{self.slow_period}'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        volume_avg = df['volume_avg'].to_numpy(dtype=np.float64)
+        
+        n = len(close)
+        fast_prev = np.concatenate(([np.nan], fast[:-1]))
+        medium_prev = np.concatenate(([np.nan], medium[:-1]))
+        
+        # Same warmup as generate_signal: need slow_period + 5 rows of history
+        valid = np.arange(n) >= self.slow_period + 4
+        
+        if self.require_volume_confirmation:
+            with np.errstate(invalid='ignore'):
+                valid &= (
+                    np.isnan(volume_avg) | (volume_avg == 0) |
+                    (volume >= self.volume_threshold * volume_avg)
+                )
+        
+        # Price change over last 3 candles; NaN (neither > 0 nor < 0) where
+        # there is not enough history, like the 0.0 from _check_momentum
+        lookback = 3
+        momentum = np.full(n, np.nan)
+        if n > lookback:
+            momentum[lookback:] = (close[lookback:] - close[:-lookback]) / close[:-lookback]
+        
+        golden_cross = (fast > medium) & (fast_prev <= medium_prev)
+        death_cross = (fast < medium) & (fast_prev >= medium_prev)
+        
+        buy = golden_cross & (medium > slow) & (close > medium) & (momentum > 0)
+        sell = death_cross & (medium < slow) & (close < medium) & (momentum < 0)
+        
+        signals = np.zeros(n, dtype=np.int8)
+        signals[buy & valid] = 1
+        signals[sell & valid] = -1
+        
+        return signals
+    
     def _calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all required indicators."""
-        # EMAs
-        df[f'ema_{self.fast_period}'] = df['close'].ewm(span=self.fast_period, adjust=False).mean()
-        df[f'ema_{self.medium_period}'] = df['close'].ewm(span=self.medium_period, adjust=False).mean()
-        df[f'ema_{self.slow_period}'] = df['close'].ewm(span=self.slow_period, adjust=False).mean()
+        # EMAs (all three in one compiled pass when numba is installed)
+        if NUMBA_AVAILABLE:
+            fast, medium, slow = _ema_triple(
+                df['close'].to_numpy(dtype=np.float64),
+                2.0 / (1.0 + self.fast_period),
+                2.0 / (1.0 + self.medium_period),
+                2.0 / (1.0 + self.slow_period)
+            )
+            df[f'ema_{self.fast_period}'] = fast
+            df[f'ema_{self.medium_period}'] = medium
+            df[f'ema_{self.slow_period}'] = slow
+        else:
+            df[f'ema_{self.fast_period}'] = df['close'].ewm(span=self.fast_period, adjust=False).mean()
+            df[f'ema_{self.medium_period}'] = df['close'].ewm(span=self.medium_period, adjust=False).mean()
+            df[f'ema_{self.slow_period}'] = df['close'].ewm(span=self.slow_period, adjust=False).mean()
         
         # ATR for volatility-based stops
         df['high_low'] = df['high'] - df['low']
@@ -190,7 +294,10 @@ class EnhancedTripleEMAStrategy(TripleEMAStrategy):
         Returns:
             Momentum as percentage change
         """
-        if len(df) < abs(idx) + lookback:
+        if idx < 0:
+            idx += len(df)
+        
+        if idx < lookback:
             return 0.0
         
         current_price = float(df['close'].iloc[idx])
@@ -217,13 +324,13 @@ class EnhancedTripleEMAStrategy(TripleEMAStrategy):
             signal: 'BUY' or 'SELL'
             df: DataFrame with ATR data (optional)
             risk_reward_ratio: Ratio of TP to SL (default: 2.0)
-            
+        
         Returns:
             Tuple of (stop_loss, take_profit)
         """
         # Try to use ATR-based stops if data available
         if df is not None and 'atr' in df.columns and not df.empty:
-            atr = float(df['atr'].iloc[-1])
+            atr = float(df['atr'].values[-1])
             
             if not pd.isna(atr) and atr > 0:
                 atr_distance = atr * self.atr_multiplier
@@ -242,7 +349,7 @@ class EnhancedTripleEMAStrategy(TripleEMAStrategy):
                 return stop_loss, take_profit
         
         # Fallback to percentage-based stops
-        return super().calculate_stop_loss_take_profit(entry_price, signal)
+        return calculate_stop_loss_take_profit(entry_price, 'LONG' if signal == 'BUY' else 'SHORT')
 
 
 class OptimizedStrategyFactory:
@@ -320,7 +427,7 @@ class OptimizedStrategyFactory:
             atr_mult: ATR multiplier for stops
             vol_thresh: Volume threshold multiplier
             require_vol: Whether to require volume confirmation
-            
+        
         Returns:
             EnhancedTripleEMAStrategy instance
         """